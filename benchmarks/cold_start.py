@@ -0,0 +1,131 @@
+"""
+Time to the first fast request after a restart, with and without the
+pre-fork warm-up.
+
+Starts gunicorn with gunicorn.conf.py twice, once loading the app in every
+worker (GUNICORN_PRELOAD=False) and once preloading and warming it up in
+the master. Each time it fires rounds of concurrent GETs, one per worker,
+as soon as the server accepts connections, and reports:
+
+- ready: seconds from launch until the first response
+- first round: the slowest latency of the first round, which mostly lands
+  on workers that have not served a request yet
+- fast after: seconds from launch until a whole round is served within
+  twice the steady-state median latency
+
+The server uses the configured database and Redis. Cached responses make
+later runs look warmer; pass --flush-redis to empty the Redis database
+before each start (this deletes every key in it). Run from the project root:
+
+    python -m benchmarks.cold_start [--path /api/medicines/] [--workers 4] [--flush-redis]
+"""
+import argparse
+import http.client
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROUNDS = 40
+
+
+def get(port, path):
+    """GET `path` on a fresh connection; returns the latency in seconds."""
+    start = time.perf_counter()
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    try:
+        connection.request("GET", path)
+        connection.getresponse().read()
+    finally:
+        connection.close()
+    return time.perf_counter() - start
+
+
+def concurrent_round(port, path, size):
+    """`size` concurrent GETs; returns the slowest latency."""
+    latencies = []
+    threads = [
+        threading.Thread(target=lambda: latencies.append(get(port, path))) for _ in range(size)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return max(latencies)
+
+
+def wait_until_ready(port, path, launched, timeout=120):
+    while time.perf_counter() - launched < timeout:
+        try:
+            get(port, path)
+            return time.perf_counter() - launched
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("gunicorn did not answer in time")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run(preload, args):
+    if args.flush_redis:
+        from utils.redis_cache import RedisCache
+
+        RedisCache().redis.flushdb()
+    port = free_port()
+    env = {
+        **os.environ,
+        "GUNICORN_PRELOAD": str(preload),
+        "GUNICORN_WORKERS": str(args.workers),
+    }
+    launched = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}", args.app],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        ready = wait_until_ready(port, args.path, launched)
+        rounds = []
+        for _ in range(ROUNDS):
+            latency = concurrent_round(port, args.path, args.workers)
+            rounds.append((time.perf_counter() - launched, latency))
+        steady = statistics.median(latency for _, latency in rounds[ROUNDS // 2:])
+        fast_after = next(
+            (at for at, latency in rounds if latency <= 2 * steady), rounds[-1][0]
+        )
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+    mode = "preload+warm-up" if preload else "lazy workers"
+    print(
+        f"{mode:<16} ready {ready:6.2f}s   first round {rounds[0][1] * 1000:8.1f} ms   "
+        f"steady {steady * 1000:6.1f} ms   fast after {fast_after:6.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--path", default="/api/medicines/")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--app", default="core.wsgi:application")
+    parser.add_argument(
+        "--flush-redis", action="store_true", help="Empty the Redis database before each start"
+    )
+    args = parser.parse_args()
+
+    for preload in (False, True):
+        run(preload, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compression cost vs. bytes saved for a typical medicine list page.
+
+Builds a synthetic 100-row page shaped like the list/search responses and
+reports, per encoding and level, the compressed size, the saving and the CPU
+time per compression. Run from the project root:
+
+    python -m benchmarks.compression [--rows 100] [--repeat 50]
+"""
+import argparse
+import json
+import time
+import uuid
+from utils.compression import brotli, compress
+
+
+def build_page(rows):
+    results = []
+    for index in range(rows):
+        results.append(
+            {
+                "id": str(uuid.uuid4()),
+                "name": f"Paracetamol {index} 500mg Tablet",
+                "description": "Relieves mild to moderate pain and reduces fever.",
+                "price": f"{5 + index % 40}.50",
+                "batch_number": f"B{100000 + index}",
+                "stock_quantity": index * 7 % 500,
+                "unit_of_measurement": "TBL",
+                "prescription_required": index % 3 == 0,
+                "is_available": True,
+                "is_featured": False,
+                "generic_name_details": {"id": index % 60, "name": "Paracetamol"},
+                "category_details": {"id": index % 6, "name": "Analgesic"},
+                "form_details": {"id": 1, "form_type": "TBL"},
+                "manufacturer_details": {"id": index % 6, "name": "Square Pharmaceuticals Ltd."},
+                "created_at": "2024-10-28T13:40:00.123456Z",
+                "updated_at": "2024-10-28T13:40:00.123456Z",
+            }
+        )
+    payload = {"count": 10000, "next": None, "previous": None, "results": results}
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def measure(body, encoding, level, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        compressed = compress(body, encoding, level=level)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+    return len(compressed), elapsed_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    body = build_page(args.rows)
+    cases = [("gzip", level) for level in (1, 6, 9)]
+    if brotli is not None:
+        cases += [("br", quality) for quality in (1, 5, 11)]
+
+    print(f"raw body: {len(body)} bytes ({args.rows} rows)")
+    print(f"{'encoding':<8} {'level':>5} {'bytes':>8} {'saved':>7} {'ms/op':>8} {'KB saved/ms':>12}")
+    for encoding, level in cases:
+        size, elapsed_ms = measure(body, encoding, level, args.repeat)
+        saved = len(body) - size
+        print(
+            f"{encoding:<8} {level:>5} {size:>8} {saved / len(body):>6.1%} "
+            f"{elapsed_ms:>8.3f} {saved / 1024 / elapsed_ms:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
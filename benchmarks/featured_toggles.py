@@ -0,0 +1,140 @@
+"""
+Write throughput of concurrent featured toggles.
+
+Several threads flip `is_featured` on random medicines that share a handful
+of generic names, so most attempts to feature a medicine collide with an
+already featured sibling. Compares the database-enforced rule (the save path
+as it is now) with the previous approach, which ran an exists() query before
+every save (twice: once in the serializer, once in Model.clean). Reports
+toggles/s and the rejected toggles; in pre-check mode, "raced" counts the
+toggles that passed the pre-check but were still stopped by the constraint,
+which the old code would have let through. Runs against a throwaway test
+database created from the configured backend. Run from the project root:
+
+    python -m benchmarks.featured_toggles [--threads 8] [--toggles 200]
+"""
+import argparse
+import os
+import random
+import threading
+import time
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from inventory.exceptions import FeaturedMedicineInvalidError  # noqa: E402
+from inventory.models import (  # noqa: E402
+    GenericName,
+    Manufacturer,
+    MedicineCategory,
+    MedicineDetail,
+    MedicineForm,
+)
+from inventory.signals import suspend_cache_invalidation  # noqa: E402
+
+
+def build_catalog(generics, per_generic):
+    category = MedicineCategory.objects.create(name="Analgesic")
+    form = MedicineForm.objects.create(form_type="TBL")
+    manufacturer = Manufacturer.objects.create(name="Square Pharmaceuticals Ltd.")
+    ids = []
+    for generic_index in range(generics):
+        generic_name = GenericName.objects.create(name=f"Generic {generic_index}")
+        for index in range(per_generic):
+            medicine = MedicineDetail.objects.create(
+                name=f"Medicine {generic_index}-{index}",
+                generic_name=generic_name,
+                category=category,
+                form=form,
+                manufacturer=manufacturer,
+                description="Benchmark medicine",
+                price=Decimal("1.00"),
+                batch_number=f"FT{generic_index}-{index}",
+            )
+            ids.append(medicine.pk)
+    return ids
+
+
+def precheck(medicine):
+    """The exists() query the serializer and Model.clean used to run."""
+    return (
+        MedicineDetail.objects.filter(generic_name_id=medicine.generic_name_id, is_featured=True)
+        .exclude(pk=medicine.pk)
+        .exists()
+    )
+
+
+def toggle_worker(ids, toggles, mode, counters, lock, seed):
+    rng = random.Random(seed)
+    counts = {"accepted": 0, "rejected": 0, "raced": 0}
+    try:
+        # Cache invalidation is not what is being measured here
+        with suspend_cache_invalidation():
+            for _ in range(toggles):
+                medicine = MedicineDetail.objects.get(pk=rng.choice(ids))
+                medicine.is_featured = not medicine.is_featured
+                checked = mode == "precheck" and medicine.is_featured
+                if checked and (precheck(medicine) or precheck(medicine)):
+                    counts["rejected"] += 1
+                    continue
+                try:
+                    medicine.save()
+                    counts["accepted"] += 1
+                except FeaturedMedicineInvalidError:
+                    counts["raced" if checked else "rejected"] += 1
+    finally:
+        connection.close()
+    with lock:
+        for key, value in counts.items():
+            counters[key] += value
+
+
+def run(mode, ids, threads, toggles):
+    MedicineDetail.objects.update(is_featured=False)
+    counters = {"accepted": 0, "rejected": 0, "raced": 0}
+    lock = threading.Lock()
+    workers = [
+        threading.Thread(
+            target=toggle_worker, args=(ids, toggles, mode, counters, lock, seed)
+        )
+        for seed in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    total = threads * toggles
+    print(
+        f"{mode:<10} {total / elapsed:8.0f} toggles/s   "
+        f"accepted {counters['accepted']:5}   rejected {counters['rejected']:5}   "
+        f"raced {counters['raced']:4}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--toggles", type=int, default=200, help="Toggles per thread")
+    parser.add_argument("--generics", type=int, default=5)
+    parser.add_argument("--per-generic", type=int, default=10)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        with suspend_cache_invalidation():
+            ids = build_catalog(args.generics, args.per_generic)
+        for mode in ("precheck", "constraint"):
+            run(mode, ids, args.threads, args.toggles)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
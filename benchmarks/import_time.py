@@ -0,0 +1,78 @@
+"""
+Startup import time, with a regression check.
+
+Imports the settings, the apps and the root URLconf (every view) in a fresh
+interpreter under `python -X importtime`, as a worker does when it starts,
+and reports the total and the slowest top-level imports. With --check it
+exits non-zero when the total exceeds --budget-ms or when a module that
+must stay lazy (FORBIDDEN_MODULES, e.g. the AWS SDK while USE_S3 is off)
+was imported. Run from the project root:
+
+    python -m benchmarks.import_time [--top 15] [--check] [--budget-ms 800]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+STARTUP_CODE = "import django; django.setup(); import core.urls"
+
+# Imported only by deployments that use them
+FORBIDDEN_MODULES = ("boto3", "botocore", "s3transfer")
+
+# Total import time allowed by --check; generous enough for a slow CI runner
+DEFAULT_BUDGET_MS = 800
+
+
+def profile_imports():
+    """
+    Run STARTUP_CODE under -X importtime; returns [(module, self_us,
+    cumulative_us, depth)] in import order.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_CODE],
+        env={"DJANGO_SETTINGS_MODULE": "core.settings", **os.environ, "USE_S3": "False"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--check", action="store_true", help="Fail on a regression")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+
+    imports = profile_imports()
+    top_level = [entry for entry in imports if entry[3] == 0]
+    total_ms = sum(cumulative for _, _, cumulative, _ in top_level) / 1000
+    print(f"startup imports: {len(imports)} modules, {total_ms:.0f} ms")
+    for name, _, cumulative, _ in sorted(top_level, key=lambda entry: -entry[2])[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    if not args.check:
+        return
+    failures = []
+    imported = {name for name, _, _, _ in imports}
+    eager = [name for name in FORBIDDEN_MODULES if name in imported]
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+    if total_ms > args.budget_ms:
+        failures.append(f"{total_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
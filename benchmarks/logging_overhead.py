@@ -0,0 +1,108 @@
+"""
+Logging cost per request on the cache-hit path, before and after the queued,
+sampled pipeline.
+
+Replays the log lines a cached medicine list GET writes (the read trace, the
+Redis hash lookup and the replay) through the project's LOGGING config,
+with the log files and the console redirected to a temporary directory:
+
+- direct: every line formatted eagerly from an f-string and written to the
+  files in the request thread, unsampled, as before utils/log_pipeline.py
+- queued: lazy `%` arguments, with the files written by the QueueListener
+  threads, unsampled
+- sampled: as queued, with the sample rates of LOGGING
+
+and reports the microseconds spent in the request thread per request, and
+the time until every kept line is on disk.
+Run from the project root:
+
+    python -m benchmarks.logging_overhead [--requests 20000]
+"""
+import argparse
+import copy
+import logging
+import logging.config
+import os
+import tempfile
+import time
+
+# (logger, message, arguments) of one cached GET /api/medicines/
+CACHE_HIT_LINES = (
+    ("app_logger.reads", "Attempting to retrieve paginated medicine list", ()),
+    ("app_logger.cache", "Cache hit for key: %s", ("medicine_list_cache:v42:page=1",)),
+    ("app_logger.cache", "Serving rendered response from cache for key: %s", ("medicine_list_cache:v42:page=1",)),
+    ("app_logger.cache", "Cache hit for paginated medicine list", ()),
+)
+
+
+def logging_config(base, directory, sampled):
+    config = copy.deepcopy(base)
+    for name, handler in config["handlers"].items():
+        handler.pop("stream", None)
+        handler["class"] = "logging.FileHandler"
+        handler["filename"] = os.path.join(directory, f"{name}.log")
+    if not sampled:
+        for logger in config["loggers"].values():
+            logger.pop("filters", None)
+    return config
+
+
+def direct_request(lines):
+    for logger, message, args in lines:
+        logger.info(message % args if args else message)
+
+
+def queued_request(lines):
+    for logger, message, args in lines:
+        logger.info(message, *args)
+
+
+def run(base, requests, queued, sampled):
+    from utils import log_pipeline
+
+    log_pipeline.stop()
+    with tempfile.TemporaryDirectory() as directory:
+        config = logging_config(base, directory, sampled)
+        logging.config.dictConfig(config)
+        log_pipeline.sample_loggers()
+        if queued:
+            log_pipeline.queue_loggers(config["loggers"])
+        lines = [(logging.getLogger(name), message, args) for name, message, args in CACHE_HIT_LINES]
+        request = queued_request if queued else direct_request
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            request(lines)
+        in_request = time.perf_counter() - start
+        log_pipeline.flush()
+        written = time.perf_counter() - start
+        log_pipeline.stop()
+        logging.config.dictConfig({"version": 1, "disable_existing_loggers": False})
+    return in_request, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+    from django.conf import settings
+
+    django.setup()
+    base = settings.LOGGING
+    for mode, queued, sampled in (
+        ("direct", False, False),
+        ("queued", True, False),
+        ("sampled", True, True),
+    ):
+        in_request, written = run(base, args.requests, queued, sampled)
+        print(
+            f"{mode:<7} {in_request / args.requests * 1e6:7.1f} us/request in the request thread   "
+            f"all lines written after {written:6.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Requests/s and latency percentiles of the read endpoints at high concurrency.
+
+Drives a running server with many keep-alive connections at once, so the
+same command compares the WSGI setup with the ASGI one serving the async
+read views. Start each in turn with the same worker count, e.g.
+
+    gunicorn -w 4 --bind 0.0.0.0:8000 core.wsgi:application
+    ASYNC_READ_VIEWS=True gunicorn -w 4 -k uvicorn_worker.UvicornWorker \\
+        --bind 0.0.0.0:8000 core.asgi:application
+
+and run from the project root:
+
+    python -m benchmarks.read_concurrency [--url http://localhost:8000/api/medicines/] \\
+        [--concurrency 200] [--requests 20000]
+
+A first round of one request per connection fills the response cache and
+opens the connections; the report is of the second, so both servers are
+measured on the cache-hit path the endpoints mostly serve.
+"""
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def connect(parts):
+    return http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+
+
+def worker(url, count, latencies, errors, lock):
+    parts = urlsplit(url)
+    connection = connect(parts)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    own_latencies = []
+    own_errors = 0
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            connection.request("GET", path, headers={"Accept-Encoding": "gzip"})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                own_errors += 1
+        except (OSError, http.client.HTTPException):
+            own_errors += 1
+            connection.close()
+            connection = connect(parts)
+            continue
+        own_latencies.append(time.perf_counter() - start)
+    connection.close()
+    with lock:
+        latencies.extend(own_latencies)
+        errors.append(own_errors)
+
+
+def run(url, concurrency, requests):
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    per_worker = max(1, requests // concurrency)
+    threads = [
+        threading.Thread(target=worker, args=(url, per_worker, latencies, errors, lock))
+        for _ in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sorted(latencies), sum(errors)
+
+
+def percentile(latencies, fraction):
+    return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:8000/api/medicines/")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    run(args.url, args.concurrency, args.concurrency)
+    elapsed, latencies, errors = run(args.url, args.concurrency, args.requests)
+    if not latencies:
+        print(f"no successful requests ({errors} errors)")
+        return
+    print(
+        f"{len(latencies) / elapsed:8.0f} req/s   "
+        f"p50 {percentile(latencies, 0.50):7.1f} ms   "
+        f"p99 {percentile(latencies, 0.99):7.1f} ms   "
+        f"mean {statistics.fmean(latencies) * 1000:7.1f} ms   "
+        f"errors {errors}"
+    )
+
+
+if __name__ == "__main__":
+    main()
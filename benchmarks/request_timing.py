@@ -0,0 +1,58 @@
+"""
+Cost of the request timing middleware, off and on.
+
+Serves the same GET through the full middleware stack in process (as the
+warm-up does, utils/warmup.py) with REQUEST_METRICS off, which removes the
+middleware and leaves the phase hooks as one context variable lookup each,
+and on, which adds the Server-Timing header and the histogram updates.
+The first request fills the response cache, so the path measured is the
+cache hit most reads take. Uses the configured database and Redis. Run from
+the project root:
+
+    python -m benchmarks.request_timing [--path /api/medicines/] [--requests 5000]
+"""
+import argparse
+import os
+import statistics
+import time
+
+
+def measure(path, requests, enabled):
+    from django.core.handlers.base import BaseHandler
+    from django.test import RequestFactory, override_settings
+    from utils.warmup import warmup_host
+
+    with override_settings(REQUEST_METRICS=enabled):
+        handler = BaseHandler()
+        handler.load_middleware()
+        factory = RequestFactory(HTTP_HOST=warmup_host())
+        handler.get_response(factory.get(path)).close()
+        latencies = []
+        for _ in range(requests):
+            request = factory.get(path)
+            start = time.perf_counter()
+            handler.get_response(request).close()
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--path", default="/api/medicines/")
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+
+    django.setup()
+    for mode, enabled in (("off", False), ("on", True), ("off", False), ("on", True)):
+        latencies = measure(args.path, args.requests, enabled)
+        print(
+            f"metrics {mode:<3}  median {statistics.median(latencies) * 1e6:7.1f} us   "
+            f"mean {statistics.fmean(latencies) * 1e6:7.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Per-page cost of MedicineDetailSerializer vs. the values_list() row mapper.
+
+Serializes the same synthetic page through the DRF serializer (model
+instances with their related objects, as select_related() would load them)
+and through MedicineRowMapper (flat tuples, as values_list() returns them).
+Only Python-side work is timed; no database is needed. Run from the project
+root with the usual environment (.env) available:
+
+    python -m benchmarks.serializers [--rows 100] [--repeat 200]
+"""
+import argparse
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from inventory.api.fieldsets import Fieldset  # noqa: E402
+from inventory.api.row_mappers import get_row_mapper  # noqa: E402
+from inventory.api.serializers import MedicineDetailSerializer  # noqa: E402
+from inventory.models import (  # noqa: E402
+    GenericName,
+    Manufacturer,
+    MedicineCategory,
+    MedicineDetail,
+    MedicineForm,
+)
+
+
+def build_instances(rows):
+    generic_name = GenericName(id=1, name="Paracetamol")
+    category = MedicineCategory(id=2, name="Analgesic")
+    form = MedicineForm(id=3, form_type="TBL")
+    manufacturer = Manufacturer(id=4, name="Square Pharmaceuticals Ltd.")
+    created_at = datetime(2024, 10, 28, 13, 40, tzinfo=timezone.utc)
+    return [
+        MedicineDetail(
+            id=uuid.uuid4(),
+            name=f"Napa {index}",
+            description="Relieves mild to moderate pain and reduces fever.",
+            price=Decimal("2.50"),
+            batch_number=f"B{index}",
+            stock_quantity=index,
+            generic_name=generic_name,
+            category=category,
+            form=form,
+            manufacturer=manufacturer,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+        for index in range(rows)
+    ]
+
+
+def as_rows(instances, columns):
+    """Mimic values_list(*columns) for in-memory instances."""
+    def lookup(instance, column):
+        for part in column.split("__"):
+            instance = getattr(instance, part)
+        return instance
+
+    return [tuple(lookup(instance, column) for column in columns) for instance in instances]
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    instances = build_instances(args.rows)
+    for label, fieldset in (
+        ("full", Fieldset()),
+        ("name,price,stock", Fieldset(["name", "price", "stock_quantity"], [])),
+    ):
+        mapper = get_row_mapper(fieldset)
+        rows = as_rows(instances, mapper.columns)
+        serializer_ms = timed(
+            lambda: MedicineDetailSerializer(instances, many=True, fieldset=fieldset).data,
+            args.repeat,
+        )
+        mapper_ms = timed(lambda: mapper.map_rows(rows), args.repeat)
+        print(
+            f"{label:<18} serializer {serializer_ms:7.3f} ms/page   "
+            f"row mapper {mapper_ms:7.3f} ms/page   speedup {serializer_ms / mapper_ms:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
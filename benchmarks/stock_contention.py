@@ -0,0 +1,124 @@
+"""
+Throughput and correctness of concurrent stock decrements on one medicine.
+
+Many threads sell the same popular item at once. Compares the old path (load
+the row, subtract in Python, save the whole record, as a full PUT does) with
+the atomic adjustment behind POST /api/medicines/<id>/stock/ (one guarded
+UPDATE with an F() expression). Reports decrements/s and the lost updates:
+decrements that were acknowledged but are missing from the final stock.
+Runs against a throwaway test database created from the configured backend.
+Run from the project root:
+
+    python -m benchmarks.stock_contention [--threads 16] [--decrements 50]
+"""
+import argparse
+import os
+import threading
+import time
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from inventory.api.stock import apply_stock_deltas  # noqa: E402
+from inventory.exceptions import InsufficientStockError  # noqa: E402
+from inventory.models import (  # noqa: E402
+    GenericName,
+    Manufacturer,
+    MedicineCategory,
+    MedicineDetail,
+    MedicineForm,
+)
+from inventory.signals import suspend_cache_invalidation  # noqa: E402
+
+
+def build_medicine(stock):
+    return MedicineDetail.objects.create(
+        name="Napa",
+        generic_name=GenericName.objects.create(name="Paracetamol"),
+        category=MedicineCategory.objects.create(name="Analgesic"),
+        form=MedicineForm.objects.create(form_type="TBL"),
+        manufacturer=Manufacturer.objects.create(name="Beximco Pharmaceuticals Ltd."),
+        description="Benchmark medicine",
+        price=Decimal("1.00"),
+        batch_number="SC-1",
+        stock_quantity=stock,
+    )
+
+
+def read_modify_write(pk):
+    medicine = MedicineDetail.objects.get(pk=pk)
+    if medicine.stock_quantity < 1:
+        raise InsufficientStockError()
+    medicine.stock_quantity -= 1
+    medicine.save()
+
+
+def atomic(pk):
+    apply_stock_deltas({pk: -1})
+
+
+def decrement_worker(mode, pk, decrements, counters, lock):
+    decrement = read_modify_write if mode == "read-modify-write" else atomic
+    acknowledged = 0
+    try:
+        # Cache invalidation is not what is being measured here
+        with suspend_cache_invalidation():
+            for _ in range(decrements):
+                try:
+                    decrement(pk)
+                    acknowledged += 1
+                except InsufficientStockError:
+                    pass
+    finally:
+        connection.close()
+    with lock:
+        counters["acknowledged"] += acknowledged
+
+
+def run(mode, pk, threads, decrements, stock):
+    MedicineDetail.objects.filter(pk=pk).update(stock_quantity=stock, is_available=True)
+    counters = {"acknowledged": 0}
+    lock = threading.Lock()
+    workers = [
+        threading.Thread(target=decrement_worker, args=(mode, pk, decrements, counters, lock))
+        for _ in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    final = MedicineDetail.objects.get(pk=pk).stock_quantity
+    lost = final - (stock - counters["acknowledged"])
+    total = threads * decrements
+    print(
+        f"{mode:<18} {total / elapsed:8.0f} decrements/s   "
+        f"acknowledged {counters['acknowledged']:6}   final stock {final:6}   lost {lost:5}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--decrements", type=int, default=50, help="Decrements per thread")
+    parser.add_argument("--stock", type=int, default=100000)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        with suspend_cache_invalidation():
+            pk = str(build_medicine(args.stock).pk)
+        for mode in ("read-modify-write", "atomic"):
+            run(mode, pk, args.threads, args.decrements, args.stock)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+The API's OpenAPI document, built once instead of on every docs request.
+
+The Docker build writes it to OPENAPI_SCHEMA_FILE with drf_yasg's
+`generate_swagger` command, and /swagger.json sends that file's bytes.
+Without the file (e.g. in development) the document is generated on the
+first request and kept for the life of the process; the pre-fork warm-up
+requests it, so gunicorn workers inherit it. The YAML variant is rendered
+from the same in-memory document, and the Swagger UI and ReDoc pages
+fetch /swagger.json (SPEC_URL), so none of them introspects the views again.
+"""
+import os
+from django.conf import settings
+from django.http import HttpResponse
+from drf_yasg import openapi
+from drf_yasg.renderers import OpenAPIRenderer, SwaggerJSONRenderer, SwaggerYAMLRenderer
+from drf_yasg.views import get_schema_view
+from rest_framework import exceptions
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+API_INFO = openapi.Info(
+    title="Medicine Index API",
+    default_version="v1",
+    description="API documentation for Medicine Index Application",
+    contact=openapi.Contact(email="fuadmubtasim@gmail.con"),
+    license=openapi.License(name="MIT License"),
+)
+
+BaseSchemaView = get_schema_view(
+    API_INFO,
+    public=True,
+    permission_classes=(AllowAny,),
+)
+
+JSON_RENDERERS = (OpenAPIRenderer, SwaggerJSONRenderer)
+SPEC_RENDERERS = (*JSON_RENDERERS, SwaggerYAMLRenderer)
+
+# Generated documents by API version, and the prebuilt file's bytes
+_documents = {}
+_prebuilt = {}
+
+
+def prebuilt_document():
+    """The bytes of OPENAPI_SCHEMA_FILE, read once, or None without the file."""
+    if "json" not in _prebuilt:
+        path = settings.OPENAPI_SCHEMA_FILE
+        if path and os.path.exists(path):
+            with open(path, "rb") as schema_file:
+                _prebuilt["json"] = schema_file.read()
+        else:
+            _prebuilt["json"] = None
+    return _prebuilt["json"]
+
+
+def generated_document(view, version):
+    """
+    The document for `version`, generated on first use. Generated without a
+    request, like `generate_swagger`, so it names no host and fits every one.
+    """
+    document = _documents.get(version)
+    if document is None:
+        generator = view.generator_class(API_INFO, version)
+        document = generator.get_schema(None, public=True)
+        if document is None:
+            raise exceptions.PermissionDenied()
+        _documents[version] = document
+    return document
+
+
+class SchemaView(BaseSchemaView):
+    def get(self, request, version="", format=None):
+        if not isinstance(request.accepted_renderer, SPEC_RENDERERS):
+            # The docs pages only need the title; their generator has no paths
+            return super().get(request, version, format)
+
+        version = request.version or version or ""
+        document = prebuilt_document()
+        if document is not None and isinstance(request.accepted_renderer, JSON_RENDERERS):
+            return HttpResponse(document, content_type="application/json")
+        return Response(generated_document(self, version))
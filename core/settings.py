@@ -39,26 +39,44 @@ DATABASES = {
         "PORT": env("DB_PORT"),
     }
 }
-import boto3
-import os
-from botocore.exceptions import NoCredentialsError, PartialCredentialsError
+
+# Read replicas, as a comma-separated DB_REPLICA_HOSTS list of host[:port]
+# with the primary's credentials. Views marked `replica_reads = True` read
+# from one that answers and lags at most REPLICA_MAX_LAG seconds (see
+# utils/db_router.py). A cache miss is filled from the primary instead while
+# the replicas may not have applied the write that invalidated the entry.
+# The health check needs the REPLICATION CLIENT grant.
+REPLICA_DATABASES = []
+for index, address in enumerate(env.list("DB_REPLICA_HOSTS", default=[])):
+    host, _, port = address.partition(":")
+    alias = f"replica_{index + 1}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ["utils.db_router.ReplicaRouter"]
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "5"))
+REPLICA_HEALTH_CHECK_INTERVAL = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL", "10"))
+# After a write, the client reads from the primary for this many seconds
+READ_YOUR_WRITES_WINDOW = int(os.getenv("READ_YOUR_WRITES_WINDOW", "15"))
 
 ## Optional: AWS profile name from environment, or fallback to local
 AWS_PROFILE_NAME = os.getenv("AWS_PROFILE_NAME")
 USE_S3 = os.getenv("USE_S3", "False") == "True"  
 
-# If USE_S3 is true, set up S3 session and storage configuration
+# If USE_S3 is true, configure S3 storage. django-storages creates the boto3
+# session and client itself on first use, so boto3 (a large import) is only
+# loaded by deployments that store files on S3.
 if USE_S3:
     if AWS_PROFILE_NAME:
-        session = boto3.Session(profile_name=AWS_PROFILE_NAME)
+        AWS_S3_SESSION_PROFILE = AWS_PROFILE_NAME
     else:
-        session = boto3.Session(
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-        )
-
-    # S3 client using the session
-    s3 = session.client("s3")
+        AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
+        AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 
     # S3 settings
     DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
@@ -86,6 +104,10 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "utils.renderers.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 REDIS_HOST = os.getenv(
     "REDIS_HOST", "localhost"
@@ -104,6 +126,51 @@ CACHES = {
 
 CACHE_TTL = 60 * 15  # Default cache timeout of 15 minutes
 
+# Response compression (utils.compression). Bodies smaller than
+# COMPRESSION_MIN_SIZE bytes are sent uncompressed. Brotli is used when the
+# `brotli` package is installed; cached variants use a denser quality because
+# they are compressed once per cache fill (see benchmarks/compression.py:
+# quality 9+ costs several ms per 100-row page for under 1% extra saving).
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "512"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSION_CACHE_BROTLI_QUALITY = int(
+    os.getenv("COMPRESSION_CACHE_BROTLI_QUALITY", "8")
+)
+
+# Serve the medicine list, detail and search GETs from async views (see
+# inventory/api/async_views.py). Only worth it under an ASGI server; under
+# WSGI every async view call spins up an event loop.
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS", "False") == "True"
+
+# Per-request timings of the database, Redis, serializer and renderer phases,
+# sent as a Server-Timing header and exported as Prometheus histograms at
+# /metrics (see utils/request_timing.py and utils/metrics.py). Off, the
+# middleware is not installed.
+REQUEST_METRICS = os.getenv("REQUEST_METRICS", "False") == "True"
+
+# Stock summary reports: generic names at or below this many units in a
+# category count as low on stock unless the request passes `threshold`
+LOW_STOCK_THRESHOLD = int(os.getenv("LOW_STOCK_THRESHOLD", "20"))
+
+# OpenAPI document written at build time by
+# `python manage.py generate_swagger --overwrite openapi.json` and served as-is
+# by /swagger.json (see core/openapi.py). The docs pages load it from there.
+OPENAPI_SCHEMA_FILE = os.path.join(BASE_DIR, "openapi.json")
+SWAGGER_SETTINGS = {"DEFAULT_INFO": "core.openapi.API_INFO", "SPEC_URL": "/swagger.json"}
+REDOC_SETTINGS = {"SPEC_URL": "/swagger.json"}
+
+# Log records are queued and written by a background thread per logger (see
+# utils/log_pipeline.py), so requests never wait on the log files. When the
+# writer falls LOG_QUEUE_SIZE records behind, new records are dropped.
+LOGGING_CONFIG = "utils.log_pipeline.configure_logging"
+LOG_QUEUE = os.getenv("LOG_QUEUE", "True") == "True"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Fractions of the high-volume INFO lines kept: cache hits, misses and fills
+# ("app_logger.cache") and the per-request trace of the read endpoints
+# ("app_logger.reads"). Warnings and errors are always kept.
+LOG_CACHE_SAMPLE_RATE = float(os.getenv("LOG_CACHE_SAMPLE_RATE", "0.01"))
+LOG_READ_SAMPLE_RATE = float(os.getenv("LOG_READ_SAMPLE_RATE", "0.1"))
 
 LOGGING = {
     "version": 1,
@@ -114,6 +181,16 @@ LOGGING = {
             "style": "{",
         },
     },
+    "filters": {
+        "sample_cache": {
+            "()": "utils.log_pipeline.SamplingFilter",
+            "rate": LOG_CACHE_SAMPLE_RATE,
+        },
+        "sample_reads": {
+            "()": "utils.log_pipeline.SamplingFilter",
+            "rate": LOG_READ_SAMPLE_RATE,
+        },
+    },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
@@ -143,6 +220,9 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        # Sampled children; their records reach the app_logger handlers
+        "app_logger.cache": {"filters": ["sample_cache"]},
+        "app_logger.reads": {"filters": ["sample_reads"]},
     },
 }
 
@@ -174,13 +254,22 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
 }
+from corsheaders.defaults import default_headers
+
 CORS_ALLOW_ALL_ORIGINS = True
+# API clients echo the read-your-writes token (utils/db_router.py)
+CORS_ALLOW_HEADERS = (*default_headers, "x-read-primary-until")
+CORS_EXPOSE_HEADERS = ["X-Read-Primary-Until", "Server-Timing"]
 
 MIDDLEWARE = [
+    "utils.request_timing.RequestTimingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "utils.compression.CompressionMiddleware",
+    "utils.query_budget.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "utils.db_router.ReplicaRoutingMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -1,41 +1,31 @@
 from django.contrib import admin
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 from django.urls import include, path, re_path
-from rest_framework.permissions import AllowAny
 from django.conf.urls.static import static
-from authentication import permissions
 from core import settings
+from core.openapi import SchemaView
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Medicine Index API",
-        default_version="v1",
-        description="API documentation for Medicine Index Application",
-        contact=openapi.Contact(email="fuadmubtasim@gmail.con"),
-        license=openapi.License(name="MIT License"),
-    ),
-    public=True,
-    permission_classes=(AllowAny,),
-)
 urlpatterns = [
     # Swagger UI
     re_path(
         r"^swagger(?P<format>\.json|\.yaml)$",
-        schema_view.without_ui(cache_timeout=0),
+        SchemaView.without_ui(),
         name="schema-json",
     ),
     path(
         "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
+        SchemaView.with_ui("swagger"),
         name="schema-swagger-ui",
     ),
     # ReDoc UI
-    path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
+    path("redoc/", SchemaView.with_ui("redoc"), name="schema-redoc"),
     # Admin
     path("admin/", admin.site.urls),
     path("api/auth/", include("authentication.urls")),  # Authentication routes
     path("api/", include("inventory.api.urls")),  # Other app routes
 ]
+if settings.REQUEST_METRICS:
+    from utils.metrics import metrics_view
+
+    urlpatterns.append(path("metrics", metrics_view, name="metrics"))
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
@@ -86,17 +86,13 @@ const MedicineList: React.FC = () => {
   const fetchAuxiliaryData = async () => {
     setDropdownLoading(true);
     try {
-      const [categoriesRes, formsRes, manufacturersRes, genericNamesRes] =
-        await Promise.all([
-          api.get("/categories/"),
-          api.get("/forms/"),
-          api.get("/manufacturers/"),
-          api.get("/generic-names/"),
-        ]);
-      setCategories(categoriesRes.data.data || []);
-      setForms(formsRes.data.data || []);
-      setManufacturers(manufacturersRes.data.data || []);
-      setGenericNames(genericNamesRes.data.data || []);
+      // One request for every dropdown; the server answers 304 when unchanged
+      const response = await api.get("/reference-data/");
+      const referenceData = response.data.data || {};
+      setCategories(referenceData.categories || []);
+      setForms(referenceData.forms || []);
+      setManufacturers(referenceData.manufacturers || []);
+      setGenericNames(referenceData.generic_names || []);
     } catch (error) {
       console.error("Error fetching auxiliary data:", error);
       setErrorMessage("Failed to load auxiliary data.");
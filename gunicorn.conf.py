@@ -0,0 +1,56 @@
+"""
+Gunicorn settings, read from the working directory by every `gunicorn`
+command (Dockerfile, docker-compose.yml).
+
+The app is imported once in the master and warmed up there (utils/warmup.py)
+before the workers are forked, so each worker starts with the URL resolver,
+views, model metadata, row mappers and schema already built, shared
+copy-on-write, instead of building them on its first requests. Set
+GUNICORN_PRELOAD=False to load the app in each worker instead, e.g. to
+compare with `python -m benchmarks.cold_start`.
+"""
+import gc
+import multiprocessing
+import os
+import random
+import shutil
+
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+
+
+def on_starting(server):
+    # Per-worker metric files (utils/metrics.py) left by a previous run would
+    # be added to this run's
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+
+def when_ready(server):
+    # Runs in the master after the preloaded app is imported, before forking
+    if not server.cfg.preload_app:
+        return
+    from django.db import connections
+    from utils.warmup import warm_up
+
+    timings = warm_up()
+    server.log.info("Warmed up in %.2fs before forking workers", sum(timings.values()))
+    # Workers must open their own database connections
+    connections.close_all()
+    # Keep the warmed objects out of the collector, so collections in the
+    # workers do not write to (and un-share) the pages they live on
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Forked workers would otherwise share the master's random state
+    random.seed()
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,61 @@
+# inventory/api/async_views.py
+"""
+Async entry points for the medicine read endpoints, used when
+ASYNC_READ_VIEWS is on and the app runs under an ASGI server (core/asgi.py).
+
+Anonymous GETs are answered without leaving the event loop when the
+rendered page is in Redis, read with the asyncio client. A cache miss runs
+the view's page builder (or the async ORM, for the detail) in Django's
+database thread. Writes, and reads that carry credentials, run the
+unchanged DRF view in a worker thread, so authentication, permissions and
+the write paths behave exactly as under WSGI.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+
+def async_read_view(view_class):
+    """
+    An async view for `view_class`, a DRF APIView with an async `aget`
+    alongside its `get`. Keeps the attributes middleware reads from DRF
+    views (`view_class`, CSRF exemption).
+    """
+    sync_view = sync_to_async(view_class.as_view())
+
+    async def view(request, *args, **kwargs):
+        if request.method != "GET" or "HTTP_AUTHORIZATION" in request.META:
+            return await sync_view(request, *args, **kwargs)
+        return await dispatch_get(view_class(), request, *args, **kwargs)
+
+    view.view_class = view_class
+    view.csrf_exempt = True
+    return view
+
+
+async def dispatch_get(self, request, *args, **kwargs):
+    """
+    APIView.dispatch for an anonymous GET, awaiting `aget`. The checks in
+    `initial` need no I/O here: without an Authorization header the JWT
+    authenticator returns before any user lookup.
+    """
+    self.args = args
+    self.kwargs = kwargs
+    request = self.initialize_request(request, *args, **kwargs)
+    self.request = request
+    self.headers = self.default_response_headers
+
+    try:
+        self.initial(request, *args, **kwargs)
+        response = await self.aget(request, *args, **kwargs)
+    except Exception as exc:
+        response = self.handle_exception(exc)
+
+    self.response = self.finalize_response(request, response, *args, **kwargs)
+    return self.response
+
+
+def read_view(view_class):
+    """The URL view for a read endpoint: async when ASYNC_READ_VIEWS is on."""
+    if settings.ASYNC_READ_VIEWS:
+        return async_read_view(view_class)
+    return view_class.as_view()
@@ -13,16 +13,34 @@ from ..utils import api_response
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from rest_framework.pagination import PageNumberPagination
+from .reference_data import reference_list_response, reference_snapshot_response
+
+# Pagination is opt-in: without these parameters the full list is returned
+reference_list_parameters = [
+    openapi.Parameter(
+        "page",
+        openapi.IN_QUERY,
+        description="Page number; enables pagination.",
+        type=openapi.TYPE_INTEGER,
+    ),
+    openapi.Parameter(
+        "page_size",
+        openapi.IN_QUERY,
+        description="Items per page (max 500); enables pagination.",
+        type=openapi.TYPE_INTEGER,
+    ),
+]
 
-class ManufacturerPagination(PageNumberPagination):
-    page_size = 10  # Adjust page size as needed
 
 class GenericNameListCreateView(APIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    # Safe requests read from a replica (utils.db_router)
+    replica_reads = True
+    query_budget = {"GET": 2}
 
     @swagger_auto_schema(
-        operation_description="Retrieve a list of all generic names.",
+        operation_description="Retrieve a list of all generic names. Cached and served with an ETag; pass `page` or `page_size` for a paginated response.",
+        manual_parameters=reference_list_parameters,
         responses={
             200: openapi.Response(
                 description="List of generic names",
@@ -31,9 +49,7 @@ class GenericNameListCreateView(APIView):
         },
     )
     def get(self, request):
-        generic_names = GenericName.objects.all()
-        serializer = GenericNameSerializer(generic_names, many=True)
-        return api_response(success=True, data=serializer.data)
+        return reference_list_response(request, "generic_names")
 
     @swagger_auto_schema(
         operation_description="Create a new generic name.",
@@ -65,6 +81,7 @@ class GenericNameListCreateView(APIView):
 
 class GenericNameRetrieveUpdateDestroyView(APIView):
     permission_classes = [permissions.IsAdminUser]
+    replica_reads = True
 
     def get_object(self, pk):
         try:
@@ -155,9 +172,12 @@ class GenericNameRetrieveUpdateDestroyView(APIView):
 
 class MedicineCategoryListCreateView(APIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    replica_reads = True
+    query_budget = {"GET": 2}
 
     @swagger_auto_schema(
-        operation_description="Retrieve a list of all medicine categories.",
+        operation_description="Retrieve a list of all medicine categories. Cached and served with an ETag; pass `page` or `page_size` for a paginated response.",
+        manual_parameters=reference_list_parameters,
         responses={
             200: openapi.Response(
                 description="List of medicine categories",
@@ -166,9 +186,7 @@ class MedicineCategoryListCreateView(APIView):
         },
     )
     def get(self, request):
-        categories = MedicineCategory.objects.all()
-        serializer = MedicineCategorySerializer(categories, many=True)
-        return api_response(success=True, data=serializer.data)
+        return reference_list_response(request, "categories")
 
     @swagger_auto_schema(
         operation_description="Create a new medicine category.",
@@ -200,6 +218,7 @@ class MedicineCategoryListCreateView(APIView):
 
 class MedicineCategoryRetrieveUpdateDestroyView(APIView):
     permission_classes = [permissions.IsAdminUser]
+    replica_reads = True
 
     def get_object(self, pk):
         try:
@@ -290,9 +309,12 @@ class MedicineCategoryRetrieveUpdateDestroyView(APIView):
 
 class MedicineFormListCreateView(APIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    replica_reads = True
+    query_budget = {"GET": 2}
 
     @swagger_auto_schema(
-        operation_description="Retrieve a list of all medicine forms.",
+        operation_description="Retrieve a list of all medicine forms. Cached and served with an ETag; pass `page` or `page_size` for a paginated response.",
+        manual_parameters=reference_list_parameters,
         responses={
             200: openapi.Response(
                 description="List of medicine forms",
@@ -301,9 +323,7 @@ class MedicineFormListCreateView(APIView):
         },
     )
     def get(self, request):
-        forms = MedicineForm.objects.all()
-        serializer = MedicineFormSerializer(forms, many=True)
-        return api_response(success=True, data=serializer.data)
+        return reference_list_response(request, "forms")
 
     @swagger_auto_schema(
         operation_description="Create a new medicine form.",
@@ -335,6 +355,7 @@ class MedicineFormListCreateView(APIView):
 
 class MedicineFormRetrieveUpdateDestroyView(APIView):
     permission_classes = [permissions.IsAdminUser]
+    replica_reads = True
 
     def get_object(self, pk):
         try:
@@ -423,9 +444,12 @@ class MedicineFormRetrieveUpdateDestroyView(APIView):
 
 class ManufacturerListCreateView(APIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    replica_reads = True
+    query_budget = {"GET": 2}
 
     @swagger_auto_schema(
-        operation_description="Retrieve a list of all manufacturers.",
+        operation_description="Retrieve a list of all manufacturers. Cached and served with an ETag; pass `page` or `page_size` for a paginated response.",
+        manual_parameters=reference_list_parameters,
         responses={
             200: openapi.Response(
                 description="List of manufacturers",
@@ -434,9 +458,7 @@ class ManufacturerListCreateView(APIView):
         },
     )
     def get(self, request):
-        manufacturers = Manufacturer.objects.all()
-        serializer = ManufacturerSerializer(manufacturers, many=True)
-        return api_response(success=True, data=serializer.data)
+        return reference_list_response(request, "manufacturers")
 
     @swagger_auto_schema(
         operation_description="Create a new manufacturer.",
@@ -468,6 +490,7 @@ class ManufacturerListCreateView(APIView):
 
 class ManufacturerRetrieveUpdateDestroyView(APIView):
     permission_classes = [permissions.AllowAny]
+    replica_reads = True
 
     def get_object(self, pk):
         try:
@@ -554,3 +577,19 @@ class ManufacturerRetrieveUpdateDestroyView(APIView):
             message="Manufacturer deleted successfully.",
             status_code=status.HTTP_204_NO_CONTENT,
         )
+
+
+class ReferenceDataView(APIView):
+    permission_classes = [permissions.AllowAny]
+    replica_reads = True
+    query_budget = {"GET": 4}
+
+    @swagger_auto_schema(
+        operation_description="All generic names, categories, forms and manufacturers in one versioned, cached snapshot. Send the returned ETag in `If-None-Match` to get a 304 while nothing changed.",
+        responses={
+            200: "Snapshot of every reference table with its `version`.",
+            304: "Not Modified - The client's snapshot is current.",
+        },
+    )
+    def get(self, request):
+        return reference_snapshot_response(request)
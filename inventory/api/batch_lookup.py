@@ -0,0 +1,121 @@
+# inventory/api/batch_lookup.py
+import uuid
+from inventory.cache_keys import (
+    MEDICINE_BATCH_NUMBER_CACHE_KEY_TEMPLATE,
+    MEDICINE_ITEM_CACHE_KEY_TEMPLATE,
+)
+from utils.redis_cache import RedisCache
+from ..exceptions import ValidationError
+from ..models import MedicineDetail
+from .row_mappers import get_row_mapper
+
+cache_manager = RedisCache()
+
+BATCH_LOOKUP_LIMIT = 1000
+ITEM_CACHE_EXPIRATION = 900
+
+
+def parse_ids(values):
+    """Validate and normalise requested UUIDs, keeping order and duplicates."""
+    try:
+        return [str(uuid.UUID(str(value))) for value in values]
+    except ValueError:
+        raise ValidationError("Every id must be a valid UUID.")
+
+
+def fetch_items(**lookup):
+    """Load items in a single IN query with the joined reference data."""
+    mapper = get_row_mapper()
+    rows = MedicineDetail.objects.filter(**lookup).values_list(*mapper.columns)
+    return mapper.map_rows(rows)
+
+
+def lookup_by_ids(ids):
+    """
+    Resolve medicines by id: cache hits with one MGET, every miss in one IN
+    query, and the misses back-filled with one pipelined round trip.
+    Returns {id: item} for the ids that exist.
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    cached = cache_manager.get_many(
+        [MEDICINE_ITEM_CACHE_KEY_TEMPLATE.format(pk) for pk in unique_ids]
+    )
+    found = {pk: item for pk, item in zip(unique_ids, cached) if item is not None}
+
+    missing = [pk for pk in unique_ids if pk not in found]
+    if missing:
+        fetched = {item["id"]: item for item in fetch_items(pk__in=missing)}
+        found.update(fetched)
+        cache_manager.set_many(
+            {MEDICINE_ITEM_CACHE_KEY_TEMPLATE.format(pk): item for pk, item in fetched.items()},
+            expiration=ITEM_CACHE_EXPIRATION,
+        )
+    return found
+
+
+def lookup_by_batch_numbers(batch_numbers):
+    """
+    Resolve medicines by batch number through cached batch_number -> id
+    aliases, with the same single-query fill for misses.
+    Returns {batch_number: item} for the batch numbers that exist.
+    """
+    unique_numbers = list(dict.fromkeys(str(number) for number in batch_numbers))
+    aliases = cache_manager.get_many(
+        [MEDICINE_BATCH_NUMBER_CACHE_KEY_TEMPLATE.format(number) for number in unique_numbers]
+    )
+    aliased = {number: pk for number, pk in zip(unique_numbers, aliases) if pk is not None}
+
+    found = {}
+    if aliased:
+        cached = cache_manager.get_many(
+            [MEDICINE_ITEM_CACHE_KEY_TEMPLATE.format(pk) for pk in aliased.values()]
+        )
+        for number, item in zip(aliased, cached):
+            # A stale alias (batch number changed since) is treated as a miss
+            if item is not None and item["batch_number"] == number:
+                found[number] = item
+
+    missing = [number for number in unique_numbers if number not in found]
+    if missing:
+        fetched = {item["batch_number"]: item for item in fetch_items(batch_number__in=missing)}
+        found.update(fetched)
+        backfill = {}
+        for number, item in fetched.items():
+            backfill[MEDICINE_ITEM_CACHE_KEY_TEMPLATE.format(item["id"])] = item
+            backfill[MEDICINE_BATCH_NUMBER_CACHE_KEY_TEMPLATE.format(number)] = item["id"]
+        cache_manager.set_many(backfill, expiration=ITEM_CACHE_EXPIRATION)
+    return found
+
+
+def batch_lookup(data):
+    """
+    Resolve a batch lookup request body holding either `ids` or
+    `batch_numbers`. Results follow the request order, with None for entries
+    that were not found.
+    """
+    if not isinstance(data, dict):
+        raise ValidationError("Expected an object with 'ids' or 'batch_numbers'.")
+
+    ids, batch_numbers = data.get("ids"), data.get("batch_numbers")
+    if (ids is None) == (batch_numbers is None):
+        raise ValidationError("Provide exactly one of 'ids' or 'batch_numbers'.")
+
+    values = ids if ids is not None else batch_numbers
+    if not isinstance(values, list) or not values:
+        raise ValidationError("Lookup values must be a non-empty list.")
+    if len(values) > BATCH_LOOKUP_LIMIT:
+        raise ValidationError(
+            f"At most {BATCH_LOOKUP_LIMIT} medicines can be looked up at once."
+        )
+
+    if ids is not None:
+        keys = parse_ids(ids)
+        found = lookup_by_ids(keys)
+    else:
+        keys = [str(number) for number in batch_numbers]
+        found = lookup_by_batch_numbers(keys)
+
+    return {
+        "results": [found.get(key) for key in keys],
+        "not_found": [key for key in dict.fromkeys(keys) if key not in found],
+    }
@@ -0,0 +1,192 @@
+# inventory/api/batch_views.py
+import logging
+from rest_framework.views import APIView
+from rest_framework import status, permissions
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from django.db import IntegrityError
+from authentication.permissions import IsAdminOrReadOnly
+from inventory.exceptions import ValidationError
+from inventory.utils import api_response
+from .batch_lookup import BATCH_LOOKUP_LIMIT, batch_lookup
+from .bulk import (
+    BULK_LIMIT,
+    bulk_create_medicines,
+    bulk_delete_medicines,
+    bulk_update_medicines,
+)
+from .serializers import MedicineDetailSerializer
+
+app_logger = logging.getLogger("app_logger")
+error_logger = logging.getLogger("error_logger")
+
+
+class MedicineBatchLookupView(APIView):
+    # A read-only lookup that happens to need a request body
+    permission_classes = [permissions.AllowAny]
+    # A single IN query for every cache miss, plus their condition ids
+    query_budget = {"POST": 2}
+
+    @swagger_auto_schema(
+        operation_description=f"Resolve up to {BATCH_LOOKUP_LIMIT} medicines at once by id or batch number. Results keep the request order; unknown entries are null and listed in `not_found`.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "ids": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_STRING, format="uuid"),
+                ),
+                "batch_numbers": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_STRING),
+                ),
+            },
+        ),
+        responses={
+            200: "Medicines in request order, with null for entries not found.",
+            400: "Bad Request - Invalid or oversized lookup.",
+            500: "Internal Server Error - Error occurred during the lookup.",
+        },
+    )
+    def post(self, request):
+        """Resolve many medicines with one cache round trip and one query."""
+        try:
+            data = batch_lookup(request.data)
+            app_logger.info(
+                "Batch lookup resolved %s medicines", len(data["results"]) - len(data["not_found"])
+            )
+            return api_response(success=True, data=data)
+
+        except ValidationError as e:
+            error_logger.error("Invalid batch lookup: %s", e)
+            return api_response(
+                success=False, message=str(e), status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            error_logger.error("Error in MedicineBatchLookupView POST method: %s", e)
+            return api_response(
+                success=False,
+                message="An error occurred while looking up medicines.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+bulk_ids_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "ids": openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(type=openapi.TYPE_STRING, format="uuid"),
+        ),
+    },
+)
+
+
+class MedicineBulkView(APIView):
+    """
+    Batch writes for supplier catalog updates. A payload is validated with
+    batched queries and written in one transaction; the cache is invalidated
+    once, after commit. Any invalid item rejects the whole batch with one
+    error entry per item, in payload order.
+    """
+
+    permission_classes = [IsAdminOrReadOnly]
+    # Constant, whatever the batch size, with the stock summary refresh (4)
+    query_budget = {"POST": 14, "PUT": 14, "DELETE": 12}
+
+    @swagger_auto_schema(
+        operation_description=f"Create up to {BULK_LIMIT} medicines in one transaction.",
+        request_body=MedicineDetailSerializer(many=True),
+        responses={
+            201: "Medicines created successfully.",
+            400: "Bad Request - One error entry per item, in payload order.",
+            500: "Internal Server Error - Error occurred while creating the medicines.",
+        },
+    )
+    def post(self, request):
+        """Create many medicine entries at once."""
+        return self.write(
+            request,
+            bulk_create_medicines,
+            "created",
+            status.HTTP_201_CREATED,
+        )
+
+    @swagger_auto_schema(
+        operation_description=f"Partially update up to {BULK_LIMIT} medicines in one transaction. Every item carries its `id`.",
+        request_body=MedicineDetailSerializer(many=True),
+        responses={
+            200: "Medicines updated successfully.",
+            400: "Bad Request - One error entry per item, in payload order.",
+            500: "Internal Server Error - Error occurred while updating the medicines.",
+        },
+    )
+    def put(self, request):
+        """Update many medicine entries at once."""
+        return self.write(request, bulk_update_medicines, "updated", status.HTTP_200_OK)
+
+    def write(self, request, writer, action, status_code):
+        try:
+            ids = writer(request.data)
+            app_logger.info("Bulk %s %s medicines", action, len(ids))
+            return api_response(
+                success=True,
+                data={"count": len(ids), "ids": ids},
+                message=f"Medicines {action} successfully.",
+                status_code=status_code,
+            )
+
+        except ValidationError as e:
+            error_logger.error("Bulk validation failed: %s", e.detail)
+            return api_response(
+                success=False, message=e.detail, status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except IntegrityError as e:
+            # A concurrent write took a batch number between validation and commit
+            error_logger.error("Bulk write conflict: %s", e)
+            return api_response(
+                success=False,
+                message="The batch conflicts with a concurrent change. Please retry.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            error_logger.error("Exception in MedicineBulkView bulk write: %s", e)
+            return api_response(
+                success=False,
+                message="An error occurred while writing the medicines.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    @swagger_auto_schema(
+        operation_description=f"Delete up to {BULK_LIMIT} medicines by id in one transaction.",
+        request_body=bulk_ids_schema,
+        responses={
+            200: "Medicines deleted; ids that did not exist are listed in `not_found`.",
+            400: "Bad Request - Invalid ids.",
+            500: "Internal Server Error - Error occurred while deleting the medicines.",
+        },
+    )
+    def delete(self, request):
+        """Delete many medicine entries at once."""
+        try:
+            ids = request.data.get("ids") if isinstance(request.data, dict) else None
+            deleted, not_found = bulk_delete_medicines(ids)
+            app_logger.info("Bulk deleted %s medicines", len(deleted))
+            return api_response(
+                success=True,
+                data={"count": len(deleted), "not_found": not_found},
+                message="Medicines deleted successfully.",
+            )
+
+        except ValidationError as e:
+            error_logger.error("Invalid bulk delete: %s", e.detail)
+            return api_response(
+                success=False, message=e.detail, status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            error_logger.error("Exception in MedicineBulkView DELETE method: %s", e)
+            return api_response(
+                success=False,
+                message="An error occurred while deleting the medicines.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
@@ -0,0 +1,250 @@
+# inventory/api/bulk.py
+import uuid
+from collections import Counter
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.utils import timezone
+from inventory.signals import queue_invalidation, suspend_cache_invalidation
+from ..exceptions import ValidationError
+from ..models import (
+    MedicineDetail,
+    GenericName,
+    MedicineCategory,
+    MedicineForm,
+    Manufacturer,
+)
+from .batch_lookup import parse_ids
+from .serializers import BulkMedicineSerializer
+from .stock import locked_stock, queue_live_stock_sync
+
+BULK_LIMIT = 5000
+BULK_BATCH_SIZE = 500
+
+RELATED_MODELS = {
+    "generic_name": GenericName,
+    "category": MedicineCategory,
+    "form": MedicineForm,
+    "manufacturer": Manufacturer,
+}
+
+DUPLICATE_BATCH_NUMBER_MESSAGE = "Duplicate batch number in this request."
+EXISTING_BATCH_NUMBER_MESSAGE = "medicine detail with this batch number already exists."
+FEATURED_MESSAGE = "Only one featured medicine is allowed per generic name."
+
+
+def normalise_id(value):
+    """Canonical string form of a UUID, or None when it is not one."""
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
+
+
+def check_payload(items):
+    if not isinstance(items, list) or not items:
+        raise ValidationError("Expected a non-empty list of medicines.")
+    if len(items) > BULK_LIMIT:
+        raise ValidationError(f"At most {BULK_LIMIT} medicines can be written at once.")
+
+
+def load_related_objects(items):
+    """Fetch every referenced relation with one IN query per related model."""
+    related = {}
+    for field_name, model in RELATED_MODELS.items():
+        pks = set()
+        for item in items:
+            value = item.get(field_name) if isinstance(item, dict) else None
+            if value is None or isinstance(value, (bool, dict, list)):
+                continue
+            try:
+                pks.add(model._meta.pk.to_python(value))
+            except DjangoValidationError:
+                continue  # Reported by the serializer as an incorrect type
+        objects = model.objects.in_bulk(pks) if pks else {}
+        related[field_name] = {str(pk): obj for pk, obj in objects.items()}
+    return related
+
+
+def check_batch_numbers(rows, errors):
+    """In-payload duplicates, then conflicts with other rows in one query."""
+    counts = Counter(row["batch_number"] for row in rows if row["batch_number"])
+    owners = dict(
+        MedicineDetail.objects.filter(batch_number__in=list(counts)).values_list(
+            "batch_number", "id"
+        )
+    )
+    for row in rows:
+        number = row["batch_number"]
+        if not number:
+            continue
+        if counts[number] > 1:
+            errors[row["index"]].setdefault("batch_number", []).append(
+                DUPLICATE_BATCH_NUMBER_MESSAGE
+            )
+        elif number in owners and owners[number] != row["id"]:
+            errors[row["index"]].setdefault("batch_number", []).append(
+                EXISTING_BATCH_NUMBER_MESSAGE
+            )
+
+
+def check_featured(rows, errors):
+    """At most one featured medicine per generic name once the batch is applied."""
+    generic_ids = {row["generic_name_id"] for row in rows if row["is_featured"]}
+    if not generic_ids:
+        return
+    taken = set(
+        MedicineDetail.objects.filter(generic_name_id__in=generic_ids, is_featured=True)
+        .exclude(pk__in=[row["id"] for row in rows if row["id"] is not None])
+        .values_list("generic_name_id", flat=True)
+    )
+    for row in rows:
+        if not row["is_featured"]:
+            continue
+        if row["generic_name_id"] in taken:
+            errors[row["index"]].setdefault("is_featured", []).append(FEATURED_MESSAGE)
+        taken.add(row["generic_name_id"])
+
+
+def validate_items(items, instances=None):
+    """
+    Validate a whole payload with batched queries. When `instances` is given
+    ({str(id): medicine}) the items are partial updates keyed by their `id`.
+    Returns [(instance or None, validated data)] in payload order, or raises
+    ValidationError with one error dict per item, like `serializer.errors`
+    for a list.
+    """
+    context = {"related_objects": load_related_objects(items)}
+    errors, validated, rows = [], [], []
+
+    for index, item in enumerate(items):
+        instance = None
+        if instances is not None:
+            instance = (
+                instances.get(normalise_id(item.get("id"))) if isinstance(item, dict) else None
+            )
+            if instance is None:
+                errors.append({"id": ["Medicine not found."]})
+                validated.append(None)
+                continue
+        serializer = BulkMedicineSerializer(
+            instance, data=item, partial=instance is not None, context=context
+        )
+        if not serializer.is_valid():
+            errors.append(dict(serializer.errors))
+            validated.append(None)
+            continue
+
+        data = serializer.validated_data
+        errors.append({})
+        validated.append((instance, data))
+        generic_name = data.get("generic_name")
+        rows.append(
+            {
+                "index": index,
+                "id": instance.id if instance else None,
+                "batch_number": data.get(
+                    "batch_number", instance.batch_number if instance else None
+                ),
+                "generic_name_id": generic_name.pk if generic_name else instance.generic_name_id,
+                "is_featured": data.get(
+                    "is_featured", instance.is_featured if instance else False
+                ),
+            }
+        )
+
+    check_batch_numbers(rows, errors)
+    check_featured(rows, errors)
+    if any(errors):
+        raise ValidationError(errors)
+    return validated
+
+
+def bulk_create_medicines(items):
+    check_payload(items)
+    validated = validate_items(items)
+
+    medicines = []
+    for _, data in validated:
+        medicine = MedicineDetail(**data)
+        # The generic name comes from the preloaded relations, so no query here
+        medicine.search_content = f"{medicine.name} {medicine.generic_name.name}"
+        medicines.append(medicine)
+
+    with transaction.atomic():
+        MedicineDetail.objects.bulk_create(medicines, batch_size=BULK_BATCH_SIZE)
+        queue_invalidation(
+            [medicine.id for medicine in medicines],
+            generic_ids={medicine.generic_name_id for medicine in medicines},
+        )
+    return [str(medicine.id) for medicine in medicines]
+
+
+def bulk_update_medicines(items):
+    check_payload(items)
+    ids = [normalise_id(item.get("id")) for item in items if isinstance(item, dict)]
+    instances = {
+        str(medicine.id): medicine
+        for medicine in MedicineDetail.objects.select_related("generic_name").filter(
+            pk__in=[pk for pk in ids if pk]
+        )
+    }
+    validated = validate_items(items, instances=instances)
+
+    # bulk_update skips auto_now, so updated_at is set explicitly
+    now = timezone.now()
+    fields = {"search_content", "updated_at"}
+    medicines, generic_ids = [], set()
+    for medicine, data in validated:
+        # The old generic name too, since an update can move the medicine
+        # between summaries
+        generic_ids.add(medicine.generic_name_id)
+        for attr, value in data.items():
+            setattr(medicine, attr, value)
+            fields.add(attr)
+        medicine.search_content = f"{medicine.name} {medicine.generic_name.name}"
+        medicine.updated_at = now
+        medicines.append(medicine)
+        generic_ids.add(medicine.generic_name_id)
+
+    with transaction.atomic():
+        if "stock_quantity" in fields:
+            # bulk_update writes the column for every row, so rows that keep
+            # their stock take the current value, read under lock
+            previous = locked_stock(
+                MedicineDetail.objects.filter(pk__in=[medicine.id for medicine in medicines])
+            )
+            for medicine, (_, data) in zip(medicines, validated):
+                if "stock_quantity" not in data:
+                    medicine.stock_quantity = previous.get(
+                        str(medicine.id), medicine.stock_quantity
+                    )
+            queue_live_stock_sync(
+                previous, {str(medicine.id): medicine.stock_quantity for medicine in medicines}
+            )
+        MedicineDetail.objects.bulk_update(
+            medicines, sorted(fields), batch_size=BULK_BATCH_SIZE
+        )
+        queue_invalidation([medicine.id for medicine in medicines], generic_ids=generic_ids)
+    return [str(medicine.id) for medicine in medicines]
+
+
+def bulk_delete_medicines(ids):
+    """Delete the given ids; returns (deleted ids, ids that did not exist)."""
+    check_payload(ids)
+    ids = parse_ids(ids)
+
+    with transaction.atomic(), suspend_cache_invalidation():
+        rows = list(
+            MedicineDetail.objects.filter(pk__in=ids).values_list("id", "generic_name_id")
+        )
+        deleted = [medicine_id for medicine_id, _ in rows]
+        condition_ids = set(
+            MedicineDetail.conditions.through.objects.filter(
+                medicinedetail_id__in=deleted
+            ).values_list("condition_id", flat=True)
+        )
+        MedicineDetail.objects.filter(pk__in=deleted).delete()
+        queue_invalidation(deleted, condition_ids, {generic_id for _, generic_id in rows})
+
+    deleted = {str(medicine_id) for medicine_id in deleted}
+    return sorted(deleted), [pk for pk in dict.fromkeys(ids) if pk not in deleted]
@@ -0,0 +1,72 @@
+# inventory/api/condition_index.py
+from inventory.cache_keys import (
+    CONDITION_MEDICINES_CACHE_KEY_TEMPLATE,
+    CONDITION_VERSION_KEY_TEMPLATE,
+)
+from utils.redis_cache import RedisCache
+from ..models import Condition
+from .batch_lookup import lookup_by_ids
+
+cache_manager = RedisCache()
+
+CONDITION_INDEX_EXPIRATION = 3600
+
+# Scored below every medicine so that a condition without medicines is still
+# cached: Redis drops sorted sets once they are empty
+EMPTY_INDEX_MARKER = "-"
+
+
+def build_condition_index(condition_id):
+    """
+    Cache the ids of the condition's medicines as a sorted set scored by
+    creation time, and return them newest first. One query; raises
+    Condition.DoesNotExist for unknown conditions. The ids are not cached if
+    the condition changed while they were read.
+    """
+    version_key = CONDITION_VERSION_KEY_TEMPLATE.format(condition_id)
+    version = cache_manager.get(version_key) or 0
+    rows = list(
+        Condition.objects.filter(pk=condition_id).values_list(
+            "medications__id", "medications__created_at"
+        )
+    )
+    if not rows:
+        raise Condition.DoesNotExist(f"Condition {condition_id} does not exist.")
+
+    scores = {EMPTY_INDEX_MARKER: float("-inf")}
+    for medicine_id, created_at in rows:
+        if medicine_id is not None:  # The outer join yields one empty row
+            scores[str(medicine_id)] = created_at.timestamp()
+    cache_manager.set_sorted_if_current(
+        CONDITION_MEDICINES_CACHE_KEY_TEMPLATE.format(condition_id),
+        scores,
+        version_key,
+        version,
+        expiration=CONDITION_INDEX_EXPIRATION,
+    )
+    del scores[EMPTY_INDEX_MARKER]
+    # Same order as ZREVRANGE: score, then member, both descending
+    return sorted(scores, key=lambda member: (scores[member], member), reverse=True)
+
+
+def condition_medicines_page(condition_id, page, page_size):
+    """
+    One page of a condition's medicines, newest first, as (total, items).
+    The page is sliced from the cached id list and hydrated through the
+    per-medicine item cache, so a warm page costs no queries.
+    """
+    start = (page - 1) * page_size
+    ids, size = cache_manager.get_sorted_range(
+        CONDITION_MEDICINES_CACHE_KEY_TEMPLATE.format(condition_id),
+        start,
+        start + page_size - 1,
+    )
+    if ids is None:
+        ordered = build_condition_index(condition_id)
+        total, ids = len(ordered), ordered[start : start + page_size]
+    else:
+        total = size - 1
+        ids = [medicine_id for medicine_id in ids if medicine_id != EMPTY_INDEX_MARKER]
+
+    items = lookup_by_ids(ids)
+    return total, [items[medicine_id] for medicine_id in ids if medicine_id in items]
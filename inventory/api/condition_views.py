@@ -0,0 +1,105 @@
+# inventory/api/condition_views.py
+import logging
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from authentication.permissions import IsAdminOrReadOnly
+from inventory.exceptions import ValidationError
+from inventory.utils import api_response
+from .condition_index import condition_medicines_page
+from .pagination import StandardResultsPagination
+from .serializers import MedicineDetailSerializer
+from ..models import Condition
+
+app_logger = logging.getLogger("app_logger")
+error_logger = logging.getLogger("error_logger")
+
+
+class ConditionMedicinesView(APIView):
+    permission_classes = [IsAdminOrReadOnly]
+    # Building the id list and hydrating the page's cache misses
+    query_budget = {"GET": 2}
+    pagination_class = StandardResultsPagination
+
+    @swagger_auto_schema(
+        operation_description="Retrieve a paginated list of the medicines for a condition, newest first. Pages are sliced from a cached id list and filled from the per-medicine cache.",
+        manual_parameters=[
+            openapi.Parameter(
+                "page", openapi.IN_QUERY, description="Page number.", type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                "page_size",
+                openapi.IN_QUERY,
+                description="Medicines per page.",
+                type=openapi.TYPE_INTEGER,
+            ),
+        ],
+        responses={
+            200: openapi.Response(
+                description="A paginated list of medicines",
+                schema=MedicineDetailSerializer(many=True),
+            ),
+            400: "Bad Request - Invalid page number.",
+            404: "Not Found - Condition with the given ID does not exist.",
+            500: "Internal Server Error - Error occurred while retrieving medicines.",
+        },
+    )
+    def get(self, request, pk):
+        """Retrieve one page of a condition's medicines."""
+        try:
+            app_logger.info("Fetching medicines for condition ID: %s", pk)
+            paginator = self.pagination_class()
+            page_size = paginator.get_page_size(request)
+            page = self.get_page_number(request, paginator)
+
+            total, results = condition_medicines_page(pk, page, page_size)
+            url = request.build_absolute_uri()
+            next_link = None
+            if page * page_size < total:
+                next_link = replace_query_param(url, paginator.page_query_param, page + 1)
+            previous_link = None
+            if page == 2:
+                previous_link = remove_query_param(url, paginator.page_query_param)
+            elif page > 2:
+                previous_link = replace_query_param(url, paginator.page_query_param, page - 1)
+
+            return Response(
+                {
+                    "count": total,
+                    "next": next_link,
+                    "previous": previous_link,
+                    "results": results,
+                }
+            )
+
+        except Condition.DoesNotExist:
+            error_logger.error("Condition with ID %s not found.", pk)
+            return api_response(
+                success=False,
+                message="Condition not found.",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        except ValidationError as e:
+            error_logger.error("Invalid condition medicines request: %s", e)
+            return api_response(
+                success=False, message=str(e), status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            error_logger.error("Error in ConditionMedicinesView GET method: %s", e)
+            return api_response(
+                success=False,
+                message="An error occurred while retrieving medicines.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def get_page_number(self, request, paginator):
+        try:
+            page = int(request.query_params.get(paginator.page_query_param, 1))
+        except ValueError:
+            raise ValidationError("Invalid page.")
+        if page < 1:
+            raise ValidationError("Invalid page.")
+        return page
@@ -0,0 +1,112 @@
+# inventory/api/export.py
+import csv
+import json
+import zlib
+from ..models import MedicineDetail
+from .row_mappers import get_row_mapper
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ("ndjson", "csv")
+
+CSV_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "batch_number",
+    "stock_quantity",
+    "unit_of_measurement",
+    "prescription_required",
+    "is_available",
+    "is_featured",
+    "generic_name",
+    "category",
+    "form",
+    "manufacturer",
+    "created_at",
+    "updated_at",
+)
+
+# Nested details are flattened to their display value in CSV
+CSV_DETAIL_VALUES = {
+    "generic_name": ("generic_name_details", "name"),
+    "category": ("category_details", "name"),
+    "form": ("form_details", "form_type"),
+    "manufacturer": ("manufacturer_details", "name"),
+}
+
+
+def iter_medicine_batches(chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the whole catalog as lists of API-shaped dicts, `chunk_size` rows at
+    a time, with the joined reference data.
+
+    Batches seek on the primary key (`pk > last seen`) instead of OFFSET, and
+    each batch is fetched and released before the next one. This keeps memory
+    constant on MySQL too, where `QuerySet.iterator()` cannot stream because
+    the driver buffers the whole result set client-side.
+    """
+    mapper = get_row_mapper()
+    id_index = mapper.columns.index("id")
+    queryset = MedicineDetail.objects.order_by("pk").values_list(*mapper.columns)
+
+    last_id = None
+    while True:
+        batch = queryset if last_id is None else queryset.filter(pk__gt=last_id)
+        rows = list(batch[:chunk_size])
+        if not rows:
+            return
+        last_id = rows[-1][id_index]
+        yield mapper.map_rows(rows)
+        if len(rows) < chunk_size:
+            return
+
+
+def ndjson_chunks(batches):
+    """One JSON document per line; one yielded string per batch."""
+    for items in batches:
+        yield "".join(json.dumps(item, separators=(",", ":")) + "\n" for item in items)
+
+
+class _Echo:
+    """File-like object whose write() hands back the formatted line."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(batches):
+    """A header row, then one flattened row per medicine; one string per batch."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for items in batches:
+        lines = []
+        for item in items:
+            row = []
+            for column in CSV_COLUMNS:
+                if column in CSV_DETAIL_VALUES:
+                    details_key, value_key = CSV_DETAIL_VALUES[column]
+                    details = item[details_key]
+                    row.append(details[value_key] if details else "")
+                else:
+                    row.append(item[column])
+            lines.append(writer.writerow(row))
+        yield "".join(lines)
+
+
+def export_chunks(export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """Encoded export body for `export_format` ("ndjson" or "csv") as bytes chunks."""
+    batches = iter_medicine_batches(chunk_size)
+    chunks = csv_chunks(batches) if export_format == "csv" else ndjson_chunks(batches)
+    for chunk in chunks:
+        yield chunk.encode()
+
+
+def gzip_chunks(chunks, level=6):
+    """Compress a stream of bytes chunks on the fly into a single gzip member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,97 @@
+# inventory/api/fieldsets.py
+from ..exceptions import ValidationError
+
+# Scalar fields of MedicineDetail exposed by the read endpoints, in output
+# order. The id lists of ID_LIST_FIELDS are selected the same way.
+SCALAR_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "batch_number",
+    "stock_quantity",
+    "unit_of_measurement",
+    "prescription_required",
+    "is_available",
+    "is_featured",
+    "conditions",
+    "created_at",
+    "updated_at",
+)
+
+# Many-to-many relations rendered as a compact list of related ids
+ID_LIST_FIELDS = ("conditions",)
+
+# Relations that can be expanded into a "<relation>_details" object, with the
+# columns each nested serializer reads
+RELATION_FIELDS = {
+    "generic_name": ("id", "name"),
+    "category": ("id", "name"),
+    "form": ("id", "form_type"),
+    "manufacturer": ("id", "name"),
+}
+
+
+def _parse_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class Fieldset:
+    """
+    The projection requested through `?fields=` and `?expand=`.
+
+    `fields` selects scalar fields (`id` is always included) and `expand`
+    selects which relations are nested as `<relation>_details`. Without either
+    parameter the full representation is returned, as before.
+    """
+
+    def __init__(self, fields=SCALAR_FIELDS, expand=tuple(RELATION_FIELDS)):
+        # Keep canonical order so equal projections share one cache key
+        self.fields = tuple(
+            field for field in SCALAR_FIELDS if field == "id" or field in fields
+        )
+        self.expand = tuple(relation for relation in RELATION_FIELDS if relation in expand)
+
+    @classmethod
+    def from_request(cls, request):
+        fields = request.query_params.get("fields")
+        expand = request.query_params.get("expand")
+
+        requested_fields = SCALAR_FIELDS if fields is None else _parse_list(fields)
+        requested_expand = tuple(RELATION_FIELDS) if expand is None else _parse_list(expand)
+
+        unknown = [f for f in requested_fields if f not in SCALAR_FIELDS]
+        unknown += [r for r in requested_expand if r not in RELATION_FIELDS]
+        if unknown:
+            raise ValidationError(f"Unknown fields requested: {', '.join(unknown)}.")
+
+        return cls(requested_fields, requested_expand)
+
+    @property
+    def is_default(self):
+        return self.fields == SCALAR_FIELDS and self.expand == tuple(RELATION_FIELDS)
+
+    @property
+    def output_fields(self):
+        """Names of the keys present in each serialized item."""
+        return self.fields + tuple(f"{relation}_details" for relation in self.expand)
+
+    @property
+    def cache_key(self):
+        """Stable fragment identifying this projection inside a cache key."""
+        if self.is_default:
+            return "all"
+        return f"fields={','.join(self.fields)}_expand={','.join(self.expand)}"
+
+    def apply(self, queryset):
+        """Narrow the SQL projection: only the requested columns and joins."""
+        columns = [field for field in self.fields if field not in ID_LIST_FIELDS]
+        for relation in self.expand:
+            columns.append(relation)
+            columns.extend(f"{relation}__{column}" for column in RELATION_FIELDS[relation])
+        id_lists = [field for field in self.fields if field in ID_LIST_FIELDS]
+        return (
+            queryset.select_related(*self.expand)
+            .prefetch_related(*id_lists)
+            .only(*columns)
+        )
@@ -0,0 +1,128 @@
+# inventory/api/filters.py
+from decimal import Decimal, InvalidOperation
+from ..exceptions import ValidationError
+from ..models import UnitOfMeasurement
+
+# Allowed `?ordering=` values and the ORDER BY each runs. Every ordering ends
+# on the primary key so pages are stable, and is backed by a composite index
+# (see MedicineDetail.Meta.indexes), so the database walks the index instead
+# of sorting the table.
+ORDERINGS = {
+    "-created_at": ("-created_at", "-id"),
+    "created_at": ("created_at", "id"),
+    "-price": ("-price", "-id"),
+    "price": ("price", "id"),
+    "-name": ("-name", "-id"),
+    "name": ("name", "id"),
+}
+DEFAULT_ORDERING = "-created_at"
+
+TRUE_VALUES = ("true", "1")
+FALSE_VALUES = ("false", "0")
+
+
+def _parse_price(name, value):
+    try:
+        price = Decimal(value)
+    except InvalidOperation:
+        raise ValidationError(f"{name} must be a number.")
+    if not price.is_finite() or price < 0:
+        raise ValidationError(f"{name} must be a non-negative number.")
+    # "5", "5.0" and "5.00" share one cache key
+    return price.normalize()
+
+
+def _parse_bool(name, value):
+    value = value.lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValidationError(f"{name} must be true or false.")
+
+
+def _parse_unit(name, value):
+    if value not in UnitOfMeasurement.values:
+        raise ValidationError(
+            f"{name} must be one of: {', '.join(UnitOfMeasurement.values)}."
+        )
+    return value
+
+
+def _parse_id(name, value):
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError(f"{name} must be an integer id.")
+
+
+# Allowed filter parameters: (ORM lookup, parser)
+FILTERS = {
+    "min_price": ("price__gte", _parse_price),
+    "max_price": ("price__lte", _parse_price),
+    "prescription_required": ("prescription_required", _parse_bool),
+    "is_available": ("is_available", _parse_bool),
+    "unit_of_measurement": ("unit_of_measurement", _parse_unit),
+    "category": ("category_id", _parse_id),
+    "generic_name": ("generic_name_id", _parse_id),
+}
+
+
+class MedicineFilters:
+    """
+    The filters and sort order requested through the query string.
+
+    Only the parameters in FILTERS and the orderings in ORDERINGS are
+    accepted; anything else in `?ordering=` is rejected instead of being
+    passed to the ORM. Without any of them the list is unfiltered and newest
+    first, as before.
+    """
+
+    def __init__(self, ordering=DEFAULT_ORDERING, filters=None):
+        self.ordering = ordering
+        filters = filters or {}
+        # Canonical order so equal requests share one cache key
+        self.filters = {name: filters[name] for name in FILTERS if name in filters}
+
+    @classmethod
+    def from_request(cls, request):
+        ordering = request.query_params.get("ordering") or DEFAULT_ORDERING
+        if ordering not in ORDERINGS:
+            raise ValidationError(
+                f"Unknown ordering '{ordering}'. Allowed: {', '.join(ORDERINGS)}."
+            )
+        filters = {}
+        for name in FILTERS:
+            value = request.query_params.get(name)
+            if value not in (None, ""):
+                filters[name] = FILTERS[name][1](name, value.strip())
+        if "min_price" in filters and "max_price" in filters:
+            if filters["min_price"] > filters["max_price"]:
+                raise ValidationError("min_price must not exceed max_price.")
+        return cls(ordering, filters)
+
+    @property
+    def is_filtered(self):
+        return bool(self.filters)
+
+    @property
+    def is_default(self):
+        return not self.filters and self.ordering == DEFAULT_ORDERING
+
+    @property
+    def cache_key(self):
+        """Stable fragment identifying these filters inside a cache key."""
+        if self.is_default:
+            return "unfiltered"
+        return f"order={self.ordering}_{self.count_cache_key}"
+
+    @property
+    def count_cache_key(self):
+        """Like `cache_key` without the ordering, which never changes a count."""
+        filters = ",".join(f"{name}={value}" for name, value in self.filters.items())
+        return f"filter={filters}"
+
+    def apply(self, queryset):
+        """Filter and order `queryset` with allow-listed lookups only."""
+        lookups = {FILTERS[name][0]: value for name, value in self.filters.items()}
+        return queryset.filter(**lookups).order_by(*ORDERINGS[self.ordering])
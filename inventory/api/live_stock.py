@@ -0,0 +1,455 @@
+# inventory/api/live_stock.py
+"""
+Live available stock in Redis, for reservations.
+
+For every medicine that has been reserved, `stock_available_<id>` holds
+
+    stock_quantity + unflushed deltas - units held by open reservations
+
+Reservations take units atomically in Lua, expire unless committed, and a
+commit turns them into a pending delta that `flush_stock_deltas` writes to
+the database later in batched UPDATEs. The keys are state, not cache: Redis
+must not evict them, and `reconcile_stock` repairs drift against the table.
+Committed deltas the table cannot take are moved to a dead-letter hash; they
+still count against live stock until an operator requeues them.
+
+Decrements made directly to the table are taken from live stock first, so
+units held or sold through reservations cannot be sold twice.
+
+`stock_epoch` is bumped whenever the table's stock changes behind Redis's
+back (a flush or a direct adjustment), so a value read from the database is
+only used to seed or reconcile if no such change happened in between.
+"""
+import logging
+import redis
+from inventory.cache_keys import (
+    STOCK_AVAILABLE_KEY_TEMPLATE,
+    STOCK_DEAD_DELTAS_KEY,
+    STOCK_EPOCH_KEY,
+    STOCK_FLUSHING_DELTAS_KEY,
+    STOCK_FLUSH_ID_KEY,
+    STOCK_PENDING_DELTAS_KEY,
+    STOCK_RESERVATION_EXPIRY_KEY,
+    STOCK_RESERVATION_KEY_TEMPLATE,
+    STOCK_RESERVED_KEY,
+)
+from utils.redis_cache import RedisCache
+
+cache_manager = RedisCache()
+error_logger = logging.getLogger("error_logger")
+
+AVAILABLE_PREFIX = STOCK_AVAILABLE_KEY_TEMPLATE.format("")
+RESERVATION_PREFIX = STOCK_RESERVATION_KEY_TEMPLATE.format("")
+
+# KEYS: reserved, expiry, reservation, epoch
+# ARGV: available prefix, reservation id, expires at, then id/quantity pairs
+RESERVE_SCRIPT = """
+local prefix = ARGV[1]
+local missing = {}
+for i = 4, #ARGV, 2 do
+    if redis.call('EXISTS', prefix .. ARGV[i]) == 0 then
+        missing[#missing + 1] = ARGV[i]
+    end
+end
+if #missing > 0 then
+    return {'missing', missing, redis.call('GET', KEYS[4]) or '0'}
+end
+local short = {}
+for i = 4, #ARGV, 2 do
+    if tonumber(redis.call('GET', prefix .. ARGV[i])) < tonumber(ARGV[i + 1]) then
+        short[#short + 1] = ARGV[i]
+    end
+end
+if #short > 0 then
+    return {'short', short}
+end
+for i = 4, #ARGV, 2 do
+    redis.call('DECRBY', prefix .. ARGV[i], ARGV[i + 1])
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+    redis.call('HSET', KEYS[3], ARGV[i], ARGV[i + 1])
+end
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[2])
+return {'ok'}
+"""
+
+# KEYS: reserved, expiry
+# ARGV: available prefix, reservation prefix, then reservation ids
+RELEASE_SCRIPT = """
+local released = 0
+for i = 3, #ARGV do
+    local key = ARGV[2] .. ARGV[i]
+    local items = redis.call('HGETALL', key)
+    for j = 1, #items, 2 do
+        local available = ARGV[1] .. items[j]
+        if redis.call('EXISTS', available) == 1 then
+            redis.call('INCRBY', available, items[j + 1])
+        end
+        if redis.call('HINCRBY', KEYS[1], items[j], -tonumber(items[j + 1])) <= 0 then
+            redis.call('HDEL', KEYS[1], items[j])
+        end
+    end
+    if #items > 0 then
+        released = released + 1
+    end
+    redis.call('DEL', key)
+    redis.call('ZREM', KEYS[2], ARGV[i])
+end
+return released
+"""
+
+# KEYS: reserved, expiry, reservation, pending
+# ARGV: reservation id
+COMMIT_SCRIPT = """
+local items = redis.call('HGETALL', KEYS[3])
+for j = 1, #items, 2 do
+    if redis.call('HINCRBY', KEYS[1], items[j], -tonumber(items[j + 1])) <= 0 then
+        redis.call('HDEL', KEYS[1], items[j])
+    end
+    redis.call('HINCRBY', KEYS[4], items[j], -tonumber(items[j + 1]))
+end
+redis.call('DEL', KEYS[3])
+redis.call('ZREM', KEYS[2], ARGV[1])
+return items
+"""
+
+# Expected live stock for ARGV[i] given its database stock ARGV[i + 1]
+EXPECTED_STOCK = """
+local function expected(id, stock)
+    return tonumber(stock)
+        + tonumber(redis.call('HGET', KEYS[2], id) or 0)
+        + tonumber(redis.call('HGET', KEYS[3], id) or 0)
+        + tonumber(redis.call('HGET', KEYS[5], id) or 0)
+        - tonumber(redis.call('HGET', KEYS[1], id) or 0)
+end
+"""
+
+# Both scripts refuse (return false) when the epoch moved since the database
+# read or a flush is in progress, since the read may or may not include it.
+# KEYS: reserved, pending, flushing, epoch, dead
+# ARGV: available prefix, epoch, then id/database stock pairs
+SEED_SCRIPT = EXPECTED_STOCK + """
+if (redis.call('GET', KEYS[4]) or '0') ~= ARGV[2] or redis.call('EXISTS', KEYS[3]) == 1 then
+    return false
+end
+local seeded = 0
+for i = 3, #ARGV, 2 do
+    local key = ARGV[1] .. ARGV[i]
+    if redis.call('EXISTS', key) == 0 then
+        redis.call('SET', key, expected(ARGV[i], ARGV[i + 1]))
+        seeded = seeded + 1
+    end
+end
+return seeded
+"""
+
+# KEYS: reserved, pending, flushing, epoch, dead
+# ARGV: available prefix, epoch, "1" for a dry run, then id/database stock pairs
+RECONCILE_SCRIPT = EXPECTED_STOCK + """
+if (redis.call('GET', KEYS[4]) or '0') ~= ARGV[2] or redis.call('EXISTS', KEYS[3]) == 1 then
+    return false
+end
+local drift = {}
+for i = 4, #ARGV, 2 do
+    local key = ARGV[1] .. ARGV[i]
+    local current = redis.call('GET', key)
+    if current then
+        local value = expected(ARGV[i], ARGV[i + 1])
+        if tonumber(current) ~= value then
+            drift[#drift + 1] = ARGV[i]
+            drift[#drift + 1] = current
+            drift[#drift + 1] = tostring(value)
+            if ARGV[3] ~= '1' then
+                redis.call('SET', key, value)
+            end
+        end
+    end
+end
+return drift
+"""
+
+# KEYS: epoch
+# ARGV: available prefix, then id/delta pairs
+ADJUST_SEEDED_SCRIPT = """
+for i = 2, #ARGV, 2 do
+    local key = ARGV[1] .. ARGV[i]
+    if redis.call('EXISTS', key) == 1 then
+        redis.call('INCRBY', key, ARGV[i + 1])
+    end
+end
+return redis.call('INCR', KEYS[1])
+"""
+
+# Decrements about to be made directly to the table, taken from the live
+# stock of seeded medicines all or nothing. Returns {'short', ids} or
+# {'ok', taken ids}; the epoch is bumped since the table is about to change.
+# KEYS: epoch
+# ARGV: available prefix, then id/negative delta pairs
+TAKE_FOR_ADJUSTMENT_SCRIPT = """
+local short, taken = {}, {}
+for i = 2, #ARGV, 2 do
+    local current = redis.call('GET', ARGV[1] .. ARGV[i])
+    if current then
+        if tonumber(current) + tonumber(ARGV[i + 1]) < 0 then
+            short[#short + 1] = ARGV[i]
+        end
+        taken[#taken + 1] = ARGV[i]
+    end
+end
+if #short > 0 then
+    return {'short', short}
+end
+for i = 2, #ARGV, 2 do
+    local key = ARGV[1] .. ARGV[i]
+    if redis.call('EXISTS', key) == 1 then
+        redis.call('INCRBY', key, ARGV[i + 1])
+    end
+end
+redis.call('INCR', KEYS[1])
+return {'ok', taken}
+"""
+
+# KEYS: pending, flushing, flush id
+# ARGV: id for a new flush
+# A flush that died half way left its deltas under `flushing`; they are
+# retried, under the same flush id, before anything new is taken.
+TAKE_DELTAS_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return {}
+    end
+    redis.call('RENAME', KEYS[1], KEYS[2])
+    redis.call('SET', KEYS[3], ARGV[1])
+end
+local flush_id = redis.call('GET', KEYS[3])
+if not flush_id then
+    flush_id = ARGV[1]
+    redis.call('SET', KEYS[3], flush_id)
+end
+return {flush_id, redis.call('HGETALL', KEYS[2])}
+"""
+
+# KEYS: dead, pending
+# ARGV: medicine ids
+REQUEUE_DEAD_SCRIPT = """
+local requeued = {}
+for i = 1, #ARGV do
+    local delta = redis.call('HGET', KEYS[1], ARGV[i])
+    if delta then
+        redis.call('HINCRBY', KEYS[2], ARGV[i], delta)
+        redis.call('HDEL', KEYS[1], ARGV[i])
+        requeued[#requeued + 1] = ARGV[i]
+        requeued[#requeued + 1] = delta
+    end
+end
+return requeued
+"""
+
+_reserve = cache_manager.redis.register_script(RESERVE_SCRIPT)
+_release = cache_manager.redis.register_script(RELEASE_SCRIPT)
+_commit = cache_manager.redis.register_script(COMMIT_SCRIPT)
+_seed = cache_manager.redis.register_script(SEED_SCRIPT)
+_reconcile = cache_manager.redis.register_script(RECONCILE_SCRIPT)
+_adjust_seeded = cache_manager.redis.register_script(ADJUST_SEEDED_SCRIPT)
+_take_deltas = cache_manager.redis.register_script(TAKE_DELTAS_SCRIPT)
+_take_for_adjustment = cache_manager.redis.register_script(TAKE_FOR_ADJUSTMENT_SCRIPT)
+_requeue_dead = cache_manager.redis.register_script(REQUEUE_DEAD_SCRIPT)
+
+
+def _pairs(mapping):
+    return [value for pair in mapping.items() for value in pair]
+
+
+def _hash(values):
+    """Flat [field, value, ...] reply as {field: int}."""
+    return {values[i].decode(): int(values[i + 1]) for i in range(0, len(values), 2)}
+
+
+def reserve(reservation_id, quantities, expires_at):
+    """
+    Take {medicine id: units} for a reservation, all or nothing. Returns
+    ("ok", [], None), ("short", ids without enough stock, None) or
+    ("missing", ids not seeded yet, epoch to seed them with).
+    """
+    reply = _reserve(
+        keys=[
+            STOCK_RESERVED_KEY,
+            STOCK_RESERVATION_EXPIRY_KEY,
+            STOCK_RESERVATION_KEY_TEMPLATE.format(reservation_id),
+            STOCK_EPOCH_KEY,
+        ],
+        args=[AVAILABLE_PREFIX, reservation_id, expires_at, *_pairs(quantities)],
+    )
+    status = reply[0].decode()
+    ids = [pk.decode() for pk in reply[1]] if len(reply) > 1 else []
+    epoch = reply[2].decode() if len(reply) > 2 else None
+    return status, ids, epoch
+
+
+def seed(stocks, epoch):
+    """
+    Initialise live stock from {medicine id: database stock} read at `epoch`.
+    Returns the number of keys created, or None when the read may be stale.
+    """
+    return _seed(
+        keys=[
+            STOCK_RESERVED_KEY,
+            STOCK_PENDING_DELTAS_KEY,
+            STOCK_FLUSHING_DELTAS_KEY,
+            STOCK_EPOCH_KEY,
+            STOCK_DEAD_DELTAS_KEY,
+        ],
+        args=[AVAILABLE_PREFIX, epoch, *_pairs(stocks)],
+    )
+
+
+def release(reservation_ids):
+    """Return the units of open reservations; returns how many were open."""
+    if not reservation_ids:
+        return 0
+    return _release(
+        keys=[STOCK_RESERVED_KEY, STOCK_RESERVATION_EXPIRY_KEY],
+        args=[AVAILABLE_PREFIX, RESERVATION_PREFIX, *reservation_ids],
+    )
+
+
+def commit(reservation_id):
+    """Turn a reservation into pending deltas; returns {medicine id: units}."""
+    return _hash(
+        _commit(
+            keys=[
+                STOCK_RESERVED_KEY,
+                STOCK_RESERVATION_EXPIRY_KEY,
+                STOCK_RESERVATION_KEY_TEMPLATE.format(reservation_id),
+                STOCK_PENDING_DELTAS_KEY,
+            ],
+            args=[reservation_id],
+        )
+    )
+
+
+def expired_reservations(now, limit):
+    return [
+        member.decode()
+        for member in cache_manager.redis.zrangebyscore(
+            STOCK_RESERVATION_EXPIRY_KEY, "-inf", now, start=0, num=limit
+        )
+    ]
+
+
+def adjust_seeded(deltas):
+    """
+    Apply {medicine id: delta} made directly to the table to the live stock
+    already seeded. Runs after commit; a failure is repaired by reconciling.
+    """
+    try:
+        _adjust_seeded(keys=[STOCK_EPOCH_KEY], args=[AVAILABLE_PREFIX, *_pairs(deltas)])
+    except redis.RedisError as e:
+        error_logger.error("Live stock adjustment failed for %s medicines: %s", len(deltas), e)
+
+
+def take_for_adjustment(deltas):
+    """
+    Take the decrements in {medicine id: delta} from the live stock of the
+    seeded medicines before they are made directly to the table. Returns
+    (ids short of live stock, {id: delta} taken); nothing is taken when any
+    id is short. Give the taken deltas back with `adjust_seeded` if the
+    table change does not happen.
+    """
+    decrements = {pk: delta for pk, delta in deltas.items() if delta < 0}
+    if not decrements:
+        return [], {}
+    reply = _take_for_adjustment(
+        keys=[STOCK_EPOCH_KEY], args=[AVAILABLE_PREFIX, *_pairs(decrements)]
+    )
+    ids = [pk.decode() for pk in reply[1]]
+    if reply[0].decode() == "short":
+        return ids, {}
+    return [], {pk: decrements[pk] for pk in ids}
+
+
+def take_pending_deltas(flush_id):
+    """
+    Move the pending deltas aside for flushing as `flush_id`. Returns the
+    flush id, which is the earlier one when its deltas are being retried,
+    and {medicine id: delta}; (None, {}) when there is nothing to flush.
+    """
+    reply = _take_deltas(
+        keys=[STOCK_PENDING_DELTAS_KEY, STOCK_FLUSHING_DELTAS_KEY, STOCK_FLUSH_ID_KEY],
+        args=[flush_id],
+    )
+    if not reply:
+        return None, {}
+    return reply[0].decode(), _hash(reply[1])
+
+
+def flushed(ids, dead=None):
+    """
+    Drop the flushed deltas of `ids` and mark the table as changed,
+    atomically. {id: delta} in `dead` could not be written and is moved to
+    the dead-letter hash instead.
+    """
+    pipeline = cache_manager.redis.pipeline()
+    pipeline.hdel(STOCK_FLUSHING_DELTAS_KEY, *ids)
+    for pk, delta in (dead or {}).items():
+        pipeline.hincrby(STOCK_DEAD_DELTAS_KEY, pk, delta)
+    pipeline.incr(STOCK_EPOCH_KEY)
+    pipeline.execute()
+
+
+def dead_deltas():
+    """{medicine id: delta} of committed deltas no flush could write."""
+    return {
+        pk.decode(): int(delta)
+        for pk, delta in cache_manager.redis.hgetall(STOCK_DEAD_DELTAS_KEY).items()
+    }
+
+
+def requeue_dead_deltas(ids):
+    """Move the dead-lettered deltas of `ids` back to pending; returns them."""
+    if not ids:
+        return {}
+    return _hash(_requeue_dead(keys=[STOCK_DEAD_DELTAS_KEY, STOCK_PENDING_DELTAS_KEY], args=ids))
+
+
+def current_epoch():
+    epoch = cache_manager.redis.get(STOCK_EPOCH_KEY)
+    return epoch.decode() if epoch else "0"
+
+
+def seeded_ids():
+    """Ids of every medicine with live stock."""
+    return [
+        key.decode()[len(AVAILABLE_PREFIX):]
+        for key in cache_manager.redis.scan_iter(match=f"{AVAILABLE_PREFIX}*")
+    ]
+
+
+def reconcile(stocks, epoch, dry_run=False):
+    """
+    Compare live stock with {medicine id: database stock} read at `epoch`,
+    and repair it unless `dry_run`. Returns [(id, live, expected)] for the
+    medicines that drifted, or None when the read may be stale.
+    """
+    reply = _reconcile(
+        keys=[
+            STOCK_RESERVED_KEY,
+            STOCK_PENDING_DELTAS_KEY,
+            STOCK_FLUSHING_DELTAS_KEY,
+            STOCK_EPOCH_KEY,
+            STOCK_DEAD_DELTAS_KEY,
+        ],
+        args=[AVAILABLE_PREFIX, epoch, "1" if dry_run else "0", *_pairs(stocks)],
+    )
+    if reply is None:
+        return None
+    return [
+        (reply[i].decode(), int(reply[i + 1]), int(reply[i + 2])) for i in range(0, len(reply), 3)
+    ]
+
+
+def forget(ids):
+    """Drop the live stock and pending deltas of medicines that no longer exist."""
+    pipeline = cache_manager.redis.pipeline()
+    pipeline.delete(*[STOCK_AVAILABLE_KEY_TEMPLATE.format(pk) for pk in ids])
+    pipeline.hdel(STOCK_PENDING_DELTAS_KEY, *ids)
+    pipeline.execute()
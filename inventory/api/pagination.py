@@ -0,0 +1,295 @@
+# inventory/api/pagination.py
+import base64
+import binascii
+import json
+from functools import cached_property
+from django.core.paginator import (
+    EmptyPage,
+    InvalidPage,
+    Page,
+    PageNotAnInteger,
+    Paginator,
+)
+from django.db import connection
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from utils.redis_cache import RedisCache
+from ..exceptions import ValidationError
+
+cache_manager = RedisCache()
+
+COUNT_CACHE_KEY_TEMPLATE = "medicine_count_{}"
+
+
+class StandardResultsPagination(PageNumberPagination):
+    page_size = 10  # Default items per page
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class ReferenceDataPagination(PageNumberPagination):
+    """
+    Opt-in pagination for the reference lists. Existing clients expect the
+    full list under `data`, so pages are only served when `page` or
+    `page_size` is passed.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    @classmethod
+    def is_requested(cls, request):
+        return (
+            cls.page_query_param in request.query_params
+            or cls.page_size_query_param in request.query_params
+        )
+
+
+def estimated_row_count(model):
+    """
+    InnoDB's row estimate for a whole table, read from table statistics
+    without scanning. Returns None on other database backends.
+    """
+    if connection.vendor != "mysql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None else None
+
+
+class LazyCountPage(Page):
+    def has_next(self):
+        return self.has_more
+
+
+class LazyCountPaginator(Paginator):
+    """
+    A paginator that never counts to serve a page: each page fetches one
+    extra row to know whether a next page exists. The total is only resolved,
+    through `count_resolver`, when the response asks for it.
+    """
+
+    def __init__(self, object_list, per_page, count_resolver, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_resolver = count_resolver
+
+    @cached_property
+    def count(self):
+        return self.count_resolver(self.object_list)
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage("That page contains no results")
+        page = LazyCountPage(rows[: self.per_page], number, self)
+        page.has_more = len(rows) > self.per_page
+        return page
+
+
+class CountedResultsPagination(StandardResultsPagination):
+    """
+    Page-number pagination whose total count is cached per query, estimated
+    for whole-table listings, or skipped.
+
+    - `?count=false` skips counting; `count` is returned as null, with
+      `count_approximate: false`.
+    - With `approximate=True` (unfiltered lists) on MySQL, large tables use
+      InnoDB's row estimate and the response adds `count_approximate: true`.
+      Exact counts keep the usual DRF response shape.
+    - Otherwise the exact count is cached under `count_key`, which embeds the
+      list generation, so it is computed once per query per data change.
+    """
+
+    count_query_param = "count"
+    count_expiration = 900
+    # Below this many rows an exact COUNT(*) is cheap and estimates are noisy
+    approximate_count_threshold = 10000
+
+    def paginate_queryset(self, queryset, request, view=None, count_key=None, approximate=False):
+        self.request = request
+        self.count_key = count_key
+        self.approximate = approximate
+        self.count_approximate = False
+
+        paginator = LazyCountPaginator(
+            queryset, self.get_page_size(request), count_resolver=self.resolve_count
+        )
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+        return list(self.page)
+
+    @classmethod
+    def counts_requested(cls, request):
+        return request.query_params.get(cls.count_query_param, "true").lower() not in (
+            "false",
+            "0",
+        )
+
+    def resolve_count(self, queryset):
+        if self.approximate:
+            estimate = estimated_row_count(queryset.model)
+            if estimate is not None and estimate >= self.approximate_count_threshold:
+                self.count_approximate = True
+                return estimate
+
+        cache_key = COUNT_CACHE_KEY_TEMPLATE.format(self.count_key) if self.count_key else None
+        if cache_key:
+            cached_count = cache_manager.get(cache_key)
+            if cached_count is not None:
+                return int(cached_count)
+
+        count = queryset.count()
+        if cache_key:
+            cache_manager.set(cache_key, count, expiration=self.count_expiration)
+        return count
+
+    def get_paginated_response(self, data):
+        counted = self.counts_requested(self.request)
+        body = {"count": self.page.paginator.count if counted else None}
+        if self.count_approximate or not counted:
+            body["count_approximate"] = self.count_approximate
+        body.update(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+        return Response(body)
+
+
+class KeysetPagination(StandardResultsPagination):
+    """
+    Opt-in cursor pagination for the medicine list, newest first.
+
+    Pages seek on the `(created_at, id)` tie-break, backed by the composite
+    index on those columns, instead of OFFSET. Latency does not grow with
+    depth, no COUNT(*) is run, and rows inserted between requests do not shift
+    the pages. Cursors are opaque base64 tokens returned as next/previous links.
+    """
+
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+
+    @classmethod
+    def is_requested(cls, request):
+        return (
+            cls.cursor_query_param in request.query_params
+            or request.query_params.get(cls.mode_query_param) == "cursor"
+        )
+
+    def paginate_queryset(self, queryset, request, columns=None):
+        """
+        Return one page of `queryset.values_list(*columns)` rows. The ordering
+        columns are fetched alongside to build the cursors, then dropped.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        if reverse:
+            queryset = queryset.order_by("created_at", "id")
+        else:
+            queryset = queryset.order_by("-created_at", "-id")
+
+        if position is not None:
+            created_at, pk = position
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                )
+
+        rows = list(queryset.values_list(*columns, "created_at", "id")[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.first_position = rows[0][-2:] if rows else None
+        self.last_position = rows[-1][-2:] if rows else None
+        return [row[:-2] for row in rows]
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.encode_cursor(self.last_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first_position is None:
+            # Walked off the start of the list; restart from the newest rows,
+            # still in cursor mode for clients that entered it with ?cursor=
+            url = remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+            return replace_query_param(url, self.mode_query_param, "cursor")
+        return self.encode_cursor(self.first_position, reverse=True)
+
+    def encode_cursor(self, position, reverse):
+        created_at, pk = position
+        token = json.dumps(
+            {"c": created_at.isoformat(), "i": str(pk), "r": int(reverse)},
+            separators=(",", ":"),
+        )
+        cursor = base64.urlsafe_b64encode(token.encode()).decode()
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, cursor
+        )
+
+    def decode_cursor(self, request):
+        """Return ((created_at, id), reverse) for the request, or (None, False)."""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            token = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            created_at = parse_datetime(token["c"])
+            if created_at is None:
+                raise ValueError("Invalid cursor timestamp")
+            return (created_at, token["i"]), bool(token.get("r"))
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise ValidationError("Invalid cursor.")
@@ -0,0 +1,128 @@
+# inventory/api/reference_data.py
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags
+from inventory.cache_keys import (
+    REFERENCE_DATA_VERSION_KEY,
+    REFERENCE_LIST_CACHE_KEY_TEMPLATE,
+    REFERENCE_SNAPSHOT_CACHE_KEY_TEMPLATE,
+)
+from inventory.utils import api_response
+from utils.redis_cache import RedisCache
+from utils.response_cache import body_etag, cache_response, get_cached_response
+from ..models import GenericName, MedicineCategory, MedicineForm, Manufacturer
+from .pagination import ReferenceDataPagination
+from .serializers import (
+    GenericNameSerializer,
+    MedicineCategorySerializer,
+    MedicineFormSerializer,
+    ManufacturerSerializer,
+)
+
+cache_manager = RedisCache()
+
+# Reference tables served by the list endpoints and the bootstrap snapshot
+REFERENCE_RESOURCES = {
+    "generic_names": (GenericName, GenericNameSerializer),
+    "categories": (MedicineCategory, MedicineCategorySerializer),
+    "forms": (MedicineForm, MedicineFormSerializer),
+    "manufacturers": (Manufacturer, ManufacturerSerializer),
+}
+
+REFERENCE_CACHE_EXPIRATION = 3600
+
+
+def reference_version():
+    """Current reference data version; bumped by every reference table write."""
+    return cache_manager.get(REFERENCE_DATA_VERSION_KEY) or 0
+
+
+def is_not_modified(request, etag):
+    """Weak comparison of If-None-Match against `etag`, as for GET requests."""
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(tag == "*" or tag.removeprefix("W/") == opaque for tag in parse_etags(header))
+
+
+def revalidated(request, response):
+    """
+    Give a rendered response the ETag of its body, or answer with 304 when
+    the client already holds it. The ETag comes from the data alone, so it
+    stays valid however the Redis version counter moves.
+    """
+    etag = response.get("ETag") or body_etag(response.content)
+    if is_not_modified(request, etag):
+        response = HttpResponseNotModified()
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"  # Always revalidate; 304s are cheap
+    return response
+
+
+def serve_versioned(request, cache_key, build_response):
+    """
+    Replay the cached rendered response, or build, cache and return a fresh
+    one, answering with 304 when the client already holds its body. A 304
+    for a cached response costs the version lookup and one HMGET.
+    """
+    response = get_cached_response(
+        request, cache_key, invalidated_by=[REFERENCE_DATA_VERSION_KEY]
+    )
+    if response is not None:
+        return revalidated(request, response)
+    response = cache_response(
+        request, build_response(), cache_key, expiration=REFERENCE_CACHE_EXPIRATION, etag=True
+    )
+    # Runs after the fill stored the body and its ETag
+    response.add_post_render_callback(lambda rendered: revalidated(request, rendered))
+    return response
+
+
+def reference_list_response(request, resource):
+    """Cached, ETag'd list of one reference table, paginated on request."""
+    model, serializer_class = REFERENCE_RESOURCES[resource]
+    version = reference_version()
+    paginator = ReferenceDataPagination()
+    if paginator.is_requested(request):
+        page = request.query_params.get(paginator.page_query_param, 1)
+        variant = f"page_{page}_size_{paginator.get_page_size(request)}"
+    else:
+        paginator, variant = None, "all"
+
+    def build_response():
+        queryset = model.objects.order_by("pk")
+        if paginator is None:
+            return api_response(success=True, data=serializer_class(queryset, many=True).data)
+        page = paginator.paginate_queryset(queryset, request)
+        return api_response(
+            success=True,
+            data={
+                "count": paginator.page.paginator.count,
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "results": serializer_class(page, many=True).data,
+            },
+        )
+
+    return serve_versioned(
+        request,
+        REFERENCE_LIST_CACHE_KEY_TEMPLATE.format(resource, version, variant),
+        build_response,
+    )
+
+
+def reference_snapshot_response(request):
+    """Every reference table in one versioned response."""
+    version = reference_version()
+
+    def build_response():
+        data = {"version": version}
+        for resource, (model, serializer_class) in REFERENCE_RESOURCES.items():
+            data[resource] = serializer_class(model.objects.order_by("pk"), many=True).data
+        return api_response(success=True, data=data)
+
+    return serve_versioned(
+        request,
+        REFERENCE_SNAPSHOT_CACHE_KEY_TEMPLATE.format(version),
+        build_response,
+    )
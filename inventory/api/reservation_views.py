@@ -0,0 +1,136 @@
+# inventory/api/reservation_views.py
+import logging
+from rest_framework.views import APIView
+from rest_framework import status
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from authentication.permissions import IsAdminOrReadOnly
+from inventory.exceptions import InsufficientStockError, NotFoundError, ValidationError
+from inventory.utils import api_response
+from .reservations import (
+    MAX_RESERVATION_TTL,
+    RESERVATION_TTL,
+    commit_reservation,
+    release_reservation,
+    reserve,
+)
+
+app_logger = logging.getLogger("app_logger")
+error_logger = logging.getLogger("error_logger")
+
+
+def reservation_response(action, *args, message, status_code=status.HTTP_200_OK):
+    """Run a reservation action and map its outcome to an API response."""
+    try:
+        data = action(*args)
+        return api_response(success=True, data=data, message=message, status_code=status_code)
+
+    except ValidationError as e:
+        error_logger.error("Invalid reservation request: %s", e)
+        return api_response(
+            success=False, message=str(e), status_code=status.HTTP_400_BAD_REQUEST
+        )
+    except NotFoundError as e:
+        app_logger.info("Reservation request for a missing resource: %s", e)
+        return api_response(
+            success=False, message=str(e), status_code=status.HTTP_404_NOT_FOUND
+        )
+    except InsufficientStockError as e:
+        app_logger.info("Reservation rejected: %s", e)
+        return api_response(
+            success=False, message=str(e), status_code=status.HTTP_409_CONFLICT
+        )
+    except Exception as e:
+        error_logger.error("Exception while handling a reservation: %s", e)
+        return api_response(
+            success=False,
+            message="An error occurred while handling the reservation.",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+class StockReservationView(APIView):
+    """
+    Reserve stock for a sale. Units are taken from live stock in Redis
+    atomically, so busy counters never wait on row locks.
+    """
+
+    permission_classes = [IsAdminOrReadOnly]
+    # Seeding live stock for medicines reserved for the first time
+    query_budget = {"POST": 2}
+
+    @swagger_auto_schema(
+        operation_description=f"Reserve units of one or more medicines, all or nothing. Reservations expire after `ttl` seconds (default {RESERVATION_TTL}, at most {MAX_RESERVATION_TTL}) unless committed.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["items"],
+            properties={
+                "items": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            "id": openapi.Schema(type=openapi.TYPE_STRING, format="uuid"),
+                            "quantity": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        },
+                    ),
+                ),
+                "ttl": openapi.Schema(type=openapi.TYPE_INTEGER),
+            },
+        ),
+        responses={
+            201: "Reservation created.",
+            400: "Bad Request - Invalid reservation.",
+            404: "Not Found - A medicine does not exist.",
+            409: "Conflict - Not enough stock; nothing was reserved.",
+            500: "Internal Server Error - Error occurred while reserving stock.",
+        },
+    )
+    def post(self, request):
+        """Create a reservation."""
+        return reservation_response(
+            reserve,
+            request.data,
+            message="Stock reserved successfully.",
+            status_code=status.HTTP_201_CREATED,
+        )
+
+
+class StockReservationDetailView(APIView):
+    permission_classes = [IsAdminOrReadOnly]
+    # Redis only
+    query_budget = {"DELETE": 1}
+
+    @swagger_auto_schema(
+        operation_description="Cancel an open reservation and return its units to live stock.",
+        responses={
+            200: "Reservation released.",
+            404: "Not Found - Reservation does not exist or has expired.",
+            500: "Internal Server Error - Error occurred while releasing the reservation.",
+        },
+    )
+    def delete(self, request, reservation_id):
+        """Release a reservation."""
+        return reservation_response(
+            release_reservation, reservation_id, message="Reservation released successfully."
+        )
+
+
+class StockReservationCommitView(APIView):
+    permission_classes = [IsAdminOrReadOnly]
+    # Redis only; the table is updated by the next flush
+    query_budget = {"POST": 1}
+
+    @swagger_auto_schema(
+        operation_description="Complete the sale for a reservation. Stock is written to the database by the next `flush_stock_deltas` run.",
+        responses={
+            200: "Reservation committed.",
+            404: "Not Found - Reservation does not exist or has expired.",
+            500: "Internal Server Error - Error occurred while committing the reservation.",
+        },
+    )
+    def post(self, request, reservation_id):
+        """Commit a reservation."""
+        return reservation_response(
+            commit_reservation, reservation_id, message="Reservation committed successfully."
+        )
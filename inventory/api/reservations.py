@@ -0,0 +1,212 @@
+# inventory/api/reservations.py
+import logging
+import time
+import uuid
+from django.db import transaction
+from ..exceptions import InsufficientStockError, NotFoundError, ValidationError
+from ..models import MedicineDetail
+from . import live_stock
+from .batch_lookup import parse_ids
+from .stock import (
+    STOCK_BATCH_LIMIT,
+    queue_stock_change_invalidation,
+    read_stock,
+    stock_update,
+)
+
+app_logger = logging.getLogger("app_logger")
+
+RESERVATION_TTL = 600
+MAX_RESERVATION_TTL = 3600
+RESERVATION_ITEM_LIMIT = 100
+EXPIRED_SWEEP_LIMIT = 500
+
+# A database read can race with a flush; seeding then waits and retries
+SEED_ATTEMPTS = 5
+SEED_RETRY_DELAY = 0.02
+
+
+def parse_reservation(data):
+    """Validate {"items": [{"id", "quantity"}], "ttl"} into ({id: units}, ttl)."""
+    if not isinstance(data, dict):
+        raise ValidationError("Expected an object with 'items'.")
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        raise ValidationError("Expected a non-empty list of items.")
+    if len(items) > RESERVATION_ITEM_LIMIT:
+        raise ValidationError(f"At most {RESERVATION_ITEM_LIMIT} items can be reserved at once.")
+
+    quantities = {}
+    for item in items:
+        if not isinstance(item, dict):
+            raise ValidationError("Each item needs an 'id' and a 'quantity'.")
+        (pk,) = parse_ids([item.get("id")])
+        quantity = item.get("quantity")
+        if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity < 1:
+            raise ValidationError("Each quantity must be a positive integer.")
+        quantities[pk] = quantities.get(pk, 0) + quantity
+
+    ttl = data.get("ttl", RESERVATION_TTL)
+    if isinstance(ttl, bool) or not isinstance(ttl, int) or not 0 < ttl <= MAX_RESERVATION_TTL:
+        raise ValidationError(f"ttl must be between 1 and {MAX_RESERVATION_TTL} seconds.")
+    return quantities, ttl
+
+
+def parse_reservation_id(reservation_id):
+    try:
+        return uuid.UUID(str(reservation_id)).hex
+    except ValueError:
+        raise NotFoundError("Reservation not found or expired.")
+
+
+def seed_live_stock(ids, epoch):
+    """Seed live stock for `ids` from the table; False when it must be retried."""
+    stocks = {
+        str(pk): stock
+        for pk, stock in MedicineDetail.objects.filter(pk__in=ids).values_list(
+            "pk", "stock_quantity"
+        )
+    }
+    missing = [pk for pk in ids if pk not in stocks]
+    if missing:
+        raise NotFoundError(f"Medicines not found: {', '.join(missing)}.")
+    return live_stock.seed(stocks, epoch) is not None
+
+
+def release_expired_reservations(limit=EXPIRED_SWEEP_LIMIT):
+    """Return the units of reservations past their expiry; returns how many."""
+    return live_stock.release(live_stock.expired_reservations(time.time(), limit))
+
+
+def reserve(data):
+    """
+    Hold stock for a sale in Redis without touching the table. Returns the
+    reservation, or raises InsufficientStockError when any item is short.
+    """
+    quantities, ttl = parse_reservation(data)
+    reservation_id = uuid.uuid4().hex
+    expires_at = time.time() + ttl
+    swept = False
+
+    for _ in range(SEED_ATTEMPTS):
+        status, ids, epoch = live_stock.reserve(reservation_id, quantities, expires_at)
+        if status == "ok":
+            app_logger.info("Reserved %s medicines as %s", len(quantities), reservation_id)
+            return {
+                "id": reservation_id,
+                "expires_at": expires_at,
+                "items": [{"id": pk, "quantity": units} for pk, units in quantities.items()],
+            }
+        if status == "short":
+            # Expired reservations may still hold the units; return them once
+            if not swept:
+                swept = True
+                if release_expired_reservations():
+                    continue
+            raise InsufficientStockError(f"Insufficient stock for: {', '.join(ids)}.")
+        if not seed_live_stock(ids, epoch):
+            time.sleep(SEED_RETRY_DELAY)
+
+    raise InsufficientStockError("Live stock is being synchronised. Please retry.")
+
+
+def release_reservation(reservation_id):
+    """Cancel an open reservation and return its units."""
+    if not live_stock.release([parse_reservation_id(reservation_id)]):
+        raise NotFoundError("Reservation not found or expired.")
+
+
+def commit_reservation(reservation_id):
+    """
+    Complete the sale: the reserved units become pending deltas, written to
+    the table by the next flush. Returns the committed items.
+    """
+    quantities = live_stock.commit(parse_reservation_id(reservation_id))
+    if not quantities:
+        raise NotFoundError("Reservation not found or expired.")
+    return [{"id": pk, "quantity": units} for pk, units in quantities.items()]
+
+
+def flush_stock_deltas(chunk_size=STOCK_BATCH_LIMIT):
+    """
+    Write committed reservations to the table: one locked read and one
+    UPDATE per chunk of medicines. Deltas the table cannot take (deleted
+    medicines, or stock set lower underneath) are skipped and moved to the
+    dead-letter hash, where they keep counting against live stock until an
+    operator requeues them. Returns (medicines updated, skipped ids).
+
+    The UPDATE stamps each row with the flush id, so when a flush dies
+    between committing a chunk and clearing its deltas in Redis, the retry
+    recognises the rows it already wrote and only clears them.
+    """
+    flush_id, deltas = live_stock.take_pending_deltas(uuid.uuid4().hex)
+    items = [(pk, delta) for pk, delta in deltas.items() if delta]
+    updated, skipped = 0, []
+
+    for start in range(0, len(items), chunk_size):
+        chunk = dict(items[start : start + chunk_size])
+        with transaction.atomic():
+            rows = {
+                str(pk): (quantity, last_flush)
+                for pk, quantity, last_flush in MedicineDetail.objects.select_for_update()
+                .filter(pk__in=list(chunk))
+                .values_list("pk", "stock_quantity", "stock_flush_id")
+            }
+            # Rows this flush already wrote before it died on the way to Redis
+            written = {
+                pk for pk, (_, last_flush) in rows.items()
+                if last_flush and last_flush.hex == flush_id
+            }
+            applicable = {
+                pk: delta
+                for pk, delta in chunk.items()
+                if pk in rows and pk not in written and rows[pk][0] + delta >= 0
+            }
+            dead = {
+                pk: delta
+                for pk, delta in chunk.items()
+                if pk not in applicable and pk not in written
+            }
+            skipped.extend(dead)
+            if applicable:
+                guard, changes = stock_update(applicable)
+                updated += MedicineDetail.objects.filter(guard).update(
+                    **changes, stock_flush_id=flush_id
+                )
+                queue_stock_change_invalidation(applicable, read_stock(applicable))
+        live_stock.flushed(list(chunk), dead)
+    return updated, skipped
+
+
+def reconcile_stock(dry_run=False, chunk_size=1000):
+    """
+    Compare every medicine's live stock with the table and repair drift.
+    Returns [(id, live, expected)], with None values for medicines that no
+    longer exist, and the ids that could not be checked consistently.
+    """
+    drift, unchecked = [], []
+    ids = live_stock.seeded_ids()
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start : start + chunk_size]
+        for _ in range(SEED_ATTEMPTS):
+            epoch = live_stock.current_epoch()
+            stocks = {
+                str(pk): stock
+                for pk, stock in MedicineDetail.objects.filter(pk__in=chunk).values_list(
+                    "pk", "stock_quantity"
+                )
+            }
+            result = live_stock.reconcile(stocks, epoch, dry_run=dry_run)
+            if result is not None:
+                drift.extend(result)
+                break
+            time.sleep(SEED_RETRY_DELAY)
+        else:
+            unchecked.extend(chunk)
+            continue
+
+        deleted = [pk for pk in chunk if pk not in stocks]
+        drift.extend((pk, None, None) for pk in deleted)
+        if deleted and not dry_run:
+            live_stock.forget(deleted)
+    return drift, unchecked
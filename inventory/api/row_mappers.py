@@ -0,0 +1,144 @@
+# inventory/api/row_mappers.py
+from collections import defaultdict
+from django.utils import timezone
+from utils.request_timing import timed
+from ..models import MedicineDetail
+from .fieldsets import Fieldset, ID_LIST_FIELDS, RELATION_FIELDS
+from .serializers import MedicineDetailSerializer
+
+
+class MedicineRowMapper:
+    """
+    Read-only fast path for lists and search.
+
+    Instead of building model instances and running the serializer per row,
+    the queryset is evaluated with `values_list(*mapper.columns)` across the
+    joined tables and each flat tuple is turned into a dict with the exact
+    shape (key order and value formatting) of `MedicineDetailSerializer`.
+    The column layout and per-column converters are compiled once per
+    fieldset. Many-to-many id lists are read with one query per page.
+    """
+
+    def __init__(self, fieldset):
+        self.fieldset = fieldset
+        serializer_fields = MedicineDetailSerializer().fields
+
+        columns = []
+        layout = []  # (output key, column index, converter or None)
+        relations = []  # (output key, id column index, ((key, column index), ...))
+        id_lists = []  # output keys filled from join tables
+
+        requested = set(fieldset.fields)
+        expanded = {f"{relation}_details": relation for relation in fieldset.expand}
+        # Follow the serializer's field order so the rendered JSON is identical
+        for name in MedicineDetailSerializer.Meta.fields:
+            if name in requested and name in ID_LIST_FIELDS:
+                layout.append((name, None, None))
+                id_lists.append(name)
+            elif name in requested:
+                layout.append((name, len(columns), self._converter(serializer_fields[name])))
+                columns.append(name)
+            elif name in expanded:
+                relation = expanded[name]
+                nested = []
+                for column in RELATION_FIELDS[relation]:
+                    nested.append((column, len(columns)))
+                    columns.append(f"{relation}__{column}")
+                layout.append((name, None, None))
+                relations.append((name, nested[0][1], tuple(nested)))
+
+        self.columns = tuple(columns)
+        self._layout = tuple(layout)
+        self._relations = {name: (id_index, nested) for name, id_index, nested in relations}
+        self._id_lists = tuple(id_lists)
+        self._id_index = columns.index("id")
+
+    @staticmethod
+    def _converter(field):
+        """Return the value converter for a serializer field, or None for identity."""
+        field_type = type(field).__name__
+        if field_type == "UUIDField":
+            return str
+        if field_type == "DateTimeField":
+            return _datetime_to_representation
+        if field_type == "DecimalField":
+            # Reuse DRF's formatting so quantization matches exactly
+            return field.to_representation
+        return None
+
+    def map_row(self, row, tz=None, id_lists=None):
+        tz = tz or timezone.get_current_timezone()
+        item = {}
+        relations = self._relations
+        for key, index, convert in self._layout:
+            if index is None and key not in relations:
+                item[key] = id_lists[key].get(row[self._id_index], []) if id_lists else []
+            elif index is None:
+                id_index, nested = relations[key]
+                if row[id_index] is None:
+                    item[key] = None
+                else:
+                    item[key] = {column: row[column_index] for column, column_index in nested}
+            elif convert is None or row[index] is None:
+                item[key] = row[index]
+            elif convert is _datetime_to_representation:
+                item[key] = convert(row[index], tz)
+            else:
+                item[key] = convert(row[index])
+        return item
+
+    @timed("serialize")
+    def map_rows(self, rows):
+        # Resolve the active timezone once per page rather than per value
+        tz = timezone.get_current_timezone()
+        id_lists = self.fetch_id_lists(rows)
+        map_row = self.map_row
+        return [map_row(row, tz, id_lists) for row in rows]
+
+    def fetch_id_lists(self, rows):
+        """
+        Related ids of every requested many-to-many field for a page of rows,
+        as {field: {medicine id: [related ids]}}, with one join table query
+        per field.
+        """
+        if not self._id_lists or not rows:
+            return None
+        medicine_ids = [row[self._id_index] for row in rows]
+        id_lists = {}
+        for name in self._id_lists:
+            field = MedicineDetail._meta.get_field(name)
+            source, target = field.m2m_column_name(), field.m2m_reverse_name()
+            grouped = defaultdict(list)
+            pairs = (
+                field.remote_field.through.objects.filter(**{f"{source}__in": medicine_ids})
+                .order_by(target)
+                .values_list(source, target)
+            )
+            for medicine_id, related_id in pairs:
+                grouped[medicine_id].append(related_id)
+            id_lists[name] = grouped
+        return id_lists
+
+
+def _datetime_to_representation(value, tz):
+    """Same output as DRF's DateTimeField with the default ISO 8601 format."""
+    if timezone.is_aware(value):
+        value = value.astimezone(tz)
+    else:
+        value = timezone.make_aware(value, tz)
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+_mappers = {}
+
+
+def get_row_mapper(fieldset=None):
+    """Return the compiled mapper for a fieldset, building it on first use."""
+    fieldset = fieldset or Fieldset()
+    mapper = _mappers.get(fieldset.cache_key)
+    if mapper is None:
+        mapper = _mappers[fieldset.cache_key] = MedicineRowMapper(fieldset)
+    return mapper
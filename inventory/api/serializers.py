@@ -1,41 +1,75 @@
 from rest_framework import serializers
+from utils.request_timing import timed
 from ..models import (
     MedicineDetail,
+    Condition,
     GenericName,
     MedicineCategory,
     Manufacturer,
     MedicineForm,
 )
-from ..exceptions import FeaturedMedicineInvalidError
+
+
+class TimedSerializerMixin:
+    """Counts validation and building `.data` towards the request's "serialize" phase."""
+
+    @timed("serialize")
+    def is_valid(self, *, raise_exception=False):
+        return super().is_valid(raise_exception=raise_exception)
+
+    @property
+    @timed("serialize")
+    def data(self):
+        return super().data
 
 
 # Nested serializers for read operations
-class GenericNameSerializer(serializers.ModelSerializer):
+class GenericNameSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = GenericName
         fields = ["id", "name"]
 
 
-class MedicineCategorySerializer(serializers.ModelSerializer):
+class MedicineCategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = MedicineCategory
         fields = ["id", "name"]
 
 
-class MedicineFormSerializer(serializers.ModelSerializer):
+class MedicineFormSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = MedicineForm
         fields = ["id", "form_type"]
 
 
-class ManufacturerSerializer(serializers.ModelSerializer):
+class ManufacturerSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Manufacturer
         fields = ["id", "name"]
 
 
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves ids against objects preloaded into the serializer context under
+    `related_objects[<field name>]` ({str(pk): obj}), so validating a batch
+    costs one query per relation instead of one per row. Falls back to the
+    regular queryset lookup when nothing was preloaded.
+    """
+
+    def to_internal_value(self, data):
+        related = self.context.get("related_objects", {}).get(self.field_name)
+        if related is None:
+            return super().to_internal_value(data)
+        if isinstance(data, (bool, dict, list)):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return related[str(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+
+
 # Main serializer for MedicineDetail
-class MedicineDetailSerializer(serializers.ModelSerializer):
+class MedicineDetailSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     # Allow nested detail on read and accept ID on write
     generic_name = serializers.PrimaryKeyRelatedField(
         queryset=GenericName.objects.all(), write_only=True
@@ -57,6 +91,11 @@ class MedicineDetailSerializer(serializers.ModelSerializer):
     )
     manufacturer_details = ManufacturerSerializer(read_only=True, source="manufacturer")
 
+    # Condition ids, read and written as a flat list
+    conditions = serializers.PrimaryKeyRelatedField(
+        queryset=Condition.objects.all(), many=True, required=False
+    )
+
     class Meta:
         model = MedicineDetail
         fields = [
@@ -70,6 +109,7 @@ class MedicineDetailSerializer(serializers.ModelSerializer):
             "prescription_required",
             "is_available",
             "is_featured",
+            "conditions",
             "generic_name",
             "generic_name_details",
             "category",
@@ -83,13 +123,40 @@ class MedicineDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["created_at", "updated_at"]
 
-    def validate(self, data):
-        if data.get("is_featured"):
-            existing_featured = MedicineDetail.objects.filter(
-                generic_name=data["generic_name"], is_featured=True
-            ).exclude(id=self.instance.id if self.instance else None)
-            if existing_featured.exists():
-                raise FeaturedMedicineInvalidError(
-                    "Only one featured medicine is allowed per generic name."
-                )
-        return data
+    def __init__(self, *args, fieldset=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Drop read fields outside the requested projection (?fields=/?expand=)
+        if fieldset is not None and not fieldset.is_default:
+            allowed = set(fieldset.output_fields)
+            for field_name in list(self.fields):
+                if not self.fields[field_name].write_only and field_name not in allowed:
+                    self.fields.pop(field_name)
+
+
+class BulkMedicineSerializer(MedicineDetailSerializer):
+    """
+    Item serializer for the bulk endpoint. Relations come from the batch's
+    preloaded objects, and the per-row uniqueness checks are skipped here
+    because the bulk validator runs them once for the whole batch. Conditions
+    are not written in bulk: bulk_create cannot set many-to-many rows.
+    """
+
+    generic_name = PrefetchedPrimaryKeyRelatedField(
+        queryset=GenericName.objects.all(), write_only=True
+    )
+    category = PrefetchedPrimaryKeyRelatedField(
+        queryset=MedicineCategory.objects.all(), write_only=True
+    )
+    form = PrefetchedPrimaryKeyRelatedField(
+        queryset=MedicineForm.objects.all(), write_only=True
+    )
+    manufacturer = PrefetchedPrimaryKeyRelatedField(
+        queryset=Manufacturer.objects.all(), allow_null=True, write_only=True
+    )
+
+    class Meta(MedicineDetailSerializer.Meta):
+        fields = [
+            field for field in MedicineDetailSerializer.Meta.fields if field != "conditions"
+        ]
+        extra_kwargs = {"batch_number": {"validators": []}}
+        validators = []
@@ -0,0 +1,180 @@
+# inventory/api/stock.py
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+from inventory.signals import queue_invalidation, queue_stock_invalidation
+from ..exceptions import InsufficientStockError, NotFoundError, ValidationError
+from ..models import MedicineDetail
+from . import live_stock
+from .batch_lookup import parse_ids
+
+STOCK_BATCH_LIMIT = 500
+
+
+def parse_delta(value):
+    # bool is an int subclass, and strings are not coerced on purpose
+    if isinstance(value, bool) or not isinstance(value, int) or value == 0:
+        raise ValidationError("Each delta must be a non-zero integer.")
+    return value
+
+
+def parse_adjustments(items):
+    """
+    Validate a list of {"id", "delta"} adjustments into {id: net delta},
+    in request order. Deltas for a repeated id are summed.
+    """
+    if not isinstance(items, list) or not items:
+        raise ValidationError("Expected a non-empty list of adjustments.")
+    if len(items) > STOCK_BATCH_LIMIT:
+        raise ValidationError(f"At most {STOCK_BATCH_LIMIT} adjustments can be applied at once.")
+
+    deltas = {}
+    for item in items:
+        if not isinstance(item, dict):
+            raise ValidationError("Each adjustment needs an 'id' and a 'delta'.")
+        (pk,) = parse_ids([item.get("id")])
+        deltas[pk] = deltas.get(pk, 0) + parse_delta(item.get("delta"))
+    return deltas
+
+
+def stock_error(deltas):
+    """Explain why an all-or-nothing adjustment did not apply to every row."""
+    stock = dict(
+        MedicineDetail.objects.filter(pk__in=list(deltas)).values_list("pk", "stock_quantity")
+    )
+    stock = {str(pk): quantity for pk, quantity in stock.items()}
+    missing = [pk for pk in deltas if pk not in stock]
+    if missing:
+        return NotFoundError(f"Medicines not found: {', '.join(missing)}.")
+    short = [pk for pk, delta in deltas.items() if stock[pk] + delta < 0]
+    return InsufficientStockError(f"Insufficient stock for: {', '.join(short)}.")
+
+
+def stock_update(deltas):
+    """
+    The (row filter, update kwargs) pair applying {medicine id: signed delta}
+    in one UPDATE. The deltas are added in SQL, and decrements only match rows
+    holding enough stock. A medicine that runs out becomes unavailable, and
+    one restocked from zero becomes available again.
+    """
+    guard = Q()
+    increments, availability = [], []
+    for pk, delta in deltas.items():
+        guard |= Q(pk=pk, stock_quantity__gte=max(-delta, 0))
+        increments.append(When(pk=pk, then=Value(delta)))
+        availability.append(When(pk=pk, stock_quantity__lte=-delta, then=Value(False)))
+        if delta > 0:
+            availability.append(When(pk=pk, stock_quantity=0, then=Value(True)))
+
+    # is_available is assigned first: MySQL evaluates SET assignments left to
+    # right, so it has to read stock_quantity before it changes
+    changes = {
+        "is_available": Case(*availability, default=F("is_available")),
+        "stock_quantity": F("stock_quantity") + Case(*increments, default=Value(0)),
+        "updated_at": timezone.now(),
+    }
+    return guard, changes
+
+
+def read_stock(ids):
+    """{id: {"id", "stock_quantity", "is_available"}} for the given medicines."""
+    rows = MedicineDetail.objects.filter(pk__in=list(ids)).values_list(
+        "pk", "stock_quantity", "is_available"
+    )
+    return {
+        str(pk): {"id": str(pk), "stock_quantity": stock, "is_available": available}
+        for pk, stock, available in rows
+    }
+
+
+def locked_stock(medicines):
+    """{id: stock_quantity} of the `medicines` queryset, locked until commit."""
+    return {
+        str(pk): stock
+        for pk, stock in medicines.select_for_update().values_list("pk", "stock_quantity")
+    }
+
+
+def queue_live_stock_sync(previous, current):
+    """
+    For writers that set stock_quantity outright rather than through
+    `apply_stock_deltas`: once the transaction commits, move the live stock
+    of reservations by the change from `previous` (stock read under lock)
+    to `current` (stock written), both {medicine id: stock_quantity}.
+    """
+    deltas = {
+        pk: current[pk] - stock
+        for pk, stock in previous.items()
+        if pk in current and current[pk] != stock
+    }
+    if deltas:
+        transaction.on_commit(lambda: live_stock.adjust_seeded(deltas))
+
+
+def queue_stock_change_invalidation(deltas, results):
+    """
+    Lists and searches show availability, so a flip retires them too; any
+    other stock change only drops the medicine's own keys. The stock
+    summaries of the medicines' generic names are refreshed either way.
+    """
+    flipped = [
+        pk
+        for pk, delta in deltas.items()
+        if results[pk]["stock_quantity"] == (0 if delta < 0 else delta)
+    ]
+    if flipped:
+        queue_invalidation(flipped)
+    # Also queues the summary refresh; flipped keys are not deleted twice
+    queue_stock_invalidation(deltas)
+
+
+def apply_stock_deltas(deltas):
+    """
+    Apply {medicine id: signed delta} in one UPDATE, all or nothing, so
+    concurrent adjustments never overwrite each other (see `stock_update`).
+    Returns [{"id", "stock_quantity", "is_available"}] in the order of
+    `deltas`; raises NotFoundError or InsufficientStockError and changes
+    nothing when any row cannot be adjusted.
+
+    Decrements of medicines with live stock are taken from it first, so
+    units held or sold through reservations are not sold again. They are
+    given back when the UPDATE fails; if an enclosing transaction rolls back
+    later, live stock stays short until `reconcile_stock` repairs it.
+    """
+    short, taken = live_stock.take_for_adjustment(deltas)
+    if short:
+        raise InsufficientStockError(f"Insufficient stock for: {', '.join(short)}.")
+    untaken = {pk: delta for pk, delta in deltas.items() if pk not in taken}
+
+    guard, changes = stock_update(deltas)
+    try:
+        with transaction.atomic():
+            updated = MedicineDetail.objects.filter(guard).update(**changes)
+            if updated == len(deltas):
+                results = read_stock(deltas)
+                queue_stock_change_invalidation(deltas, results)
+                # Keep the live stock used by reservations in step with the table
+                transaction.on_commit(lambda: live_stock.adjust_seeded(untaken))
+                return [results[pk] for pk in deltas]
+            transaction.set_rollback(True)
+    except BaseException:
+        live_stock.adjust_seeded({pk: -delta for pk, delta in taken.items()})
+        raise
+
+    live_stock.adjust_seeded({pk: -delta for pk, delta in taken.items()})
+    raise stock_error(deltas)
+
+
+def adjust_stock(pk, data):
+    """Apply the {"delta": n} adjustment in `data` to one medicine."""
+    if not isinstance(data, dict):
+        raise ValidationError("Expected an object with a 'delta'.")
+    (pk,) = parse_ids([pk])
+    return apply_stock_deltas({pk: parse_delta(data.get("delta"))})[0]
+
+
+def adjust_stock_batch(data):
+    """Apply {"adjustments": [{"id", "delta"}, ...]} in one transaction."""
+    if not isinstance(data, dict):
+        raise ValidationError("Expected an object with 'adjustments'.")
+    return apply_stock_deltas(parse_adjustments(data.get("adjustments")))
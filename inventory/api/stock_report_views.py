@@ -0,0 +1,115 @@
+# inventory/api/stock_report_views.py
+import logging
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from authentication.permissions import IsAdminOrReadOnly
+from inventory.exceptions import ValidationError
+from inventory.utils import api_response
+from .stock_reports import category_report_response, generic_report_response
+
+app_logger = logging.getLogger("app_logger")
+error_logger = logging.getLogger("error_logger")
+
+threshold_parameter = openapi.Parameter(
+    "threshold",
+    openapi.IN_QUERY,
+    description="Low-stock threshold in units; defaults to the LOW_STOCK_THRESHOLD setting.",
+    type=openapi.TYPE_INTEGER,
+)
+
+
+def report_response(build, request):
+    """Build a stock report and map its outcome to an API response."""
+    try:
+        return build(request)
+
+    except ValidationError as e:
+        error_logger.error("Invalid stock report request: %s", e)
+        return api_response(
+            success=False, message=str(e), status_code=status.HTTP_400_BAD_REQUEST
+        )
+    except NotFound as e:
+        app_logger.info("Stock report page not found: %s", e)
+        return api_response(
+            success=False, message=str(e), status_code=status.HTTP_404_NOT_FOUND
+        )
+    except Exception as e:
+        error_logger.error("Exception while building a stock report: %s", e)
+        return api_response(
+            success=False,
+            message="An error occurred while retrieving the stock report.",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+class StockCategoryReportView(APIView):
+    """Low stock and unavailable generic names by category, from the summary table."""
+
+    permission_classes = [IsAdminOrReadOnly]
+    # One GROUP BY over the summary table on a cache miss
+    query_budget = {"GET": 1}
+
+    @swagger_auto_schema(
+        operation_description="Per category: generic names, brands, available brands and total stock, plus how many generic names are at or below the low-stock threshold and how many have no available brand. Cached until stock changes.",
+        manual_parameters=[threshold_parameter],
+        responses={
+            200: "Stock summary per category.",
+            400: "Bad Request - Invalid threshold.",
+            500: "Internal Server Error - Error occurred while building the report.",
+        },
+    )
+    def get(self, request):
+        return report_response(category_report_response, request)
+
+
+class StockGenericReportView(APIView):
+    """Stock summary per generic name, added up from the summary table."""
+
+    permission_classes = [IsAdminOrReadOnly]
+    # Page and count on a cache miss
+    query_budget = {"GET": 2}
+
+    @swagger_auto_schema(
+        operation_description="Paginated category count, brand count, available brands, total stock and lowest price per generic name, across all its categories. Filter to generic names with no available brand in any category, or to those at or below the low-stock threshold in total (lowest stock first). Cached until stock changes.",
+        manual_parameters=[
+            openapi.Parameter(
+                "unavailable",
+                openapi.IN_QUERY,
+                description="Only generic names with no available brand.",
+                type=openapi.TYPE_BOOLEAN,
+            ),
+            openapi.Parameter(
+                "low_stock",
+                openapi.IN_QUERY,
+                description="Only generic names at or below the low-stock threshold.",
+                type=openapi.TYPE_BOOLEAN,
+            ),
+            threshold_parameter,
+            openapi.Parameter(
+                "category",
+                openapi.IN_QUERY,
+                description="Only generic names with brands in this category ID.",
+                type=openapi.TYPE_INTEGER,
+            ),
+            openapi.Parameter(
+                "page", openapi.IN_QUERY, description="Page number.", type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                "page_size",
+                openapi.IN_QUERY,
+                description="Rows per page.",
+                type=openapi.TYPE_INTEGER,
+            ),
+        ],
+        responses={
+            200: "A paginated list of stock summaries.",
+            400: "Bad Request - Invalid filter.",
+            404: "Not Found - Invalid page.",
+            500: "Internal Server Error - Error occurred while building the report.",
+        },
+    )
+    def get(self, request):
+        return report_response(generic_report_response, request)
@@ -0,0 +1,164 @@
+# inventory/api/stock_reports.py
+from django.conf import settings
+from django.db.models import Count, Min, Q, Sum
+from inventory.cache_keys import STOCK_SUMMARY_CACHE_KEY_TEMPLATE, STOCK_SUMMARY_VERSION_KEY
+from inventory.utils import api_response
+from utils.redis_cache import RedisCache
+from utils.response_cache import cache_response, get_cached_response
+from ..exceptions import ValidationError
+from ..models import StockSummary
+from .pagination import StandardResultsPagination
+
+cache_manager = RedisCache()
+
+STOCK_REPORT_CACHE_EXPIRATION = 900
+
+TRUE_VALUES = ("true", "1")
+
+
+def summary_version():
+    """Current summary version; bumped by every summary refresh."""
+    return cache_manager.get(STOCK_SUMMARY_VERSION_KEY) or 0
+
+
+def parse_threshold(request):
+    value = request.query_params.get("threshold", settings.LOW_STOCK_THRESHOLD)
+    try:
+        threshold = int(value)
+    except (TypeError, ValueError):
+        threshold = -1
+    if threshold < 0:
+        raise ValidationError("threshold must be a non-negative integer.")
+    return threshold
+
+
+def parse_category(request):
+    value = request.query_params.get("category")
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError("category must be an integer id.")
+
+
+def serve_cached_report(request, report, variant, build_response):
+    """Replay the cached report for this summary version, or build and cache it."""
+    cache_key = STOCK_SUMMARY_CACHE_KEY_TEMPLATE.format(report, summary_version(), variant)
+    response = get_cached_response(request, cache_key, invalidated_by=[STOCK_SUMMARY_VERSION_KEY])
+    if response is None:
+        response = cache_response(
+            request, build_response(), cache_key, expiration=STOCK_REPORT_CACHE_EXPIRATION
+        )
+    return response
+
+
+def category_report_response(request):
+    """
+    Per category: generic names, brands, available brands and total stock,
+    with the generic names at or below the low-stock threshold and those
+    with no available brand, counting only their brands in that category.
+    One GROUP BY over the summary table.
+    """
+    threshold = parse_threshold(request)
+
+    def build_response():
+        rows = (
+            StockSummary.objects.order_by("category__name")
+            .values("category_id", "category__name")
+            .annotate(
+                generics=Count("id"),
+                brands=Sum("brand_count"),
+                available_brands=Sum("available_count"),
+                stock=Sum("total_stock"),
+                low_stock=Count("id", filter=Q(total_stock__lte=threshold)),
+                unavailable=Count("id", filter=Q(available_count=0)),
+            )
+        )
+        data = [
+            {
+                "category": row["category_id"],
+                "category_name": row["category__name"],
+                "generic_count": row["generics"],
+                "brand_count": row["brands"],
+                "available_count": row["available_brands"],
+                "total_stock": row["stock"],
+                "low_stock_generics": row["low_stock"],
+                "unavailable_generics": row["unavailable"],
+            }
+            for row in rows
+        ]
+        return api_response(success=True, data={"threshold": threshold, "results": data})
+
+    return serve_cached_report(request, "categories", f"threshold_{threshold}", build_response)
+
+
+def generic_report_response(request):
+    """
+    Paginated summary per generic name, adding up its rows across
+    categories, optionally only those with no available brand in any
+    category (`unavailable=true`) or at or below the low-stock threshold in
+    total (`low_stock=true`, lowest stock first), and only those with brands
+    in one `category`. The filters apply to the per-generic totals.
+    """
+    category = parse_category(request)
+    unavailable = request.query_params.get("unavailable", "").lower() in TRUE_VALUES
+    low_stock = request.query_params.get("low_stock", "").lower() in TRUE_VALUES
+    threshold = parse_threshold(request) if low_stock else None
+    paginator = StandardResultsPagination()
+    page = request.query_params.get(paginator.page_query_param, 1)
+    variant = (
+        f"category_{category}_unavailable_{unavailable}_threshold_{threshold}"
+        f"_page_{page}_size_{paginator.get_page_size(request)}"
+    )
+
+    def build_response():
+        queryset = (
+            StockSummary.objects.values("generic_name_id", "generic_name__name")
+            .annotate(
+                categories=Count("id"),
+                brands=Sum("brand_count"),
+                available_brands=Sum("available_count"),
+                stock=Sum("total_stock"),
+                lowest_price=Min("min_price"),
+            )
+        )
+        if category is not None:
+            queryset = queryset.filter(
+                generic_name_id__in=StockSummary.objects.filter(category_id=category).values(
+                    "generic_name_id"
+                )
+            )
+        # On the aggregates, so HAVING: a brand available in another
+        # category keeps the generic name off the unavailable list
+        if unavailable:
+            queryset = queryset.filter(available_brands=0)
+        if threshold is not None:
+            queryset = queryset.filter(stock__lte=threshold).order_by("stock", "generic_name_id")
+        else:
+            queryset = queryset.order_by("generic_name__name", "generic_name_id")
+        rows = paginator.paginate_queryset(queryset, request)
+        results = [
+            {
+                "generic_name": row["generic_name_id"],
+                "generic_name_name": row["generic_name__name"],
+                "category_count": row["categories"],
+                "brand_count": row["brands"],
+                "available_count": row["available_brands"],
+                "total_stock": row["stock"],
+                # Two places on every backend; SQLite drops trailing zeros of MIN()
+                "min_price": f"{row['lowest_price']:.2f}",
+            }
+            for row in rows
+        ]
+        return api_response(
+            success=True,
+            data={
+                "count": paginator.page.paginator.count,
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "results": results,
+            },
+        )
+
+    return serve_cached_report(request, "generics", variant, build_response)
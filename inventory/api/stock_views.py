@@ -0,0 +1,111 @@
+# inventory/api/stock_views.py
+import logging
+from rest_framework.views import APIView
+from rest_framework import status
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from authentication.permissions import IsAdminOrReadOnly
+from inventory.exceptions import InsufficientStockError, NotFoundError, ValidationError
+from inventory.utils import api_response
+from .stock import STOCK_BATCH_LIMIT, adjust_stock, adjust_stock_batch
+
+app_logger = logging.getLogger("app_logger")
+error_logger = logging.getLogger("error_logger")
+
+delta_schema = openapi.Schema(
+    type=openapi.TYPE_INTEGER,
+    description="Signed change: negative to sell or dispense, positive to restock.",
+)
+
+stock_responses = {
+    200: "New stock levels.",
+    400: "Bad Request - Invalid adjustment.",
+    404: "Not Found - Medicine with the given ID does not exist.",
+    409: "Conflict - Not enough stock; nothing was changed.",
+    500: "Internal Server Error - Error occurred while adjusting stock.",
+}
+
+
+def stock_response(adjust, *args):
+    """Run a stock adjustment and map its outcome to an API response."""
+    try:
+        data = adjust(*args)
+        return api_response(success=True, data=data, message="Stock adjusted successfully.")
+
+    except ValidationError as e:
+        error_logger.error("Invalid stock adjustment: %s", e)
+        return api_response(
+            success=False, message=str(e), status_code=status.HTTP_400_BAD_REQUEST
+        )
+    except NotFoundError as e:
+        error_logger.error("Stock adjustment for unknown medicines: %s", e)
+        return api_response(
+            success=False, message=str(e), status_code=status.HTTP_404_NOT_FOUND
+        )
+    except InsufficientStockError as e:
+        app_logger.info("Stock adjustment rejected: %s", e)
+        return api_response(
+            success=False, message=str(e), status_code=status.HTTP_409_CONFLICT
+        )
+    except Exception as e:
+        error_logger.error("Exception while adjusting stock: %s", e)
+        return api_response(
+            success=False,
+            message="An error occurred while adjusting stock.",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+class MedicineStockView(APIView):
+    """
+    Atomic stock adjustments for one medicine. The delta is applied in SQL
+    with a non-negative guard, so concurrent counters never lose updates.
+    """
+
+    permission_classes = [IsAdminOrReadOnly]
+    # One guarded UPDATE, one read-back and the stock summary refresh (5)
+    query_budget = {"POST": 9}
+
+    @swagger_auto_schema(
+        operation_description="Apply a signed stock delta to a medicine. Stock never goes below zero; the medicine becomes unavailable when it runs out and available again when restocked from zero.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT, required=["delta"], properties={"delta": delta_schema}
+        ),
+        responses=stock_responses,
+    )
+    def post(self, request, pk):
+        """Adjust the stock of one medicine."""
+        return stock_response(adjust_stock, pk, request.data)
+
+
+class MedicineStockBatchView(APIView):
+    """Atomic stock adjustments for many medicines, all or nothing."""
+
+    permission_classes = [IsAdminOrReadOnly]
+    # Still one UPDATE, one read-back and one summary refresh, whatever the
+    # batch size
+    query_budget = {"POST": 9}
+
+    @swagger_auto_schema(
+        operation_description=f"Apply up to {STOCK_BATCH_LIMIT} signed stock deltas in one UPDATE. If any medicine is missing or would go below zero, nothing is changed.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["adjustments"],
+            properties={
+                "adjustments": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            "id": openapi.Schema(type=openapi.TYPE_STRING, format="uuid"),
+                            "delta": delta_schema,
+                        },
+                    ),
+                )
+            },
+        ),
+        responses=stock_responses,
+    )
+    def post(self, request):
+        """Adjust the stock of many medicines at once."""
+        return stock_response(adjust_stock_batch, request.data)
@@ -1,6 +1,21 @@
 # inventory/api/urls.py
 from django.urls import path
-from .views import MedicineDetailView, MedicineListView, MedicineSearchView
+from .async_views import read_view
+from .views import (
+    MedicineDetailView,
+    MedicineExportView,
+    MedicineListView,
+    MedicineSearchView,
+)
+from .batch_views import MedicineBatchLookupView, MedicineBulkView
+from .condition_views import ConditionMedicinesView
+from .stock_views import MedicineStockBatchView, MedicineStockView
+from .stock_report_views import StockCategoryReportView, StockGenericReportView
+from .reservation_views import (
+    StockReservationCommitView,
+    StockReservationDetailView,
+    StockReservationView,
+)
 from .auxiliary_views import (
     GenericNameListCreateView,
     GenericNameRetrieveUpdateDestroyView,
@@ -10,12 +25,26 @@ from .auxiliary_views import (
     MedicineFormRetrieveUpdateDestroyView,
     ManufacturerListCreateView,
     ManufacturerRetrieveUpdateDestroyView,
+    ReferenceDataView,
 )
 
 urlpatterns = [
-     path("medicines/", MedicineListView.as_view(), name="medicine-list"),
-    path("medicines/<uuid:pk>/", MedicineDetailView.as_view(), name="medicine-detail"),
-    path("medicines/search/", MedicineSearchView.as_view(), name="medicine-search"),
+     path("medicines/", read_view(MedicineListView), name="medicine-list"),
+    path("medicines/<uuid:pk>/", read_view(MedicineDetailView), name="medicine-detail"),
+    path("medicines/search/", read_view(MedicineSearchView), name="medicine-search"),
+    path("medicines/export/", MedicineExportView.as_view(), name="medicine-export"),
+    path("medicines/bulk/", MedicineBulkView.as_view(), name="medicine-bulk"),
+    path(
+        "medicines/<uuid:pk>/stock/", MedicineStockView.as_view(), name="medicine-stock"
+    ),
+    path(
+        "medicines/stock/", MedicineStockBatchView.as_view(), name="medicine-stock-batch"
+    ),
+    path(
+        "medicines/batch-lookup/",
+        MedicineBatchLookupView.as_view(),
+        name="medicine-batch-lookup",
+    ),
 
 
     path(
@@ -46,4 +75,31 @@ urlpatterns = [
         ManufacturerRetrieveUpdateDestroyView.as_view(),
         name="manufacturer-detail",
     ),
+    path(
+        "conditions/<int:pk>/medicines/",
+        ConditionMedicinesView.as_view(),
+        name="condition-medicines",
+    ),
+    path("reservations/", StockReservationView.as_view(), name="reservation-list"),
+    path(
+        "reservations/<str:reservation_id>/",
+        StockReservationDetailView.as_view(),
+        name="reservation-detail",
+    ),
+    path(
+        "reservations/<str:reservation_id>/commit/",
+        StockReservationCommitView.as_view(),
+        name="reservation-commit",
+    ),
+    path(
+        "stock-summary/categories/",
+        StockCategoryReportView.as_view(),
+        name="stock-summary-categories",
+    ),
+    path(
+        "stock-summary/generics/",
+        StockGenericReportView.as_view(),
+        name="stock-summary-generics",
+    ),
+    path("reference-data/", ReferenceDataView.as_view(), name="reference-data"),
 ]
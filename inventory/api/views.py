@@ -2,81 +2,194 @@
 
 import json
 import logging
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework import status, permissions
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from django.db import transaction
 from django.db.models import Q
+from django.http import StreamingHttpResponse
 from authentication.permissions import IsAdminOrReadOnly
-from inventory.exceptions import FeaturedMedicineInvalidError
+from inventory.cache_keys import (
+    MEDICINE_DETAIL_CACHE_KEY_TEMPLATE,
+    MEDICINE_LIST_CACHE_KEY,
+    MEDICINE_LIST_GENERATION_KEY,
+    SEARCH_CACHE_KEY_TEMPLATE,
+)
+from inventory.exceptions import FeaturedMedicineInvalidError, ValidationError
 from inventory.utils import api_response
+from .export import EXPORT_FORMATS, export_chunks, gzip_chunks
+from .fieldsets import Fieldset
+from .filters import DEFAULT_ORDERING, ORDERINGS, MedicineFilters
+from .pagination import CountedResultsPagination, KeysetPagination
+from .row_mappers import get_row_mapper
 from .serializers import MedicineDetailSerializer
+from .stock import queue_live_stock_sync
 from ..models import MedicineDetail
-from utils.redis_cache import RedisCache
-from rest_framework.pagination import PageNumberPagination
+from utils.compression import negotiate_encoding
+from utils.redis_cache import AsyncRedisCache, RedisCache
+from utils.response_cache import aget_cached_response, cache_response, get_cached_response
 from rest_framework.response import Response
 
 
 # Redis cache manager
 cache_manager = RedisCache()
-# Define cache keys and other constants
-MEDICINE_LIST_CACHE_KEY = "medicine_list"
-MEDICINE_DETAIL_CACHE_KEY_TEMPLATE = "medicine_detail_{}"
-SEARCH_CACHE_KEY_TEMPLATE = "medicine_search_{}"
+async_cache_manager = AsyncRedisCache()
 
 app_logger = logging.getLogger("app_logger")
 error_logger = logging.getLogger("error_logger")
-
-
-class StandardResultsPagination(PageNumberPagination):
-    page_size = 10  # Default items per page
-    page_size_query_param = "page_size"
-    max_page_size = 100
+# Per-request trace and cache hits of the read endpoints, sampled
+read_logger = logging.getLogger("app_logger.reads")
+cache_logger = logging.getLogger("app_logger.cache")
+
+
+def list_generation():
+    """Current list generation; bumped by every medicine write."""
+    return cache_manager.get(MEDICINE_LIST_GENERATION_KEY) or 0
+
+
+async def alist_generation():
+    return await async_cache_manager.get(MEDICINE_LIST_GENERATION_KEY) or 0
+
+
+def versioned_cache_key(base_key, request, paginator, fieldset, generation):
+    """
+    Build a list/search cache key that varies by page size and projection and
+    embeds the current list generation, so a single INCR invalidates it.
+    """
+    page_size = paginator.get_page_size(request)
+    return f"{base_key}_size_{page_size}_{fieldset.cache_key}_gen_{generation}"
+
+
+# Sort and filter parameters shared by the list and search endpoints; the
+# filters must match FILTERS (checked in inventory/tests/test_filters.py)
+filter_parameters = [
+    openapi.Parameter(
+        "ordering",
+        openapi.IN_QUERY,
+        description=f"Sort order, one of: {', '.join(ORDERINGS)}. Defaults to `{DEFAULT_ORDERING}`.",
+        type=openapi.TYPE_STRING,
+        enum=list(ORDERINGS),
+    ),
+    openapi.Parameter(
+        "min_price", openapi.IN_QUERY, description="Lowest price.", type=openapi.TYPE_NUMBER
+    ),
+    openapi.Parameter(
+        "max_price", openapi.IN_QUERY, description="Highest price.", type=openapi.TYPE_NUMBER
+    ),
+    openapi.Parameter(
+        "prescription_required",
+        openapi.IN_QUERY,
+        description="Only medicines that do (true) or do not (false) need a prescription.",
+        type=openapi.TYPE_BOOLEAN,
+    ),
+    openapi.Parameter(
+        "is_available",
+        openapi.IN_QUERY,
+        description="Only available (true) or unavailable (false) medicines.",
+        type=openapi.TYPE_BOOLEAN,
+    ),
+    openapi.Parameter(
+        "unit_of_measurement",
+        openapi.IN_QUERY,
+        description="Unit of measurement code.",
+        type=openapi.TYPE_STRING,
+    ),
+    openapi.Parameter(
+        "category", openapi.IN_QUERY, description="Category ID.", type=openapi.TYPE_INTEGER
+    ),
+    openapi.Parameter(
+        "generic_name",
+        openapi.IN_QUERY,
+        description="Generic name ID.",
+        type=openapi.TYPE_INTEGER,
+    ),
+]
 
 
 class MedicineListView(APIView):
     permission_classes = [IsAdminOrReadOnly]
-    pagination_class = StandardResultsPagination
+    # Safe requests read from a replica (utils.db_router)
+    replica_reads = True
+    # Page, count and condition ids on a cache miss; budgets include the JWT
+    # user lookup and the stock summary refresh (4) on writes
+    query_budget = {"GET": 3, "POST": 14}
+    pagination_class = CountedResultsPagination
 
     @swagger_auto_schema(
-        operation_description="Retrieve a paginated list of all medicines with optional caching.",
+        operation_description="Retrieve a paginated list of all medicines with optional caching, sorting and filtering. Pass `pagination=cursor` (or a `cursor` from a previous page) for keyset pagination ordered by creation time; it only supports the default ordering.",
+        manual_parameters=[
+            openapi.Parameter(
+                "pagination",
+                openapi.IN_QUERY,
+                description="Set to `cursor` for keyset pagination.",
+                type=openapi.TYPE_STRING,
+            ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="Opaque cursor from a previous `next`/`previous` link.",
+                type=openapi.TYPE_STRING,
+            ),
+            *filter_parameters,
+        ],
         responses={
             200: openapi.Response(
                 description="A paginated list of medicines",
                 schema=MedicineDetailSerializer(many=True),
             ),
+            400: "Bad Request - Invalid projection, ordering or filter.",
             500: "Internal Server Error - Error occurred while retrieving medicines.",
         },
     )
     def get(self, request):
         """Retrieve a paginated list of medicines with optional caching."""
         try:
-            app_logger.info("Attempting to retrieve paginated medicine list")
-            page = request.query_params.get("page", 1)
-            cache_key = f"{MEDICINE_LIST_CACHE_KEY}_page_{page}"
+            read_logger.info("Attempting to retrieve paginated medicine list")
+            cache_key, build_response = self.prepare_get(request, list_generation())
 
-            # Check for cached data
-            # cached_data = cache_manager.get(cache_key)
-            # if cached_data:
-            #     app_logger.info("Cache hit for paginated medicine list")
-            #     return api_response(success=True, data=cached_data)
+            # Check for cached response
+            cached_response = get_cached_response(
+                request, cache_key, invalidated_by=[MEDICINE_LIST_GENERATION_KEY]
+            )
+            if cached_response is not None:
+                cache_logger.info("Cache hit for paginated medicine list")
+                return cached_response
+            return build_response()
 
-            # Retrieve and paginate data
-            medicines = (
-                MedicineDetail.objects.select_related(
-                    "generic_name", "category", "form", "manufacturer"
-                )
-                .prefetch_related("conditions")
-                .all()
+        except ValidationError as e:
+            error_logger.error("Invalid medicine list request: %s", str(e))
+            return api_response(
+                success=False, message=str(e), status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            error_logger.error("Error in MedicineListView GET method: %s", str(e))
+            return api_response(
+                success=False,
+                message="An error occurred while retrieving medicines.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
-            paginator = StandardResultsPagination()
-            result_page = paginator.paginate_queryset(medicines, request)
-            serialized_data = MedicineDetailSerializer(result_page, many=True).data
 
-            # Cache the paginated results
-            cache_manager.set(cache_key, serialized_data, expiration=900)
-            return paginator.get_paginated_response(serialized_data)
+    async def aget(self, request):
+        """`get` for the async entry point (see async_views.py)."""
+        try:
+            read_logger.info("Attempting to retrieve paginated medicine list")
+            cache_key, build_response = self.prepare_get(request, await alist_generation())
 
+            cached_response = await aget_cached_response(
+                request, cache_key, invalidated_by=[MEDICINE_LIST_GENERATION_KEY]
+            )
+            if cached_response is not None:
+                cache_logger.info("Cache hit for paginated medicine list")
+                return cached_response
+            return await sync_to_async(build_response)()
+
+        except ValidationError as e:
+            error_logger.error("Invalid medicine list request: %s", str(e))
+            return api_response(
+                success=False, message=str(e), status_code=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             error_logger.error("Error in MedicineListView GET method: %s", str(e))
             return api_response(
@@ -85,6 +198,73 @@ class MedicineListView(APIView):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    def prepare_get(self, request, generation):
+        """
+        The cache key of the requested page, and a function building and
+        caching the page on a miss. Parsing the request never touches the
+        database or Redis, so the async entry point can run it on the loop.
+        """
+        fieldset = Fieldset.from_request(request)
+        filters = MedicineFilters.from_request(request)
+        if KeysetPagination.is_requested(request):
+            # Cursors encode a position on (created_at, id) only
+            if filters.ordering != DEFAULT_ORDERING:
+                raise ValidationError(
+                    "Cursor pagination only supports the default ordering."
+                )
+            paginator = KeysetPagination()
+            cursor = request.query_params.get("cursor") or "first"
+            base_key = f"{MEDICINE_LIST_CACHE_KEY}_{filters.cache_key}_cursor_{cursor}"
+        else:
+            paginator = CountedResultsPagination()
+            page = request.query_params.get("page", 1)
+            counts = paginator.counts_requested(request)
+            base_key = (
+                f"{MEDICINE_LIST_CACHE_KEY}_{filters.cache_key}_page_{page}_count_{counts}"
+            )
+        cache_key = versioned_cache_key(
+            base_key, request, paginator, fieldset, generation
+        )
+
+        def build_response():
+            # Fetch flat rows for only the requested columns and joins, then
+            # map them straight to the serializer's output shape
+            mapper = get_row_mapper(fieldset)
+            if isinstance(paginator, KeysetPagination):
+                result_page = paginator.paginate_queryset(
+                    filters.apply(MedicineDetail.objects.all()),
+                    request,
+                    columns=mapper.columns,
+                )
+            else:
+                medicines = filters.apply(MedicineDetail.objects.all()).values_list(
+                    *mapper.columns
+                )
+                # The unfiltered list may use the table's estimated row count;
+                # the sort order never changes the count
+                count_key = f"{MEDICINE_LIST_CACHE_KEY}_gen_{generation}"
+                if filters.is_filtered:
+                    count_key = (
+                        f"{MEDICINE_LIST_CACHE_KEY}_{filters.count_cache_key}_gen_{generation}"
+                    )
+                result_page = paginator.paginate_queryset(
+                    medicines,
+                    request,
+                    count_key=count_key,
+                    approximate=not filters.is_filtered,
+                )
+            serialized_data = mapper.map_rows(result_page)
+
+            # Cache the rendered paginated response
+            return cache_response(
+                request,
+                paginator.get_paginated_response(serialized_data),
+                cache_key,
+                expiration=900,
+            )
+
+        return cache_key, build_response
+
     @swagger_auto_schema(
         operation_description="Create a new medicine entry with provided details. Only accessible to users with appropriate permissions.",
         request_body=MedicineDetailSerializer,
@@ -134,6 +314,10 @@ class MedicineListView(APIView):
 
 class MedicineDetailView(APIView):
     permission_classes = [IsAdminOrReadOnly]
+    replica_reads = True
+    # One joined fetch plus the condition ids on a cache miss; writes
+    # include the stock summary refresh (4)
+    query_budget = {"GET": 2, "PUT": 9, "DELETE": 10}
 
     @swagger_auto_schema(
         operation_description="Retrieve a specific medicine entry by its ID, with caching enabled for faster subsequent retrieval.",
@@ -150,27 +334,75 @@ class MedicineDetailView(APIView):
         """Retrieve a single medicine entry with caching."""
         cache_key = MEDICINE_DETAIL_CACHE_KEY_TEMPLATE.format(pk)
         try:
-            app_logger.info(f"Fetching medicine entry with ID: {pk}")
-            cached_data = cache_manager.get(cache_key)
-            if cached_data:
-                app_logger.info(f"Cache hit for medicine ID {pk}")
-                return api_response(success=True, data=cached_data)
+            read_logger.info("Fetching medicine entry with ID: %s", pk)
+            cached_response = get_cached_response(
+                request, cache_key, invalidated_by=[MEDICINE_LIST_GENERATION_KEY]
+            )
+            if cached_response is not None:
+                cache_logger.info("Cache hit for medicine ID %s", pk)
+                return cached_response
 
-            # Cache miss - retrieve from DB
-            medicine = MedicineDetail.objects.get(pk=pk)
+            # Cache miss - retrieve from DB and cache the rendered response
+            medicine = (
+                MedicineDetail.objects.select_related(
+                    "generic_name", "category", "form", "manufacturer"
+                )
+                .prefetch_related("conditions")
+                .get(pk=pk)
+            )
+            data = MedicineDetailSerializer(medicine).data
+            return cache_response(
+                request, api_response(success=True, data=data), cache_key, expiration=900
+            )
+
+        except MedicineDetail.DoesNotExist:
+            error_logger.error("Medicine with ID %s not found.", pk)
+            return api_response(
+                success=False,
+                message="Medicine not found.",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            error_logger.error("Error in MedicineDetailView GET method: %s", e)
+            return api_response(
+                success=False,
+                message="An error occurred while retrieving the medicine.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    async def aget(self, request, pk):
+        """`get` for the async entry point, on the async ORM (see async_views.py)."""
+        cache_key = MEDICINE_DETAIL_CACHE_KEY_TEMPLATE.format(pk)
+        try:
+            read_logger.info("Fetching medicine entry with ID: %s", pk)
+            cached_response = await aget_cached_response(
+                request, cache_key, invalidated_by=[MEDICINE_LIST_GENERATION_KEY]
+            )
+            if cached_response is not None:
+                cache_logger.info("Cache hit for medicine ID %s", pk)
+                return cached_response
+
+            medicine = await (
+                MedicineDetail.objects.select_related(
+                    "generic_name", "category", "form", "manufacturer"
+                )
+                .prefetch_related("conditions")
+                .aget(pk=pk)
+            )
             data = MedicineDetailSerializer(medicine).data
-            cache_manager.set(cache_key, data, expiration=900)
-            return api_response(success=True, data=data)
+            return cache_response(
+                request, api_response(success=True, data=data), cache_key, expiration=900
+            )
 
         except MedicineDetail.DoesNotExist:
-            error_logger.error(f"Medicine with ID {pk} not found.")
+            error_logger.error("Medicine with ID %s not found.", pk)
             return api_response(
                 success=False,
                 message="Medicine not found.",
                 status_code=status.HTTP_404_NOT_FOUND,
             )
         except Exception as e:
-            error_logger.error(f"Error in MedicineDetailView GET method: {str(e)}")
+            error_logger.error("Error in MedicineDetailView GET method: %s", e)
             return api_response(
                 success=False,
                 message="An error occurred while retrieving the medicine.",
@@ -193,18 +425,28 @@ class MedicineDetailView(APIView):
     def put(self, request, pk):
         """Update a specific medicine entry."""
         try:
-            medicine = MedicineDetail.objects.get(pk=pk)
-            serializer = MedicineDetailSerializer(
-                medicine, data=request.data, partial=True
-            )
-            if serializer.is_valid():
-                serializer.save()
-                return api_response(
-                    success=True,
-                    data=serializer.data,
-                    message="Medicine updated successfully.",
-                    status_code=status.HTTP_200_OK,
+            # The row is locked, so saving it never writes back a stock
+            # quantity that a flush or adjustment changed in the meantime
+            with transaction.atomic():
+                medicine = (
+                    MedicineDetail.objects.select_for_update(of=("self",))
+                    .select_related("generic_name", "category", "form", "manufacturer")
+                    .prefetch_related("conditions")
+                    .get(pk=pk)
+                )
+                previous = {str(medicine.pk): medicine.stock_quantity}
+                serializer = MedicineDetailSerializer(
+                    medicine, data=request.data, partial=True
                 )
+                if serializer.is_valid():
+                    serializer.save()
+                    queue_live_stock_sync(previous, {str(medicine.pk): medicine.stock_quantity})
+                    return api_response(
+                        success=True,
+                        data=serializer.data,
+                        message="Medicine updated successfully.",
+                        status_code=status.HTTP_200_OK,
+                    )
             return api_response(
                 success=False,
                 message=serializer.errors,
@@ -217,8 +459,13 @@ class MedicineDetailView(APIView):
                 message="Medicine not found.",
                 status_code=status.HTTP_404_NOT_FOUND,
             )
+        except FeaturedMedicineInvalidError as e:
+            error_logger.error("Custom validation error: %s", str(e))
+            return api_response(
+                success=False, message=str(e), status_code=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
-            error_logger.error(f"Exception in MedicineDetailView PUT method: {str(e)}")
+            error_logger.error("Exception in MedicineDetailView PUT method: %s", e)
             return api_response(
                 success=False,
                 message="An error occurred while updating the medicine.",
@@ -253,7 +500,7 @@ class MedicineDetailView(APIView):
             )
 
         except Exception as e:
-            error_logger.error(f"Exception in DELETE method: {str(e)}")
+            error_logger.error("Exception in DELETE method: %s", e)
             return api_response(
                 success=False,
                 message="An error occurred while deleting the medicine.",
@@ -262,34 +509,188 @@ class MedicineDetailView(APIView):
 
 
 from rest_framework.response import Response
-from inventory.models import MedicineCategory, MedicineForm, Manufacturer
+from inventory.models import Condition, MedicineCategory, MedicineForm, Manufacturer
+
+
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class MedicineExportView(APIView):
+    permission_classes = [IsAdminOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_description="Stream the full medicine catalog as NDJSON or CSV in constant memory. Gzip-compressed on the fly when the client sends `Accept-Encoding: gzip`.",
+        manual_parameters=[
+            openapi.Parameter(
+                "output",
+                openapi.IN_QUERY,
+                description="Export format: `ndjson` (default) or `csv`.",
+                type=openapi.TYPE_STRING,
+                enum=list(EXPORT_FORMATS),
+            )
+        ],
+        responses={
+            200: "The streamed catalog export.",
+            400: "Bad Request - Unsupported export format.",
+        },
+    )
+    def get(self, request):
+        """Stream the whole catalog without paging or counting."""
+        export_format = request.query_params.get("output", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return api_response(
+                success=False,
+                message=f"Unsupported export format '{export_format}'.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        app_logger.info("Streaming medicine catalog export as %s", export_format)
+        chunks = export_chunks(export_format)
+        compressed = negotiate_encoding(request, supported=("gzip",)) == "gzip"
+        if compressed:
+            chunks = gzip_chunks(chunks)
+
+        response = StreamingHttpResponse(
+            chunks, content_type=EXPORT_CONTENT_TYPES[export_format]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="medicines.{export_format}"'
+        )
+        if compressed:
+            response["Content-Encoding"] = "gzip"
+        response["Vary"] = "Accept-Encoding"
+        return response
 
 
 class MedicineSearchView(APIView):
     permission_classes = [IsAdminOrReadOnly]
+    replica_reads = True
+    # Page, count and condition ids on a cache miss
+    query_budget = {"GET": 3}
 
+    @swagger_auto_schema(
+        operation_description="Search medicines by name or generic name, with highlighting, sorting and filtering.",
+        manual_parameters=[
+            openapi.Parameter(
+                "q", openapi.IN_QUERY, description="Search text.", type=openapi.TYPE_STRING, required=True
+            ),
+            openapi.Parameter(
+                "filters",
+                openapi.IN_QUERY,
+                description='JSON object of category, form, manufacturer and condition ids, e.g. `{"form": 2}`.',
+                type=openapi.TYPE_STRING,
+            ),
+            *filter_parameters,
+        ],
+        responses={
+            200: openapi.Response(
+                description="A paginated list of matching medicines",
+                schema=MedicineDetailSerializer(many=True),
+            ),
+            400: "Bad Request - Missing query, or invalid projection, ordering or filter.",
+            500: "Internal Server Error - Error occurred while searching for medicines.",
+        },
+    )
     def get(self, request):
         """Perform a paginated search with caching and keyword highlighting."""
         try:
-            app_logger.info("GET request received for MedicineSearchView")
+            read_logger.info("GET request received for MedicineSearchView")
             query = request.query_params.get("q", "").strip()
-            filters = request.query_params.get("filters", "")
             page = request.query_params.get("page", 1)
-            cache_key = f"{SEARCH_CACHE_KEY_TEMPLATE.format(query)}_page_{page}"
-
             if not query:
-                return api_response(
-                    success=False,
-                    message="Query parameter 'q' is required for search.",
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                )
+                return self.missing_query_response()
+            cache_key, build_response = self.prepare_get(request, list_generation())
 
             # Check for cached response
-            cached_data = cache_manager.get(cache_key)
-            if cached_data:
-                app_logger.info(f"Cache hit for search query '{query}' on page {page}")
-                return Response(cached_data)
+            cached_response = get_cached_response(
+                request, cache_key, invalidated_by=[MEDICINE_LIST_GENERATION_KEY]
+            )
+            if cached_response is not None:
+                cache_logger.info("Cache hit for search query '%s' on page %s", query, page)
+                return cached_response
+            return build_response()
+
+        except ValidationError as e:
+            error_logger.error("Invalid medicine search request: %s", e)
+            return api_response(
+                success=False, message=str(e), status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            error_logger.error("Error in MedicineSearchView GET method: %s", e)
+            return api_response(
+                success=False,
+                message="An error occurred while searching for medicines.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    async def aget(self, request):
+        """`get` for the async entry point (see async_views.py)."""
+        try:
+            read_logger.info("GET request received for MedicineSearchView")
+            query = request.query_params.get("q", "").strip()
+            page = request.query_params.get("page", 1)
+            if not query:
+                return self.missing_query_response()
+            cache_key, build_response = self.prepare_get(request, await alist_generation())
+
+            cached_response = await aget_cached_response(
+                request, cache_key, invalidated_by=[MEDICINE_LIST_GENERATION_KEY]
+            )
+            if cached_response is not None:
+                cache_logger.info("Cache hit for search query '%s' on page %s", query, page)
+                return cached_response
+            return await sync_to_async(build_response)()
+
+        except ValidationError as e:
+            error_logger.error("Invalid medicine search request: %s", e)
+            return api_response(
+                success=False, message=str(e), status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            error_logger.error("Error in MedicineSearchView GET method: %s", e)
+            return api_response(
+                success=False,
+                message="An error occurred while searching for medicines.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
 
+    def missing_query_response(self):
+        return api_response(
+            success=False,
+            message="Query parameter 'q' is required for search.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+    def prepare_get(self, request, generation):
+        """
+        The cache key of the requested search page, and a function running,
+        highlighting and caching the search on a miss. Parsing the request
+        never touches the database or Redis.
+        """
+        query = request.query_params.get("q", "").strip()
+        filters = request.query_params.get("filters", "")
+        page = request.query_params.get("page", 1)
+
+        fieldset = Fieldset.from_request(request)
+        medicine_filters = MedicineFilters.from_request(request)
+        paginator = CountedResultsPagination()
+        search_key = (
+            f"{SEARCH_CACHE_KEY_TEMPLATE.format(query)}_filters_{filters}"
+            f"_{medicine_filters.count_cache_key}"
+        )
+        counts = paginator.counts_requested(request)
+        cache_key = versioned_cache_key(
+            f"{search_key}_order_{medicine_filters.ordering}_page_{page}_count_{counts}",
+            request,
+            paginator,
+            fieldset,
+            generation,
+        )
+
+        def build_response():
             # Construct filters using ID mappings
             search_filter = Q(name__icontains=query) | Q(
                 generic_name__name__icontains=query
@@ -298,34 +699,35 @@ class MedicineSearchView(APIView):
                 filter_params = json.loads(filters)
                 search_filter = self.build_search_filter(search_filter, filter_params)
 
-            # Retrieve and paginate the results
-            medicines = MedicineDetail.objects.filter(search_filter).distinct()
-            paginator = StandardResultsPagination()
-            result_page = paginator.paginate_queryset(medicines, request)
+            # Retrieve and paginate the results as flat rows
+            mapper = get_row_mapper(fieldset)
+            medicines = (
+                medicine_filters.apply(MedicineDetail.objects.filter(search_filter))
+                .values_list(*mapper.columns)
+                .distinct()
+            )
+            # The count is shared by every page and projection of this search
+            result_page = paginator.paginate_queryset(
+                medicines, request, count_key=f"{search_key}_gen_{generation}"
+            )
 
             # No results handling
             if not result_page:
                 empty_response = paginator.get_paginated_response([])
-                cache_manager.set(cache_key, empty_response.data, expiration=600)
-                return empty_response
+                return cache_response(request, empty_response, cache_key, expiration=600)
 
             # Serialize and cache results
             results = [
-                self._add_highlighting(MedicineDetailSerializer(med).data, query)
-                for med in result_page
+                self._add_highlighting(item, query)
+                for item in mapper.map_rows(result_page)
             ]
             paginated_response = paginator.get_paginated_response(results)
-            cache_manager.set(cache_key, paginated_response.data, expiration=600)
-            return paginated_response
-
-        except Exception as e:
-            error_logger.error(f"Error in MedicineSearchView GET method: {str(e)}")
-            return api_response(
-                success=False,
-                message="An error occurred while searching for medicines.",
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            return cache_response(
+                request, paginated_response, cache_key, expiration=600
             )
 
+        return cache_key, build_response
+
     def build_search_filter(self, search_filter, filter_params):
         """Helper to build a search filter from filter parameters."""
         try:
@@ -345,19 +747,29 @@ class MedicineSearchView(APIView):
                 ).id
                 search_filter &= Q(manufacturer_id=manufacturer_id)
 
+            if "condition" in filter_params and filter_params["condition"]:
+                condition_id = Condition.objects.get(id=filter_params["condition"]).id
+                search_filter &= Q(conditions__id=condition_id)
+
         except MedicineCategory.DoesNotExist:
             error_logger.error("Invalid category filter")
         except MedicineForm.DoesNotExist:
             error_logger.error("Invalid form filter")
         except Manufacturer.DoesNotExist:
             error_logger.error("Invalid manufacturer filter")
+        except Condition.DoesNotExist:
+            error_logger.error("Invalid condition filter")
 
         return search_filter
 
     def _add_highlighting(self, data, query):
         """Adds highlight positions to data."""
         matches = {
-            "name": self.get_match_indices_with_end(data["name"], query),
+            "name": (
+                self.get_match_indices_with_end(data["name"], query)
+                if "name" in data
+                else []
+            ),
             "generic_name": (
                 self.get_match_indices_with_end(
                     data["generic_name_details"]["name"], query
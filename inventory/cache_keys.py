@@ -0,0 +1,50 @@
+# inventory/cache_keys.py
+
+# Cache keys shared by the API views and the invalidation signals
+MEDICINE_LIST_CACHE_KEY = "medicine_list"
+MEDICINE_DETAIL_CACHE_KEY_TEMPLATE = "medicine_detail_{}"
+SEARCH_CACHE_KEY_TEMPLATE = "medicine_search_{}"
+LOCK_KEY_TEMPLATE = "lock_key_{}"
+
+# Per-medicine item JSON (the list representation) used by batch lookups, and
+# batch_number -> id aliases. Aliases are never invalidated: a hit is only
+# trusted when the cached item still carries the same batch_number.
+MEDICINE_ITEM_CACHE_KEY_TEMPLATE = "medicine_item_{}"
+MEDICINE_BATCH_NUMBER_CACHE_KEY_TEMPLATE = "medicine_batch_number_{}"
+
+# Per-condition sorted set of medicine ids, newest first, built on first read
+# and dropped whenever a medicine joins or leaves the condition. Those changes
+# also bump the condition's version; a rebuild is only stored if the version
+# it read before querying is still current.
+CONDITION_MEDICINES_CACHE_KEY_TEMPLATE = "condition_medicines_{}"
+CONDITION_VERSION_KEY_TEMPLATE = "condition_version_{}"
+
+# Bumped on every medicine write. List and search keys embed the current
+# generation, so one INCR retires every cached page, filter and projection.
+MEDICINE_LIST_GENERATION_KEY = "medicine_list_generation"
+
+# Bumped on every write to a reference table (generic names, categories,
+# forms, manufacturers). Reference list keys and the bootstrap snapshot embed
+# the current version; their ETags hash the body instead, so they survive a
+# counter that restarts.
+REFERENCE_DATA_VERSION_KEY = "reference_data_version"
+REFERENCE_LIST_CACHE_KEY_TEMPLATE = "reference_{}_v{}_{}"
+REFERENCE_SNAPSHOT_CACHE_KEY_TEMPLATE = "reference_snapshot_v{}"
+
+# Live stock for reservations (see inventory/api/live_stock.py). These are
+# state rather than cache entries: none of them expire.
+STOCK_AVAILABLE_KEY_TEMPLATE = "stock_available_{}"
+STOCK_RESERVATION_KEY_TEMPLATE = "stock_reservation_{}"
+STOCK_RESERVED_KEY = "stock_reserved"
+STOCK_RESERVATION_EXPIRY_KEY = "stock_reservation_expiry"
+STOCK_PENDING_DELTAS_KEY = "stock_pending_deltas"
+STOCK_FLUSHING_DELTAS_KEY = "stock_flushing_deltas"
+STOCK_EPOCH_KEY = "stock_epoch"
+STOCK_FLUSH_ID_KEY = "stock_flush_id"
+# Committed deltas a flush could not write, kept for an operator
+STOCK_DEAD_DELTAS_KEY = "stock_dead_deltas"
+
+# Bumped whenever stock summaries are refreshed; the cached summary
+# responses embed the current version.
+STOCK_SUMMARY_VERSION_KEY = "stock_summary_version"
+STOCK_SUMMARY_CACHE_KEY_TEMPLATE = "stock_summary_{}_v{}_{}"
@@ -26,3 +26,11 @@ class ValidationError(APIException):
     status_code = status.HTTP_400_BAD_REQUEST
     default_detail = "Validation error."
     default_code = "validation_error"
+
+
+class InsufficientStockError(APIException):
+    """Raised when a stock adjustment would take a medicine below zero."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Insufficient stock for this adjustment."
+    default_code = "insufficient_stock"
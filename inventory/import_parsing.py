@@ -0,0 +1,119 @@
+# inventory/import_parsing.py
+"""
+Row parsing and validation for the `import_medicines` command.
+
+Everything here is plain Python with no Django imports, so chunks can be
+parsed in worker processes without setting up Django in each of them.
+"""
+from decimal import Decimal, InvalidOperation
+
+REQUIRED_COLUMNS = (
+    "name",
+    "description",
+    "price",
+    "batch_number",
+    "generic_name",
+    "category",
+    "form",
+)
+
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+FALSE_VALUES = {"0", "false", "no", "n", "f", ""}
+
+NAME_MAX_LENGTH = 200
+BATCH_NUMBER_MAX_LENGTH = 100
+REFERENCE_MAX_LENGTH = 150
+PRICE_LIMIT = Decimal("100000000")  # max_digits=10, decimal_places=2
+
+
+def check_header(header):
+    """Return the required columns missing from a file header."""
+    present = {str(column).strip() for column in header if column is not None}
+    return [column for column in REQUIRED_COLUMNS if column not in present]
+
+
+def _text(row, column):
+    value = row.get(column)
+    return "" if value is None else str(value).strip()
+
+
+def _boolean(row, column, default):
+    value = _text(row, column).lower()
+    if not value:
+        return default
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f"{column}: '{value}' is not a boolean")
+
+
+def parse_row(row, units):
+    """
+    Turn one raw row (column -> cell value) into a clean record, raising
+    ValueError with a readable message when the row is invalid. `units` maps
+    accepted unit spellings (codes and labels, lower-cased) to unit codes.
+    """
+    for column in REQUIRED_COLUMNS:
+        if not _text(row, column):
+            raise ValueError(f"{column}: this field is required")
+
+    name = _text(row, "name")
+    if len(name) > NAME_MAX_LENGTH:
+        raise ValueError(f"name: longer than {NAME_MAX_LENGTH} characters")
+    batch_number = _text(row, "batch_number")
+    if len(batch_number) > BATCH_NUMBER_MAX_LENGTH:
+        raise ValueError(f"batch_number: longer than {BATCH_NUMBER_MAX_LENGTH} characters")
+
+    try:
+        price = Decimal(_text(row, "price")).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        raise ValueError(f"price: '{_text(row, 'price')}' is not a number")
+    if price < 0 or price >= PRICE_LIMIT:
+        raise ValueError(f"price: {price} is out of range")
+
+    stock = _text(row, "stock_quantity") or "0"
+    try:
+        stock_quantity = int(Decimal(stock))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"stock_quantity: '{stock}' is not a whole number")
+    if stock_quantity < 0:
+        raise ValueError("stock_quantity: must not be negative")
+
+    unit = _text(row, "unit_of_measurement")
+    unit_of_measurement = units.get(unit.lower()) if unit else units[""]
+    if unit_of_measurement is None:
+        raise ValueError(f"unit_of_measurement: '{unit}' is not a valid unit")
+
+    references = {}
+    for column in ("generic_name", "category", "form", "manufacturer"):
+        value = _text(row, column)
+        if len(value) > REFERENCE_MAX_LENGTH:
+            raise ValueError(f"{column}: longer than {REFERENCE_MAX_LENGTH} characters")
+        references[column] = value or None
+
+    return {
+        "name": name,
+        "description": _text(row, "description"),
+        "price": price,
+        "batch_number": batch_number,
+        "stock_quantity": stock_quantity,
+        "unit_of_measurement": unit_of_measurement,
+        "prescription_required": _boolean(row, "prescription_required", False),
+        "is_available": _boolean(row, "is_available", True),
+        **references,
+    }
+
+
+def parse_chunk(first_row_number, rows, units):
+    """
+    Parse a chunk of raw rows. Returns (records, errors) where errors are
+    (row number, message) pairs; row numbers count data rows from 1.
+    """
+    records, errors = [], []
+    for row_number, row in enumerate(rows, start=first_row_number):
+        try:
+            records.append(parse_row(row, units))
+        except ValueError as e:
+            errors.append((row_number, str(e)))
+    return records, errors
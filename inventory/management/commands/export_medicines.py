@@ -0,0 +1,61 @@
+# inventory/management/commands/export_medicines.py
+import gzip
+import sys
+import time
+from django.core.management.base import BaseCommand
+from inventory.api.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_chunks
+
+
+class Command(BaseCommand):
+    help = "Export the full medicine catalog as NDJSON or CSV in constant memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=EXPORT_FORMATS, default="ndjson", dest="export_format"
+        )
+        parser.add_argument(
+            "--output", help="File to write to (defaults to stdout)", default=None
+        )
+        parser.add_argument(
+            "--gzip", action="store_true", dest="compress", help="Gzip-compress the output"
+        )
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, export_format, output, compress, chunk_size, **kwargs):
+        started = time.monotonic()
+        written = 0
+        with self.open_output(output, compress) as stream:
+            for chunk in export_chunks(export_format, chunk_size=chunk_size):
+                stream.write(chunk)
+                written += len(chunk)
+
+        if output:
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Exported {written} bytes of {export_format} to {output} in {elapsed:.1f}s"
+                )
+            )
+
+    def open_output(self, output, compress):
+        if output is None:
+            stream = sys.stdout.buffer
+            if compress:
+                return gzip.GzipFile(fileobj=stream, mode="wb")
+            return _NonClosing(stream)
+        if compress:
+            return gzip.open(output, "wb")
+        return open(output, "wb")
+
+
+class _NonClosing:
+    """Context manager around stdout that flushes instead of closing it."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __enter__(self):
+        return self.stream
+
+    def __exit__(self, *exc_info):
+        self.stream.flush()
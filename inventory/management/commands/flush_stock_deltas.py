@@ -0,0 +1,41 @@
+# inventory/management/commands/flush_stock_deltas.py
+import time
+from django.core.management.base import BaseCommand
+from inventory.api.reservations import flush_stock_deltas, release_expired_reservations
+
+
+class Command(BaseCommand):
+    help = (
+        "Return the units of expired reservations and write committed "
+        "reservations to the database in batched UPDATEs. Runs once, or every "
+        "--interval seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Seconds between flushes; 0 flushes once and exits",
+        )
+
+    def handle(self, *args, interval, **kwargs):
+        while True:
+            self.flush()
+            if interval <= 0:
+                return
+            time.sleep(interval)
+
+    def flush(self):
+        started = time.monotonic()
+        expired = release_expired_reservations()
+        updated, skipped = flush_stock_deltas()
+        if skipped:
+            self.stderr.write(
+                f"Kept {len(skipped)} deltas the database could not take as dead "
+                f"letters (see reconcile_stock): {', '.join(skipped[:20])}"
+            )
+        self.stdout.write(
+            f"Released {expired} expired reservations, updated stock of {updated} "
+            f"medicines in {time.monotonic() - started:.2f}s"
+        )
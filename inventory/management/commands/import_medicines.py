@@ -0,0 +1,311 @@
+# inventory/management/commands/import_medicines.py
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from inventory.api.stock import queue_live_stock_sync
+from inventory.import_parsing import check_header, parse_chunk
+from inventory.models import (
+    MedicineDetail,
+    GenericName,
+    MedicineCategory,
+    MedicineForm,
+    Manufacturer,
+    FormType,
+    UnitOfMeasurement,
+)
+from inventory.signals import invalidate_all_medicine_caches, suspend_cache_invalidation
+
+try:
+    import openpyxl
+except ImportError:  # openpyxl is optional, only needed for .xlsx files
+    openpyxl = None
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 20
+
+# Reference tables resolved by name: column -> (model, lookup field)
+REFERENCE_MODELS = {
+    "generic_name": (GenericName, "name"),
+    "category": (MedicineCategory, "name"),
+    "form": (MedicineForm, "form_type"),
+    "manufacturer": (Manufacturer, "name"),
+}
+
+# Columns overwritten when a batch number already exists. is_featured is left
+# out on purpose: featuring is an editorial decision made through the API.
+UPSERT_FIELDS = [
+    "name",
+    "description",
+    "price",
+    "stock_quantity",
+    "unit_of_measurement",
+    "prescription_required",
+    "is_available",
+    "generic_name",
+    "category",
+    "form",
+    "manufacturer",
+    "search_content",
+    "updated_at",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a CSV/XLSX medicine catalog, upserting by batch number. Rows are "
+        "parsed in a process pool and written in chunks; interrupted runs can be "
+        "resumed from the checkpoint file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or XLSX file to import")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Parser processes (0 parses in the main process)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=None,
+            help="Checkpoint file (defaults to <path>.checkpoint)",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the rows already imported according to the checkpoint",
+        )
+
+    def handle(self, *args, path, chunk_size, workers, checkpoint, resume, **kwargs):
+        if not os.path.exists(path):
+            raise CommandError(f"File not found: {path}")
+        checkpoint = checkpoint or f"{path}.checkpoint"
+        skip = self.read_checkpoint(checkpoint, path) if resume else 0
+        if skip:
+            self.stdout.write(f"Resuming after {skip} rows")
+
+        self.references = {
+            column: self.load_reference_map(model, field)
+            for column, (model, field) in REFERENCE_MODELS.items()
+        }
+        self.form_codes = {str(label).lower(): code for code, label in FormType.choices}
+        units = {"": UnitOfMeasurement.TABLET.value}
+        for value, label in UnitOfMeasurement.choices:
+            units[value.lower()] = value
+            units[str(label).lower()] = value
+
+        started = time.monotonic()
+        done, imported, errors = skip, 0, []
+        # Writes below skip the per-row signals; the cache is cleared once at the end
+        with suspend_cache_invalidation():
+            for row_count, records, chunk_errors in self.parsed_chunks(
+                path, skip, chunk_size, workers, units
+            ):
+                imported += self.write_chunk(records)
+                errors.extend(chunk_errors)
+                done += row_count
+                self.write_checkpoint(checkpoint, path, done)
+
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"{done} rows processed, {imported} imported "
+                    f"({(done - skip) / elapsed:.0f} rows/s)"
+                )
+
+        invalidate_all_medicine_caches()
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        for row_number, message in errors[:MAX_REPORTED_ERRORS]:
+            self.stderr.write(f"Row {row_number}: {message}")
+        if len(errors) > MAX_REPORTED_ERRORS:
+            self.stderr.write(f"... and {len(errors) - MAX_REPORTED_ERRORS} more invalid rows")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} medicines ({len(errors)} invalid rows skipped) "
+                f"in {elapsed:.1f}s, {(done - skip) / max(elapsed, 1e-9):.0f} rows/s"
+            )
+        )
+
+    # Reading
+
+    def iter_rows(self, path):
+        """Stream the file as column -> value dicts, validating the header first."""
+        if path.lower().endswith(".xlsx"):
+            yield from self.iter_xlsx_rows(path)
+            return
+        with open(path, newline="", encoding="utf-8-sig") as handle:
+            reader = csv.DictReader(handle)
+            self.check_columns(reader.fieldnames or [])
+            yield from reader
+
+    def iter_xlsx_rows(self, path):
+        if openpyxl is None:
+            raise CommandError("Importing .xlsx files requires openpyxl.")
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(cell).strip() if cell is not None else None for cell in next(rows, ())]
+            self.check_columns(header)
+            for values in rows:
+                if any(value is not None for value in values):
+                    yield dict(zip(header, values))
+        finally:
+            workbook.close()
+
+    def check_columns(self, header):
+        missing = check_header(header)
+        if missing:
+            raise CommandError(f"Missing required columns: {', '.join(missing)}")
+
+    def iter_chunks(self, path, skip, chunk_size):
+        """Yield (first row number, rows) chunks, after skipping `skip` data rows."""
+        chunk = []
+        first_row_number = skip + 1
+        for row_number, row in enumerate(self.iter_rows(path), start=1):
+            if row_number <= skip:
+                continue
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield first_row_number, chunk
+                first_row_number += len(chunk)
+                chunk = []
+        if chunk:
+            yield first_row_number, chunk
+
+    def parsed_chunks(self, path, skip, chunk_size, workers, units):
+        """
+        Yield (row count, records, errors) per chunk, in file order. With
+        workers, at most two chunks per worker are in flight, so memory stays
+        bounded and the checkpoint always covers a contiguous prefix.
+        """
+        chunks = self.iter_chunks(path, skip, chunk_size)
+        if workers <= 0:
+            for first_row_number, rows in chunks:
+                yield (len(rows), *parse_chunk(first_row_number, rows, units))
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for first_row_number, rows in chunks:
+                pending.append(
+                    (len(rows), executor.submit(parse_chunk, first_row_number, rows, units))
+                )
+                if len(pending) >= workers * 2:
+                    row_count, future = pending.popleft()
+                    yield (row_count, *future.result())
+            while pending:
+                row_count, future = pending.popleft()
+                yield (row_count, *future.result())
+
+    # Writing
+
+    def load_reference_map(self, model, field):
+        return {value: pk for value, pk in model.objects.values_list(field, "pk")}
+
+    def reference_key(self, column, value):
+        if column == "form":
+            # Forms are stored by code; accept the display label as well
+            return self.form_codes.get(value.lower(), value)
+        return value
+
+    def resolve_references(self, records):
+        """Map reference names to ids, creating the missing ones in bulk."""
+        for column, (model, field) in REFERENCE_MODELS.items():
+            mapping = self.references[column]
+            for record in records:
+                if record[column] is not None:
+                    record[column] = self.reference_key(column, record[column])
+            missing = {
+                record[column]
+                for record in records
+                if record[column] is not None and record[column] not in mapping
+            }
+            if missing:
+                model.objects.bulk_create(
+                    [model(**{field: value}) for value in missing], ignore_conflicts=True
+                )
+                # ignore_conflicts leaves pks unset on some backends, so read them back
+                mapping.update(
+                    model.objects.filter(**{f"{field}__in": missing}).values_list(field, "pk")
+                )
+
+    def write_chunk(self, records):
+        """Upsert a chunk by batch number in one transaction; returns rows written."""
+        # The last row wins when a batch number repeats within the chunk
+        records = list({record["batch_number"]: record for record in records}.values())
+        if not records:
+            return 0
+
+        with transaction.atomic():
+            # Stock of the rows about to be overwritten, for reservations'
+            # live stock; locked so no flush changes it in between
+            rows = (
+                MedicineDetail.objects.select_for_update()
+                .filter(batch_number__in=[record["batch_number"] for record in records])
+                .values_list("batch_number", "pk", "stock_quantity")
+            )
+            existing, previous = {}, {}
+            for batch_number, pk, stock in rows:
+                existing[batch_number] = str(pk)
+                previous[str(pk)] = stock
+            self.resolve_references(records)
+            medicines = []
+            for record in records:
+                generic_name = record.pop("generic_name")
+                medicine = MedicineDetail(
+                    generic_name_id=self.references["generic_name"][generic_name],
+                    category_id=self.references["category"][record.pop("category")],
+                    form_id=self.references["form"][record.pop("form")],
+                    manufacturer_id=self.references["manufacturer"].get(
+                        record.pop("manufacturer")
+                    ),
+                    search_content=f"{record['name']} {generic_name}",
+                    **record,
+                )
+                medicines.append(medicine)
+
+            options = {"update_conflicts": True, "update_fields": UPSERT_FIELDS}
+            # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target
+            if connection.features.supports_update_conflicts_with_target:
+                options["unique_fields"] = ["batch_number"]
+            MedicineDetail.objects.bulk_create(medicines, **options)
+            queue_live_stock_sync(
+                previous,
+                {
+                    existing[medicine.batch_number]: medicine.stock_quantity
+                    for medicine in medicines
+                    if medicine.batch_number in existing
+                },
+            )
+        return len(medicines)
+
+    # Checkpoints
+
+    def read_checkpoint(self, checkpoint, path):
+        if not os.path.exists(checkpoint):
+            return 0
+        with open(checkpoint) as handle:
+            state = json.load(handle)
+        if state.get("path") != os.path.abspath(path) or state.get("size") != os.path.getsize(path):
+            raise CommandError(f"Checkpoint {checkpoint} belongs to a different file.")
+        return state["rows_done"]
+
+    def write_checkpoint(self, checkpoint, path, rows_done):
+        state = {
+            "path": os.path.abspath(path),
+            "size": os.path.getsize(path),
+            "rows_done": rows_done,
+        }
+        temporary = f"{checkpoint}.tmp"
+        with open(temporary, "w") as handle:
+            json.dump(state, handle)
+        os.replace(temporary, checkpoint)  # Atomic, so a crash never leaves half a file
@@ -0,0 +1,49 @@
+# inventory/management/commands/reconcile_stock.py
+from django.core.management.base import BaseCommand
+from inventory.api import live_stock
+from inventory.api.reservations import reconcile_stock
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the live stock used by reservations with the database and "
+        "repair any drift. Lists committed deltas no flush could write, and "
+        "requeues them with --requeue-dead once their stock is fixed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report drift without repairing it"
+        )
+        parser.add_argument(
+            "--requeue-dead",
+            nargs="*",
+            metavar="ID",
+            help="Move the dead-lettered deltas of these medicines (all without ids) "
+            "back to pending for the next flush",
+        )
+
+    def handle(self, *args, dry_run, requeue_dead, **kwargs):
+        if requeue_dead is not None and not dry_run:
+            requeued = live_stock.requeue_dead_deltas(
+                requeue_dead or list(live_stock.dead_deltas())
+            )
+            for pk, delta in requeued.items():
+                self.stdout.write(f"{pk}: requeued delta {delta}")
+
+        drift, unchecked = reconcile_stock(dry_run=dry_run)
+        for pk, live, expected in drift:
+            if expected is None:
+                self.stdout.write(f"{pk}: medicine no longer exists")
+            else:
+                self.stdout.write(f"{pk}: live stock {live}, expected {expected}")
+        if unchecked:
+            self.stderr.write(
+                f"{len(unchecked)} medicines changed while being checked; run again"
+            )
+
+        for pk, delta in live_stock.dead_deltas().items():
+            self.stderr.write(f"{pk}: delta {delta} could not be written to the database")
+
+        action = "Found" if dry_run else "Repaired"
+        self.stdout.write(self.style.SUCCESS(f"{action} drift on {len(drift)} medicines"))
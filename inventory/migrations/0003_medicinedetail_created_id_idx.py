@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0002_medicinedetail_search_content"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="medicinedetail",
+            index=models.Index(
+                fields=["created_at", "id"], name="medicine_created_id_idx"
+            ),
+        ),
+    ]
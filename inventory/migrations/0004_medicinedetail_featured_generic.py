@@ -0,0 +1,50 @@
+# Generated by Django 5.1.2 on 2026-10-19 18:02
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def unfeature_duplicates(apps, schema_editor):
+    """Keep only the most recently updated featured medicine per generic name."""
+    MedicineDetail = apps.get_model("inventory", "MedicineDetail")
+    duplicates = (
+        MedicineDetail.objects.filter(is_featured=True)
+        .values("generic_name")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+    )
+    for duplicate in duplicates:
+        featured = MedicineDetail.objects.filter(
+            generic_name=duplicate["generic_name"], is_featured=True
+        ).order_by("-updated_at", "-id")
+        keep = featured.first()
+        featured.exclude(pk=keep.pk).update(is_featured=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0003_medicinedetail_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(unfeature_duplicates, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name="medicinedetail",
+            name="featured_generic",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(is_featured=True, then=models.F("generic_name")),
+                    default=None,
+                ),
+                output_field=models.BigIntegerField(null=True),
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="medicinedetail",
+            constraint=models.UniqueConstraint(
+                fields=("featured_generic",), name="medicine_featured_generic_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Min, Q, Sum
+
+
+def build_summaries(apps, schema_editor):
+    """Summarise the existing medicines; later writes keep the rows current."""
+    MedicineDetail = apps.get_model("inventory", "MedicineDetail")
+    StockSummary = apps.get_model("inventory", "StockSummary")
+    groups = (
+        MedicineDetail.objects.order_by()
+        .values("generic_name_id", "category_id")
+        .annotate(
+            brand_count=Count("id"),
+            available_count=Count("id", filter=Q(is_available=True)),
+            total_stock=Sum("stock_quantity"),
+            min_price=Min("price"),
+        )
+    )
+    StockSummary.objects.bulk_create(
+        [StockSummary(**group) for group in groups.iterator()], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_medicinedetail_featured_generic'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('brand_count', models.PositiveIntegerField(default=0)),
+                ('available_count', models.PositiveIntegerField(default=0)),
+                ('total_stock', models.PositiveBigIntegerField(default=0)),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_summaries', to='inventory.medicinecategory')),
+                ('generic_name', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_summaries', to='inventory.genericname')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['total_stock'], name='stock_summary_total_stock_idx')],
+                'constraints': [models.UniqueConstraint(fields=('generic_name', 'category'), name='stock_summary_generic_category_unique')],
+            },
+        ),
+        migrations.RunPython(build_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0005_stocksummary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='medicinedetail',
+            index=models.Index(fields=['price', 'id'], name='medicine_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicinedetail',
+            index=models.Index(fields=['name', 'id'], name='medicine_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicinedetail',
+            index=models.Index(fields=['is_available', 'category', 'created_at'], name='medicine_avail_cat_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicinedetail',
+            index=models.Index(fields=['generic_name', 'price'], name='medicine_generic_price_idx'),
+        ),
+    ]
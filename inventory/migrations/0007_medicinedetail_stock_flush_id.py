@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0006_medicinedetail_sort_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='medicinedetail',
+            name='stock_flush_id',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -111,7 +111,9 @@ class Manufacturer(models.Model):
         return self.name
 
 
-from django.core.exceptions import ValidationError
+from contextlib import nullcontext
+from django.db import IntegrityError, router, transaction
+from .exceptions import FeaturedMedicineInvalidError
 
 
 class MedicineDetail(models.Model):
@@ -147,25 +149,49 @@ class MedicineDetail(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     search_content = models.TextField(blank=True, editable=False)
-
-    def clean(self):
-        # Check if another featured medicine exists with the same generic name
-        if self.is_featured:
-            existing_featured = MedicineDetail.objects.filter(
-                generic_name=self.generic_name, is_featured=True
-            ).exclude(
-                id=self.id
-            )  # Exclude self in case of update
-            if existing_featured.exists():
-                raise ValidationError(
-                    f"There can only be one featured medicine for the generic name '{self.generic_name}'."
-                )
+    # The reservation flush (inventory/api/reservations.py) that last wrote
+    # to stock_quantity, set by the same UPDATE. A flush retried after dying
+    # before it cleared its deltas in Redis skips the rows it already wrote.
+    stock_flush_id = models.UUIDField(null=True, blank=True, editable=False)
+
+    # Generic name id of featured medicines, NULL otherwise. Its unique
+    # constraint enforces one featured medicine per generic name in the
+    # database (MySQL has no partial unique indexes; NULLs never collide).
+    featured_generic = models.GeneratedField(
+        expression=models.Case(
+            models.When(is_featured=True, then=models.F("generic_name")),
+            default=None,
+        ),
+        output_field=models.BigIntegerField(null=True),
+        db_persist=True,
+    )
 
     def save(self, *args, **kwargs):
         # Populate search_content with concatenated values
         self.search_content = f"{self.name} {self.generic_name.name}"
-        self.full_clean()  # Validate before saving
-        super().save(*args, **kwargs)
+        # The featured rule is the only constraint and the database enforces
+        # it, so validation skips its query; batch numbers are still checked.
+        # Related rows are left to the foreign keys (manufacturer is optional).
+        self.full_clean(
+            exclude=["generic_name", "category", "form", "manufacturer"],
+            validate_constraints=False,
+        )
+        using = kwargs.get("using") or router.db_for_write(MedicineDetail, instance=self)
+        # Inside a transaction a savepoint keeps it usable after a violation;
+        # in autocommit the failed statement rolls back on its own
+        if transaction.get_connection(using).in_atomic_block:
+            savepoint = transaction.atomic(using=using)
+        else:
+            savepoint = nullcontext()
+        try:
+            with savepoint:
+                super().save(*args, **kwargs)
+        except IntegrityError as e:
+            # SQLite names the column, MySQL and PostgreSQL the constraint;
+            # both contain "featured_generic"
+            if "featured_generic" in str(e):
+                raise FeaturedMedicineInvalidError()
+            raise
 
     def __str__(self):
         return f"{self.name} ({self.generic_name.name})"
@@ -173,6 +199,58 @@ class MedicineDetail(models.Model):
     class Meta:
         ordering = ["-created_at"]
         unique_together = ("name", "batch_number")
+        indexes = [
+            # Keyset pagination seeks on (created_at, id)
+            models.Index(fields=["created_at", "id"], name="medicine_created_id_idx"),
+            # Allow-listed sort keys and filters (inventory/api/filters.py)
+            models.Index(fields=["price", "id"], name="medicine_price_id_idx"),
+            models.Index(fields=["name", "id"], name="medicine_name_id_idx"),
+            models.Index(
+                fields=["is_available", "category", "created_at"],
+                name="medicine_avail_cat_created_idx",
+            ),
+            models.Index(fields=["generic_name", "price"], name="medicine_generic_price_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["featured_generic"], name="medicine_featured_generic_unique"
+            ),
+        ]
+
+
+class StockSummary(models.Model):
+    """
+    Brand count, availability, stock and lowest price of one generic name
+    within one category; the per-generic figures are the sums over its rows.
+    Kept up to date by the medicine write paths (see
+    inventory/stock_summary.py), so dashboards never aggregate MedicineDetail.
+    """
+
+    generic_name = models.ForeignKey(
+        GenericName, on_delete=models.CASCADE, related_name="stock_summaries"
+    )
+    category = models.ForeignKey(
+        MedicineCategory, on_delete=models.CASCADE, related_name="stock_summaries"
+    )
+    brand_count = models.PositiveIntegerField(default=0)
+    available_count = models.PositiveIntegerField(default=0)
+    total_stock = models.PositiveBigIntegerField(default=0)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["generic_name", "category"], name="stock_summary_generic_category_unique"
+            ),
+        ]
+        indexes = [
+            # Low-stock queries filter and sort on total stock
+            models.Index(fields=["total_stock"], name="stock_summary_total_stock_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.generic_name_id}/{self.category_id}: {self.total_stock}"
 
 
 class PracticeUpdate(models.Model):
@@ -1,58 +1,351 @@
 # inventory/signals.py
 
 import logging
-from django.db.models.signals import post_save, post_delete
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+)
 from django.dispatch import receiver
-from inventory.models import MedicineDetail
+from inventory.cache_keys import (
+    CONDITION_MEDICINES_CACHE_KEY_TEMPLATE,
+    CONDITION_VERSION_KEY_TEMPLATE,
+    MEDICINE_DETAIL_CACHE_KEY_TEMPLATE,
+    MEDICINE_ITEM_CACHE_KEY_TEMPLATE,
+    MEDICINE_LIST_GENERATION_KEY,
+    REFERENCE_DATA_VERSION_KEY,
+    SEARCH_CACHE_KEY_TEMPLATE,
+    STOCK_SUMMARY_VERSION_KEY,
+)
+from inventory.models import (
+    MedicineDetail,
+    Condition,
+    GenericName,
+    MedicineCategory,
+    MedicineForm,
+    Manufacturer,
+)
+from inventory.stock_summary import rebuild_stock_summaries, refresh_stock_summaries
 from utils.redis_cache import RedisCache
 
 cache_manager = RedisCache()
 app_logger = logging.getLogger("app_logger")
+error_logger = logging.getLogger("error_logger")
 
-# Define cache keys and lock templates
-MEDICINE_LIST_CACHE_KEY = "medicine_list"
-MEDICINE_DETAIL_CACHE_KEY_TEMPLATE = "medicine_detail_{}"
-SEARCH_CACHE_KEY_TEMPLATE = "medicine_search_{}"
-LOCK_KEY_TEMPLATE = "lock_key_{}"
+# Fields whose changes make cached responses stale. updated_at alone changes
+# on every save, and search_content and generated columns are derived, so
+# none of them count.
+CACHED_FIELDS = [
+    field
+    for field in MedicineDetail._meta.concrete_fields
+    if field.name not in ("updated_at", "search_content") and not field.generated
+]
+CACHED_ATTNAMES = tuple(field.attname for field in CACHED_FIELDS)
+CACHED_FIELD_NAMES = {field.name for field in CACHED_FIELDS} | set(CACHED_ATTNAMES)
 
+# Fields the stock summary is computed from (see inventory/stock_summary.py)
+SUMMARY_ATTNAMES = ("generic_name_id", "category_id", "price", "stock_quantity", "is_available")
 
-def invalidate_cache_for_medicine(instance):
-    list_lock = cache_manager.acquire_lock(MEDICINE_LIST_CACHE_KEY)
-    detail_lock = cache_manager.acquire_lock(
-        MEDICINE_DETAIL_CACHE_KEY_TEMPLATE.format(instance.id)
+# Set while bulk writers handle invalidation themselves in one pass
+_invalidation_suspended = ContextVar("medicine_invalidation_suspended", default=False)
+
+
+@contextmanager
+def suspend_cache_invalidation():
+    """Skip the per-row signal invalidation for writes made inside the block."""
+    token = _invalidation_suspended.set(True)
+    try:
+        yield
+    finally:
+        _invalidation_suspended.reset(token)
+
+
+def invalidate_cache_for_medicines(ids, condition_ids=(), counters=()):
+    """
+    Coalesced invalidation for a batch of medicines: every detail/item key
+    and the id lists of the conditions they joined or left go in one
+    pipelined round trip, together with the list generation bump, which
+    retires every cached list and search page, the bumps of those
+    conditions' versions, which stop rebuilds already in flight, and any
+    other `counters`.
+    """
+    keys = []
+    for medicine_id in ids:
+        keys.append(MEDICINE_DETAIL_CACHE_KEY_TEMPLATE.format(medicine_id))
+        keys.append(MEDICINE_ITEM_CACHE_KEY_TEMPLATE.format(medicine_id))
+    condition_versions = []
+    for condition_id in set(condition_ids):
+        keys.append(CONDITION_MEDICINES_CACHE_KEY_TEMPLATE.format(condition_id))
+        condition_versions.append(CONDITION_VERSION_KEY_TEMPLATE.format(condition_id))
+
+    app_logger.info("Invalidating cache for %s medicines in one pass", len(ids))
+    cache_manager.invalidate(
+        keys, counters=[MEDICINE_LIST_GENERATION_KEY, *condition_versions, *counters]
     )
 
+
+class PendingInvalidation:
+    """
+    Medicine ids, condition ids, reference data changes and stock
+    summaries to refresh, waiting for the transaction to commit.
+    """
+
+    def __init__(self, hooks):
+        # The connection's on-commit callbacks when the set was started.
+        # Commits and rollbacks replace that list, which retires the set.
+        self.hooks = hooks
+        self.ids = set()
+        self.condition_ids = set()
+        self.stock_ids = set()
+        self.reference_data = False
+        self.summary_generic_ids = set()
+        self.summary_medicine_ids = set()
+
+    def drain(self):
+        drained = (self.ids, self.condition_ids, self.stock_ids, self.reference_data)
+        self.ids, self.condition_ids, self.stock_ids = set(), set(), set()
+        self.reference_data = False
+        return drained
+
+    def drain_summaries(self):
+        drained = (self.summary_generic_ids, self.summary_medicine_ids)
+        self.summary_generic_ids, self.summary_medicine_ids = set(), set()
+        return drained
+
+    def schedule(self):
+        """Flush the set once the transaction commits; at once outside one."""
+        transaction.on_commit(self.flush)
+
+    def flush(self):
+        flush_pending_invalidation(self)
+
+
+def pending_invalidation():
+    """
+    The pending set of the current transaction on this thread's database
+    connection. A set left over from a transaction that rolled back, or
+    from a savepoint rolled back together with its flush callback, is
+    dropped rather than flushed with the next commit.
+    """
+    connection = transaction.get_connection()
+    pending = getattr(connection, "_medicine_pending_invalidation", None)
+    if pending is None or pending.hooks is not connection.run_on_commit:
+        pending = PendingInvalidation(connection.run_on_commit)
+        connection._medicine_pending_invalidation = pending
+    return pending
+
+
+def flush_pending_invalidation(pending):
+    # Every write in the transaction scheduled a flush; the first one to run
+    # flushes the whole de-duplicated set and the rest find it empty.
+    ids, condition_ids, stock_ids, reference_data = pending.drain()
+    generic_ids, medicine_ids = pending.drain_summaries()
+    # Refreshed summaries retire their cached reports with the same round trip
+    counters = []
+    if generic_ids or medicine_ids:
+        update_stock_summaries(generic_ids, medicine_ids)
+        counters.append(STOCK_SUMMARY_VERSION_KEY)
+    if reference_data:
+        invalidate_reference_data()
+    if ids or condition_ids:
+        invalidate_cache_for_medicines(sorted(ids, key=str), condition_ids, counters=counters)
+        counters = []
+    # Full invalidations above already cover these
+    stock_ids -= ids
+    if stock_ids or counters:
+        invalidate_medicine_keys(sorted(stock_ids, key=str), counters=counters)
+
+
+def queue_invalidation(ids, condition_ids=(), generic_ids=()):
+    """
+    Collect invalidations for the current transaction and flush them once,
+    as one pipelined call, after commit. Nothing reaches Redis before the
+    data is visible, and rolled back transactions never invalidate. Outside
+    a transaction the flush happens immediately. The stock summaries of
+    `generic_ids` are refreshed at the same point.
+    """
+    pending = pending_invalidation()
+    pending.ids.update(ids)
+    pending.condition_ids.update(condition_ids)
+    pending.summary_generic_ids.update(generic_ids)
+    pending.schedule()
+
+
+def queue_stock_invalidation(ids):
+    """
+    Drop only the per-medicine keys of `ids` once the transaction commits.
+    For stock-only changes: lists keep serving their cached pages, whose
+    stock figures may lag until the pages expire. The stock summaries of
+    their generic names are refreshed.
+    """
+    ids = set(ids)
+    pending = pending_invalidation()
+    pending.stock_ids.update(ids)
+    pending.summary_medicine_ids.update(ids)
+    pending.schedule()
+
+
+def queue_reference_data_invalidation():
+    """Bump the reference data version once the transaction commits."""
+    pending = pending_invalidation()
+    pending.reference_data = True
+    pending.schedule()
+
+
+def update_stock_summaries(generic_ids, medicine_ids):
     try:
-        app_logger.info("Invalidating medicine list cache")
-        cache_manager.delete(MEDICINE_LIST_CACHE_KEY)
+        refresh_stock_summaries(generic_ids, medicine_ids)
+    except Exception as e:
+        # The write itself is committed; `rebuild_stock_summary` repairs this
+        error_logger.error("Stock summary refresh failed: %s", e)
 
-        app_logger.info(f"Invalidating detail cache for medicine ID: {instance.id}")
-        cache_manager.delete(MEDICINE_DETAIL_CACHE_KEY_TEMPLATE.format(instance.id))
 
-        query_terms = [instance.name, instance.generic_name.name]
-        for term in query_terms:
-            search_cache_key = SEARCH_CACHE_KEY_TEMPLATE.format(term)
-            app_logger.info(f"Invalidating search cache for term: {term}")
-            cache_manager.delete(search_cache_key)
+def cached_field_values(instance):
+    """Loaded values of the fields that cached responses are built from."""
+    values = instance.__dict__
+    return {attname: values[attname] for attname in CACHED_ATTNAMES if attname in values}
 
-        app_logger.info("Cache invalidated for medicine and related keys.")
 
-    finally:
-        # Release locks
-        if list_lock:
-            cache_manager.release_lock(list_lock)
-        if detail_lock:
-            cache_manager.release_lock(detail_lock)
+def cached_fields_changed(instance, update_fields=None):
+    if update_fields is not None and not CACHED_FIELD_NAMES.intersection(update_fields):
+        return False
+    previous = getattr(instance, "_cached_field_values", None)
+    return previous is None or cached_field_values(instance) != previous
+
+
+def invalidate_medicine_keys(ids, counters=()):
+    """
+    Delete the detail and item keys of `ids`, leaving lists and searches
+    alone, and bump `counters` in the same round trip.
+    """
+    keys = []
+    for medicine_id in ids:
+        keys.append(MEDICINE_DETAIL_CACHE_KEY_TEMPLATE.format(medicine_id))
+        keys.append(MEDICINE_ITEM_CACHE_KEY_TEMPLATE.format(medicine_id))
+    app_logger.info("Invalidating detail cache for %s medicines", len(ids))
+    cache_manager.invalidate(keys, counters=list(counters))
+
+
+def invalidate_reference_data():
+    """
+    Retire every cached reference list, the bootstrap snapshot and their
+    ETags. Medicine lists embed reference names, so they are retired too.
+    """
+    app_logger.info("Invalidating reference data caches")
+    cache_manager.invalidate(
+        [], counters=[REFERENCE_DATA_VERSION_KEY, MEDICINE_LIST_GENERATION_KEY]
+    )
+
+
+def invalidate_all_medicine_caches():
+    """
+    Catalog-wide invalidation after an import touched an unknown set of rows.
+    The stock summaries are rebuilt for the same reason.
+    """
+    app_logger.info("Invalidating every cached medicine entry")
+    rebuild_stock_summaries()
+    # Imports may also have created reference data
+    cache_manager.invalidate(
+        [],
+        counters=[
+            MEDICINE_LIST_GENERATION_KEY,
+            REFERENCE_DATA_VERSION_KEY,
+            STOCK_SUMMARY_VERSION_KEY,
+        ],
+    )
+    for template in (
+        MEDICINE_DETAIL_CACHE_KEY_TEMPLATE,
+        MEDICINE_ITEM_CACHE_KEY_TEMPLATE,
+        SEARCH_CACHE_KEY_TEMPLATE,
+        CONDITION_MEDICINES_CACHE_KEY_TEMPLATE,
+    ):
+        cache_manager.delete_pattern(template.format("*"))
+
 
+@receiver(post_init, sender=MedicineDetail)
+def remember_cached_fields(sender, instance, **kwargs):
+    instance._cached_field_values = cached_field_values(instance)
 
 
 @receiver(post_save, sender=MedicineDetail)
-def invalidate_cache_on_save(sender, instance, **kwargs):
-    app_logger.info(f"Triggered post_save for MedicineDetail with ID {instance.id}")
-    invalidate_cache_for_medicine(instance)
+def invalidate_cache_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if _invalidation_suspended.get():
+        return
+    if not created and not cached_fields_changed(instance, update_fields):
+        app_logger.info("No cached fields changed for MedicineDetail %s, skipping invalidation", instance.id)
+        return
+    app_logger.info("Triggered post_save for MedicineDetail with ID %s", instance.id)
+
+    # The previous generic name's summary loses the medicine when it moves
+    previous = instance._cached_field_values
+    generic_ids = ()
+    if created or any(
+        previous.get(attname) != getattr(instance, attname) for attname in SUMMARY_ATTNAMES
+    ):
+        generic_ids = {instance.generic_name_id, previous.get("generic_name_id")} - {None}
+    queue_invalidation([instance.id], generic_ids=generic_ids)
+    instance._cached_field_values = cached_field_values(instance)
+
+
+@receiver(pre_delete, sender=MedicineDetail)
+def remember_conditions(sender, instance, **kwargs):
+    # The join rows are gone by post_delete, so read them while they exist
+    if _invalidation_suspended.get():
+        return
+    instance._condition_ids = list(instance.conditions.values_list("pk", flat=True))
 
 
 @receiver(post_delete, sender=MedicineDetail)
 def invalidate_cache_on_delete(sender, instance, **kwargs):
-    app_logger.info(f"Triggered post_delete for MedicineDetail with ID {instance.id}")
-    invalidate_cache_for_medicine(instance)
+    if _invalidation_suspended.get():
+        return
+    app_logger.info("Triggered post_delete for MedicineDetail with ID %s", instance.id)
+    queue_invalidation(
+        [instance.id], getattr(instance, "_condition_ids", ()), [instance.generic_name_id]
+    )
+
+
+@receiver(m2m_changed, sender=MedicineDetail.conditions.through)
+def invalidate_cache_on_conditions_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if _invalidation_suspended.get() or action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if action == "pre_clear":
+        # clear() reports no pk_set, so read the rows it is about to remove
+        related = instance.medications if reverse else instance.conditions
+        pk_set = set(related.values_list("pk", flat=True))
+    if not pk_set:
+        return
+    app_logger.info("Triggered %s on medicine conditions for %s", action, instance.pk)
+
+    # Forward changes come from a medicine, reverse ones from a condition
+    if reverse:
+        queue_invalidation(pk_set, [instance.pk])
+    else:
+        queue_invalidation([instance.pk], pk_set)
+
+
+@receiver(pre_delete, sender=Condition)
+def invalidate_cache_on_condition_delete(sender, instance, **kwargs):
+    if _invalidation_suspended.get():
+        return
+    # Medicines listing the condition lose it with the join rows
+    medicine_ids = list(instance.medications.values_list("pk", flat=True))
+    app_logger.info("Triggered pre_delete for Condition with ID %s", instance.pk)
+    queue_invalidation(medicine_ids, [instance.pk])
+
+
+def invalidate_reference_data_on_change(sender, instance, **kwargs):
+    app_logger.info("Reference data changed: %s %s", sender.__name__, instance.pk)
+    queue_reference_data_invalidation()
+
+
+for reference_model in (GenericName, MedicineCategory, MedicineForm, Manufacturer):
+    post_save.connect(invalidate_reference_data_on_change, sender=reference_model)
+    post_delete.connect(invalidate_reference_data_on_change, sender=reference_model)
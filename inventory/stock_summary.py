@@ -0,0 +1,90 @@
+# inventory/stock_summary.py
+"""
+Maintenance of the StockSummary table: one row per (generic name, category)
+with its brand count, available brands, total stock and lowest price. The
+per-category report reads the rows as they are; the per-generic report adds
+up each generic name's rows before filtering on availability or stock.
+
+Writes never adjust the counters in place. Instead, after commit, every
+generic name a write touched is summarised again from its own medicines (an
+indexed GROUP BY over a handful of rows) and the result is upserted. This
+stays correct for price and availability changes, moves between generic
+names or categories, and deletes. `rebuild_stock_summaries` redoes the whole
+table, for imports and repairs.
+"""
+import logging
+from django.db import connection, transaction
+from django.db.models import Count, Min, Q, Sum
+from .models import GenericName, MedicineDetail, StockSummary
+
+app_logger = logging.getLogger("app_logger")
+
+SUMMARY_FIELDS = ("brand_count", "available_count", "total_stock", "min_price")
+REBUILD_BATCH_SIZE = 1000
+
+
+def summarise(queryset):
+    """Summary values per (generic name, category) of the medicines in `queryset`."""
+    return (
+        queryset.order_by()
+        .values("generic_name_id", "category_id")
+        .annotate(
+            brand_count=Count("id"),
+            available_count=Count("id", filter=Q(is_available=True)),
+            total_stock=Sum("stock_quantity"),
+            min_price=Min("price"),
+        )
+    )
+
+
+def refresh_stock_summaries(generic_ids=(), medicine_ids=()):
+    """
+    Summarise the given generic names, and those of the given medicines,
+    again. Locking the generic name rows serialises refreshes of the same
+    generic, so a slower refresh can never overwrite a newer one.
+    """
+    generic_ids = set(generic_ids)
+    if medicine_ids:
+        generic_ids.update(
+            MedicineDetail.objects.filter(pk__in=list(medicine_ids)).values_list(
+                "generic_name_id", flat=True
+            )
+        )
+    if not generic_ids:
+        return
+
+    with transaction.atomic():
+        generic_ids = list(
+            GenericName.objects.select_for_update()
+            .filter(pk__in=generic_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        summaries = [
+            StockSummary(**group)
+            for group in summarise(MedicineDetail.objects.filter(generic_name_id__in=generic_ids))
+        ]
+        if summaries:
+            options = {"update_conflicts": True, "update_fields": [*SUMMARY_FIELDS, "updated_at"]}
+            # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target
+            if connection.features.supports_update_conflicts_with_target:
+                options["unique_fields"] = ["generic_name", "category"]
+            StockSummary.objects.bulk_create(summaries, **options)
+        # Groups whose last medicine was deleted or moved away
+        kept = Q()
+        for summary in summaries:
+            kept |= Q(generic_name_id=summary.generic_name_id, category_id=summary.category_id)
+        StockSummary.objects.filter(generic_name_id__in=generic_ids).exclude(kept).delete()
+    app_logger.info("Refreshed stock summaries of %s generic names", len(generic_ids))
+
+
+def rebuild_stock_summaries():
+    """Replace the whole table with a fresh summary; returns the row count."""
+    with transaction.atomic():
+        StockSummary.objects.all().delete()
+        summaries = StockSummary.objects.bulk_create(
+            (StockSummary(**group) for group in summarise(MedicineDetail.objects.all()).iterator()),
+            batch_size=REBUILD_BATCH_SIZE,
+        )
+    app_logger.info("Rebuilt %s stock summaries", len(summaries))
+    return len(summaries)
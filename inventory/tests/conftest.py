@@ -0,0 +1,81 @@
+# inventory/tests/conftest.py
+from decimal import Decimal
+import pytest
+from django.contrib.auth.models import User
+from inventory.models import (
+    MedicineDetail,
+    GenericName,
+    MedicineCategory,
+    MedicineForm,
+    Manufacturer,
+)
+from inventory.signals import cache_manager, pending_invalidation
+
+# Reference rows the medicines point to, by the field naming them
+REFERENCE_MODELS = {
+    "generic_name": (GenericName, "name"),
+    "category": (MedicineCategory, "name"),
+    "form": (MedicineForm, "form_type"),
+    "manufacturer": (Manufacturer, "name"),
+}
+
+MEDICINE_DEFAULTS = {
+    "generic_name": "Omeprazole",
+    "category": "Antacid",
+    "form": "CAP",
+    "manufacturer": "Incepta Pharmaceuticals Ltd.",
+    "description": "Reduces stomach acid",
+    "price": Decimal("6.00"),
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Every test starts and ends with an empty Redis and nothing queued to invalidate."""
+    cache_manager.redis.flushdb()
+    pending_invalidation().drain()
+    pending_invalidation().drain_summaries()
+    yield
+    cache_manager.redis.flushdb()
+
+
+@pytest.fixture
+def make_medicines(db):
+    """
+    Create medicines named "<name> <index>" with batch numbers "SC<index>".
+    `fields` override MEDICINE_DEFAULTS for all of them and `rows` holds
+    per-medicine fields, one dict per medicine, in place of `count`.
+    References are given by name and created on first use.
+    """
+
+    def make(count=3, name="Seclo", rows=None, **fields):
+        created = []
+        for index, row in enumerate(rows or [{}] * count):
+            values = {
+                **MEDICINE_DEFAULTS,
+                "name": f"{name} {index}",
+                "batch_number": f"SC{index}",
+                **fields,
+                **row,
+            }
+            for field, (model, lookup) in REFERENCE_MODELS.items():
+                values[field], _ = model.objects.get_or_create(**{lookup: values[field]})
+            created.append(MedicineDetail.objects.create(**values))
+        return created
+
+    return make
+
+
+@pytest.fixture
+def medicines(make_medicines):
+    return make_medicines()
+
+
+@pytest.fixture
+def admin_client(request):
+    """The test module's `client`, authenticated as a superuser for the test."""
+    client = request.module.client
+    user = User.objects.create_superuser(username="admin", password="adminpass")
+    client.force_authenticate(user=user)
+    yield client
+    client.force_authenticate(user=None)
@@ -0,0 +1,170 @@
+from decimal import Decimal
+import json
+import pytest
+from unittest import mock
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.test import AsyncClient, override_settings
+from django.urls import path
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from inventory.api.async_views import async_read_view, read_view
+from inventory.api.views import MedicineDetailView, MedicineListView, MedicineSearchView
+from utils.db_router import replica_health
+from utils.redis_cache import RedisCache
+from django.contrib.auth.models import User
+
+# The read endpoints behind their async entry points, as with ASYNC_READ_VIEWS
+urlpatterns = [
+    path("api/medicines/", async_read_view(MedicineListView)),
+    path("api/medicines/<uuid:pk>/", async_read_view(MedicineDetailView)),
+    path("api/medicines/search/", async_read_view(MedicineSearchView)),
+]
+
+pytestmark = pytest.mark.urls(__name__)
+
+client = APIClient()
+async_client = AsyncClient()
+
+
+def async_get(path, **extra):
+    return async_to_sync(async_client.get)(path, **extra)
+
+
+@pytest.fixture(autouse=True)
+def clear_cookies():
+    # Writes pin the client to the primary with a cookie
+    async_client.cookies.clear()
+
+
+@pytest.fixture
+def medicines(make_medicines):
+    return make_medicines(
+        rows=[
+            {"name": name, "price": Decimal(price)}
+            for name, price in [("Napa", "1.20"), ("Ace", "1.00"), ("Xpa", "0.90")]
+        ],
+        generic_name="Paracetamol",
+        category="Analgesic",
+        form="TBL",
+        description="Pain reliever",
+    )
+
+
+@pytest.fixture
+def admin_token():
+    user = User.objects.create_superuser(username="admin", password="password123")
+    return str(RefreshToken.for_user(user).access_token)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query",
+    ["", "?ordering=price&fields=id,name,price", "?pagination=cursor&page_size=2"],
+)
+def test_async_list_matches_sync_view(medicines, query, django_assert_num_queries):
+    expected = client.get(f"/api/medicines/{query}")
+    RedisCache().redis.flushdb()
+
+    response = async_get(f"/api/medicines/{query}")
+    assert response.status_code == 200
+    assert json.loads(response.content) == expected.json()
+
+    # Replayed from Redis without touching the database
+    with django_assert_num_queries(0):
+        cached = async_get(f"/api/medicines/{query}")
+    assert cached.content == response.content
+
+
+@pytest.mark.django_db
+def test_async_detail_reads_with_the_async_orm(medicines, django_assert_num_queries):
+    medicine = medicines[0]
+    expected = client.get(f"/api/medicines/{medicine.pk}/")
+    RedisCache().redis.flushdb()
+
+    with django_assert_num_queries(2):
+        response = async_get(f"/api/medicines/{medicine.pk}/")
+    assert json.loads(response.content) == expected.json()
+
+    with django_assert_num_queries(0):
+        assert async_get(f"/api/medicines/{medicine.pk}/").content == response.content
+
+    missing = async_get("/api/medicines/00000000-0000-0000-0000-000000000000/")
+    assert missing.status_code == 404
+    assert json.loads(missing.content)["message"] == "Medicine not found."
+
+
+@pytest.mark.django_db
+def test_async_views_count_queries_against_the_budget(medicines, settings):
+    settings.DEBUG = True
+    url = f"/api/medicines/{medicines[0].pk}/"
+    expected = client.get(url)
+    RedisCache().redis.flushdb()
+
+    response = async_get(url)
+    assert response["X-Query-Count"] == expected["X-Query-Count"] == "2"
+    assert async_get(url)["X-Query-Count"] == "0"
+
+
+@pytest.mark.django_db
+def test_async_search_matches_sync_view(medicines):
+    expected = client.get("/api/medicines/search/?q=pa&ordering=price")
+    RedisCache().redis.flushdb()
+
+    response = async_get("/api/medicines/search/?q=pa&ordering=price")
+    assert json.loads(response.content) == expected.json()
+    # Every medicine matches through the generic name
+    names = [item["name"] for item in json.loads(response.content)["results"]]
+    assert names == ["Xpa", "Ace", "Napa"]
+
+    assert async_get("/api/medicines/search/").status_code == 400
+    assert async_get("/api/medicines/search/?q=pa&ordering=stock").status_code == 400
+
+
+@pytest.mark.django_db
+def test_writes_and_authenticated_reads_run_the_drf_view(medicines, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    medicine = medicines[0]
+
+    response = async_to_sync(async_client.put)(
+        f"/api/medicines/{medicine.pk}/",
+        {"name": "Napa Extra"},
+        content_type="application/json",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    anonymous_delete = async_to_sync(async_client.delete)(f"/api/medicines/{medicines[1].pk}/")
+    assert anonymous_delete.status_code == 401
+
+    response = async_get(f"/api/medicines/{medicine.pk}/", headers=headers)
+    assert json.loads(response.content)["data"]["name"] == "Napa Extra"
+    assert async_get("/api/medicines/", headers={"Authorization": "Bearer bad"}).status_code == 401
+
+
+@pytest.mark.django_db
+@override_settings(REPLICA_DATABASES=["default"])
+def test_async_reads_use_replicas(medicines, django_capture_on_commit_callbacks):
+    with mock.patch.object(
+        replica_health, "available", wraps=replica_health.available
+    ) as chosen:
+        assert async_get("/api/medicines/").status_code == 200
+        assert chosen.called
+        chosen.reset_mock()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            medicines[0].price = Decimal("1.50")
+            medicines[0].save()
+        # Until the replica has applied the write, cache fills read the primary
+        assert async_get("/api/medicines/").status_code == 200
+        assert not chosen.called
+        # The browsable API is never cached
+        assert async_get("/api/medicines/?format=api").status_code == 200
+    assert chosen.called
+
+
+def test_read_view_follows_the_setting():
+    with override_settings(ASYNC_READ_VIEWS=True):
+        view = read_view(MedicineListView)
+        assert iscoroutinefunction(view)
+        assert view.view_class is MedicineListView
+    with override_settings(ASYNC_READ_VIEWS=False):
+        assert not iscoroutinefunction(read_view(MedicineListView))
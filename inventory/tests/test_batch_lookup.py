@@ -0,0 +1,58 @@
+# inventory/tests/test_batch_lookup.py
+import uuid
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from inventory.api.batch_lookup import BATCH_LOOKUP_LIMIT
+
+client = APIClient()
+
+URL = "/api/medicines/batch-lookup/"
+
+
+@pytest.mark.django_db
+def test_lookup_by_ids_keeps_request_order(medicines):
+    unknown = str(uuid.uuid4())
+    ids = [str(medicines[2].id), unknown, str(medicines[0].id)]
+    response = client.post(URL, {"ids": ids}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.data["data"]
+    assert [item and item["id"] for item in data["results"]] == [ids[0], None, ids[2]]
+    assert data["results"][0]["manufacturer_details"]["name"] == "Incepta Pharmaceuticals Ltd."
+    assert data["not_found"] == [unknown]
+
+
+@pytest.mark.django_db
+def test_lookup_is_served_from_cache_after_first_call(medicines):
+    ids = [str(medicine.id) for medicine in medicines]
+    first = client.post(URL, {"ids": ids}, format="json")
+
+    with CaptureQueriesContext(connection) as queries:
+        second = client.post(URL, {"ids": ids}, format="json")
+    assert len(queries) == 0
+    assert second.data["data"] == first.data["data"]
+
+
+@pytest.mark.django_db
+def test_lookup_by_batch_numbers_follows_renames(medicines):
+    client.post(URL, {"batch_numbers": ["SC1"]}, format="json")
+
+    medicines[1].batch_number = "SC9"
+    medicines[1].save()
+
+    response = client.post(URL, {"batch_numbers": ["SC1", "SC9"]}, format="json")
+    data = response.data["data"]
+    assert data["results"][0] is None
+    assert data["results"][1]["id"] == str(medicines[1].id)
+    assert data["not_found"] == ["SC1"]
+
+
+@pytest.mark.django_db
+def test_lookup_rejects_invalid_requests():
+    assert client.post(URL, {"ids": ["not-a-uuid"]}, format="json").status_code == 400
+    assert client.post(URL, {"ids": [], "batch_numbers": []}, format="json").status_code == 400
+    oversized = {"ids": [str(uuid.uuid4()) for _ in range(BATCH_LOOKUP_LIMIT + 1)]}
+    assert client.post(URL, oversized, format="json").status_code == 400
@@ -0,0 +1,140 @@
+# inventory/tests/test_bulk.py
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from inventory.cache_keys import MEDICINE_DETAIL_CACHE_KEY_TEMPLATE
+from inventory.models import (
+    MedicineDetail,
+    GenericName,
+    MedicineCategory,
+    MedicineForm,
+    Manufacturer,
+)
+from inventory.signals import cache_manager
+
+client = APIClient()
+
+URL = "/api/medicines/bulk/"
+
+
+@pytest.fixture(autouse=True)
+def admin_user():
+    user = User.objects.create_superuser(username="admin", password="adminpass")
+    client.force_authenticate(user=user)
+    yield user
+    client.force_authenticate(user=None)
+
+
+@pytest.fixture
+def references():
+    return {
+        "generic_name": GenericName.objects.create(name="Omeprazole").id,
+        "category": MedicineCategory.objects.create(name="Antacid").id,
+        "form": MedicineForm.objects.create(form_type="CAP").id,
+        "manufacturer": Manufacturer.objects.create(name="Incepta Pharmaceuticals Ltd.").id,
+    }
+
+
+def payload(references, count, start=0):
+    return [
+        {
+            "name": f"Seclo {index}",
+            "description": "Reduces stomach acid",
+            "price": "6.00",
+            "batch_number": f"SC{index}",
+            **references,
+        }
+        for index in range(start, start + count)
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_create_uses_constant_queries(references, django_capture_on_commit_callbacks):
+    with CaptureQueriesContext(connection) as small:
+        client.post(URL, payload(references, 2), format="json")
+    with django_capture_on_commit_callbacks(execute=True):
+        with CaptureQueriesContext(connection) as large:
+            response = client.post(URL, payload(references, 50, start=2), format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["data"]["count"] == 50
+    assert len(large) == len(small)
+    medicine = MedicineDetail.objects.get(batch_number="SC10")
+    assert medicine.search_content == "Seclo 10 Omeprazole"
+
+
+@pytest.mark.django_db
+def test_bulk_create_reports_errors_per_item(references):
+    MedicineDetail.objects.create(
+        name="Existing",
+        description="Reduces stomach acid",
+        price="6.00",
+        batch_number="SC1",
+        generic_name_id=references["generic_name"],
+        category_id=references["category"],
+        form_id=references["form"],
+        manufacturer_id=references["manufacturer"],
+    )
+    items = payload(references, 3)
+    items[2]["category"] = 999999
+    items.append(dict(items[0], name="Copy"))
+
+    response = client.post(URL, items, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    errors = response.data["message"]
+    assert len(errors) == 4
+    assert "batch_number" in errors[0] and "batch_number" in errors[3]
+    assert "batch_number" in errors[1]
+    assert "category" in errors[2]
+    assert MedicineDetail.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_bulk_create_rejects_second_featured(references):
+    items = payload(references, 2)
+    for item in items:
+        item["is_featured"] = True
+
+    response = client.post(URL, items, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["message"][0] == {}
+    assert "is_featured" in response.data["message"][1]
+
+
+@pytest.mark.django_db
+def test_bulk_update_and_delete_invalidate_once(references, django_capture_on_commit_callbacks):
+    ids = client.post(URL, payload(references, 3), format="json").data["data"]["ids"]
+    detail_key = MEDICINE_DETAIL_CACHE_KEY_TEMPLATE.format(ids[0])
+    client.get(f"/api/medicines/{ids[0]}/")
+    assert cache_manager.redis.exists(detail_key)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        response = client.put(
+            URL,
+            [{"id": ids[0], "name": "Seclo 20"}, {"id": ids[1], "price": "7.50"}],
+            format="json",
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(callbacks) == 1
+    assert not cache_manager.redis.exists(detail_key)
+
+    medicine = MedicineDetail.objects.get(pk=ids[0])
+    assert medicine.search_content == "Seclo 20 Omeprazole"
+    assert medicine.updated_at > medicine.created_at
+
+    missing = "00000000-0000-0000-0000-000000000000"
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        response = client.delete(URL, {"ids": ids[:2] + [missing]}, format="json")
+    assert response.data["data"] == {"count": 2, "not_found": [missing]}
+    assert len(callbacks) == 1
+    assert MedicineDetail.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_bulk_update_unknown_id(references):
+    response = client.put(URL, [{"id": "not-an-id", "name": "Seclo"}], format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["message"] == [{"id": ["Medicine not found."]}]
@@ -0,0 +1,130 @@
+# inventory/tests/test_conditions.py
+import json
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from inventory.api.condition_index import cache_manager
+from inventory.models import Condition
+
+client = APIClient()
+
+
+@pytest.fixture
+def condition():
+    return Condition.objects.create(name="Hypertension")
+
+
+@pytest.fixture
+def medicines(make_medicines, condition):
+    medicines = make_medicines(5, name="Amdocal", generic_name="Amlodipine")
+    condition.medications.add(*medicines[:3])
+    return medicines
+
+
+@pytest.mark.django_db
+def test_medicines_expose_condition_ids(condition, medicines):
+    response = client.get("/api/medicines/")
+    assert response.status_code == status.HTTP_200_OK
+    by_name = {item["name"]: item for item in response.data["results"]}
+    assert by_name["Amdocal 0"]["conditions"] == [condition.pk]
+    assert by_name["Amdocal 4"]["conditions"] == []
+
+    detail = client.get(f"/api/medicines/{medicines[0].pk}/")
+    assert detail.data["data"]["conditions"] == [condition.pk]
+
+
+@pytest.mark.django_db
+def test_update_writes_conditions(condition, medicines, admin_client):
+    response = admin_client.put(
+        f"/api/medicines/{medicines[4].pk}/", {"conditions": [condition.pk]}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["data"]["conditions"] == [condition.pk]
+    assert condition.medications.count() == 4
+
+
+@pytest.mark.django_db
+def test_search_filters_by_condition(condition, medicines):
+    response = client.get(
+        "/api/medicines/search/",
+        {"q": "Amdocal", "filters": json.dumps({"condition": condition.pk})},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 3
+    assert {item["name"] for item in response.data["results"]} == {
+        "Amdocal 0",
+        "Amdocal 1",
+        "Amdocal 2",
+    }
+
+
+@pytest.mark.django_db
+def test_condition_medicines_are_paged_newest_first(condition, medicines):
+    url = f"/api/conditions/{condition.pk}/medicines/"
+    first = client.get(url, {"page_size": 2})
+    assert first.status_code == status.HTTP_200_OK
+    assert first.data["count"] == 3
+    assert [item["name"] for item in first.data["results"]] == ["Amdocal 2", "Amdocal 1"]
+    assert first.data["previous"] is None
+    assert "page=2" in first.data["next"]
+
+    second = client.get(url, {"page_size": 2, "page": 2})
+    assert [item["name"] for item in second.data["results"]] == ["Amdocal 0"]
+    assert second.data["next"] is None
+    assert second.data["previous"] is not None
+
+    # A warm page is served from the cached id list and item cache alone
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url, {"page_size": 2, "page": 2})
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_condition_index_is_refreshed_on_change(
+    condition, medicines, django_capture_on_commit_callbacks
+):
+    url = f"/api/conditions/{condition.pk}/medicines/"
+    assert client.get(url).data["count"] == 3
+
+    with django_capture_on_commit_callbacks(execute=True):
+        medicines[4].conditions.add(condition)
+    response = client.get(url)
+    assert response.data["count"] == 4
+    assert response.data["results"][0]["name"] == "Amdocal 4"
+    assert response.data["results"][0]["conditions"] == [condition.pk]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        condition.medications.clear()
+    response = client.get(url)
+    assert response.data["count"] == 0
+    assert response.data["results"] == []
+
+
+@pytest.mark.django_db
+def test_index_read_before_a_change_is_not_cached(
+    condition, medicines, monkeypatch, django_capture_on_commit_callbacks
+):
+    url = f"/api/conditions/{condition.pk}/medicines/"
+    store = cache_manager.set_sorted_if_current
+
+    # The medicine joins after the rebuild read the table, before it stores
+    def join_then_store(*args, **kwargs):
+        with django_capture_on_commit_callbacks(execute=True):
+            medicines[4].conditions.add(condition)
+        return store(*args, **kwargs)
+
+    with monkeypatch.context() as patched:
+        patched.setattr(cache_manager, "set_sorted_if_current", join_then_store)
+        assert client.get(url).data["count"] == 3
+
+    response = client.get(url)
+    assert response.data["count"] == 4
+    assert response.data["results"][0]["name"] == "Amdocal 4"
+
+
+@pytest.mark.django_db
+def test_unknown_condition_returns_not_found():
+    response = client.get("/api/conditions/999/medicines/")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
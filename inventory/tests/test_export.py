@@ -0,0 +1,64 @@
+# inventory/tests/test_export.py
+import csv
+import gzip
+import io
+import json
+import pytest
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+from inventory.api.export import iter_medicine_batches
+
+client = APIClient()
+
+
+@pytest.fixture
+def medicines(make_medicines):
+    return make_medicines(5, description="Reduces stomach acid, with a comma")
+
+
+@pytest.mark.django_db
+def test_batches_cover_catalog_once(medicines):
+    ids = [item["id"] for batch in iter_medicine_batches(chunk_size=2) for item in batch]
+    assert sorted(ids) == sorted(str(medicine.id) for medicine in medicines)
+
+
+@pytest.mark.django_db
+def test_export_ndjson(medicines):
+    response = client.get("/api/medicines/export/")
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/x-ndjson"
+
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    items = [json.loads(line) for line in lines]
+    assert len(items) == 5
+    assert items[0]["generic_name_details"]["name"] == "Omeprazole"
+
+
+@pytest.mark.django_db
+def test_export_csv_gzip(medicines):
+    response = client.get(
+        "/api/medicines/export/", {"output": "csv"}, HTTP_ACCEPT_ENCODING="gzip"
+    )
+    assert response["Content-Encoding"] == "gzip"
+
+    body = gzip.decompress(b"".join(response.streaming_content)).decode()
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert len(rows) == 5
+    assert rows[0]["manufacturer"] == "Incepta Pharmaceuticals Ltd."
+    assert rows[0]["description"] == "Reduces stomach acid, with a comma"
+
+
+@pytest.mark.django_db
+def test_export_rejects_unknown_format(medicines):
+    response = client.get("/api/medicines/export/", {"output": "xml"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_export_command_writes_gzip_file(medicines, tmp_path):
+    output = tmp_path / "medicines.ndjson.gz"
+    call_command("export_medicines", "--output", str(output), "--gzip", "--chunk-size", "2")
+
+    lines = gzip.decompress(output.read_bytes()).decode().splitlines()
+    assert len(lines) == 5
@@ -0,0 +1,83 @@
+# inventory/tests/test_fieldsets.py
+from decimal import Decimal
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from inventory.models import (
+    MedicineDetail,
+    GenericName,
+    MedicineCategory,
+    MedicineForm,
+    Manufacturer,
+)
+
+client = APIClient()
+
+
+@pytest.fixture
+def medicine():
+    return MedicineDetail.objects.create(
+        name="Napa Extra",
+        generic_name=GenericName.objects.create(name="Paracetamol"),
+        category=MedicineCategory.objects.create(name="Analgesic"),
+        form=MedicineForm.objects.create(form_type="TBL"),
+        manufacturer=Manufacturer.objects.create(name="Beximco Pharma"),
+        description="Pain and fever relief",
+        price=Decimal("2.50"),
+        batch_number="NX-1",
+        stock_quantity=40,
+    )
+
+
+@pytest.mark.django_db
+def test_list_returns_only_requested_fields(medicine):
+    response = client.get(
+        "/api/medicines/", {"fields": "name,price,stock_quantity", "expand": ""}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    item = response.data["results"][0]
+    assert set(item) == {"id", "name", "price", "stock_quantity"}
+    assert item["price"] == "2.50"
+
+
+@pytest.mark.django_db
+def test_list_projection_narrows_sql(medicine):
+    with CaptureQueriesContext(connection) as queries:
+        client.get("/api/medicines/", {"fields": "name,price", "expand": "generic_name"})
+
+    page_query = next(
+        q["sql"] for q in queries.captured_queries if "LIMIT" in q["sql"].upper()
+    )
+    assert "description" not in page_query
+    assert "inventory_manufacturer" not in page_query
+    assert "inventory_genericname" in page_query
+
+
+@pytest.mark.django_db
+def test_search_expand_nests_only_requested_relations(medicine):
+    response = client.get(
+        "/api/medicines/search/",
+        {"q": "Napa", "fields": "name", "expand": "manufacturer"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    item = response.data["results"][0]
+    assert item["manufacturer_details"]["name"] == "Beximco Pharma"
+    assert "generic_name_details" not in item
+    assert item["matches"]["name"] == [(0, 4)]
+
+
+@pytest.mark.django_db
+def test_projections_use_separate_cache_entries(medicine):
+    narrow = client.get("/api/medicines/", {"fields": "name", "expand": ""})
+    full = client.get("/api/medicines/")
+    assert set(narrow.json()["results"][0]) == {"id", "name"}
+    assert "description" in full.json()["results"][0]
+
+
+@pytest.mark.django_db
+def test_unknown_field_is_rejected(medicine):
+    response = client.get("/api/medicines/", {"fields": "name,secret"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "secret" in response.data["message"]
@@ -0,0 +1,185 @@
+# inventory/tests/test_filters.py
+from decimal import Decimal
+from itertools import combinations
+import pytest
+from django.db import connection
+from rest_framework import status
+from rest_framework.test import APIClient
+from inventory.api.fieldsets import Fieldset
+from inventory.api.filters import FILTERS, ORDERINGS, MedicineFilters
+from inventory.api.row_mappers import get_row_mapper
+from inventory.api.views import filter_parameters
+from inventory.models import (
+    MedicineDetail,
+    GenericName,
+    MedicineCategory,
+    MedicineForm,
+)
+
+client = APIClient()
+
+
+@pytest.fixture
+def medicines(make_medicines):
+    rows = [
+        ("Camlodin", "Amlodipine", "8.00", True, False, "TBL"),
+        ("Amdocal", "Amlodipine", "5.00", True, True, "TBL"),
+        ("Angilock", "Losartan", "12.00", False, True, "CAP"),
+        ("Losart", "Losartan", "10.00", True, False, "TBL"),
+    ]
+    return make_medicines(
+        rows=[
+            {
+                "name": name,
+                "generic_name": generic,
+                "price": Decimal(price),
+                "is_available": available,
+                "prescription_required": prescription,
+                "unit_of_measurement": unit,
+            }
+            for name, generic, price, available, prescription, unit in rows
+        ],
+        category="Antihypertensive",
+        form="TBL",
+        manufacturer="Renata Limited",
+        description="Lowers blood pressure",
+    )
+
+
+def names(response):
+    return [item["name"] for item in response.data["results"]]
+
+
+@pytest.mark.django_db
+def test_list_sorts_by_allowed_keys(medicines):
+    assert names(client.get("/api/medicines/", {"ordering": "price"})) == [
+        "Amdocal",
+        "Camlodin",
+        "Losart",
+        "Angilock",
+    ]
+    assert names(client.get("/api/medicines/", {"ordering": "-name"}))[0] == "Losart"
+
+    response = client.get("/api/medicines/", {"ordering": "description"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_list_filters_and_counts_per_filter(medicines):
+    response = client.get(
+        "/api/medicines/",
+        {"min_price": "6", "max_price": "12", "is_available": "true", "ordering": "-price"},
+    )
+    assert names(response) == ["Losart", "Camlodin"]
+    assert response.data["count"] == 2
+
+    # A different filter must not reuse the cached page or count
+    response = client.get("/api/medicines/", {"prescription_required": "true"})
+    assert sorted(names(response)) == ["Amdocal", "Angilock"]
+    assert response.data["count"] == 2
+
+    response = client.get("/api/medicines/", {"unit_of_measurement": "CAP"})
+    assert names(response) == ["Angilock"]
+
+    bad = client.get("/api/medicines/", {"min_price": "cheap"})
+    assert bad.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_requires_default_ordering(medicines):
+    response = client.get("/api/medicines/", {"pagination": "cursor", "ordering": "price"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.get(
+        "/api/medicines/", {"pagination": "cursor", "generic_name": medicines[0].generic_name_id}
+    )
+    assert names(response) == ["Amdocal", "Camlodin"]
+
+
+@pytest.mark.django_db
+def test_search_sorts_and_filters(medicines):
+    response = client.get("/api/medicines/search/", {"q": "am", "ordering": "price"})
+    assert names(response) == ["Amdocal", "Camlodin"]
+
+    response = client.get("/api/medicines/search/", {"q": "am", "max_price": "6"})
+    assert names(response) == ["Amdocal"]
+
+
+def test_documented_filters_match_the_allow_list():
+    assert [parameter.name for parameter in filter_parameters] == ["ordering", *FILTERS]
+
+
+# One representative value per filter, for the plan checks below
+SAMPLE_FILTERS = {
+    "min_price": Decimal("5"),
+    "max_price": Decimal("50"),
+    "prescription_required": False,
+    "is_available": True,
+    "unit_of_measurement": "TBL",
+}
+
+# Enough rows that the planner weighs indexes against a table scan the way
+# it does in production; on a handful of rows MySQL scans whatever the query
+CATALOG_SIZE = 2000
+
+
+@pytest.fixture
+def catalog():
+    """SAMPLE_FILTERS, plus a category and generic name, over CATALOG_SIZE rows."""
+    # MySQL's bulk_create does not set auto-increment ids, so these are created one by one
+    generics = [GenericName.objects.create(name=f"Generic {index}") for index in range(40)]
+    categories = [
+        MedicineCategory.objects.create(name=f"Category {index}") for index in range(10)
+    ]
+    form = MedicineForm.objects.create(form_type="TBL")
+    MedicineDetail.objects.bulk_create(
+        (
+            MedicineDetail(
+                name=f"Brand {index}",
+                generic_name=generics[index % len(generics)],
+                category=categories[index % len(categories)],
+                form=form,
+                description="Seeded for plan checks",
+                price=Decimal(index % 500) / 4,
+                batch_number=f"PLAN{index}",
+                is_available=index % 10 != 0,
+                prescription_required=index % 3 == 0,
+                unit_of_measurement="TBL" if index % 4 else "CAP",
+            )
+            for index in range(CATALOG_SIZE)
+        ),
+        batch_size=500,
+    )
+    return {**SAMPLE_FILTERS, "category": categories[0].pk, "generic_name": generics[0].pk}
+
+
+def sorts_whole_table(queryset):
+    """Whether the plan reads every row of the table and then sorts them."""
+    table = MedicineDetail._meta.db_table
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        if connection.vendor == "mysql":
+            cursor.execute(f"EXPLAIN FORMAT=TRADITIONAL {sql}", params)
+            columns = [column[0].lower() for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            full_scan = any(row["table"] == table and row["type"] == "ALL" for row in rows)
+            return full_scan and any("filesort" in (row["extra"] or "") for row in rows)
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        details = [row[-1] for row in cursor.fetchall()]
+    full_scan = any(detail.startswith(f"SCAN {table}") for detail in details)
+    sorted_after = any("TEMP B-TREE FOR ORDER BY" in detail for detail in details)
+    return full_scan and sorted_after
+
+
+@pytest.mark.django_db
+def test_no_allowed_combination_sorts_the_whole_table(catalog):
+    columns = get_row_mapper(Fieldset()).columns
+    offenders = []
+    for ordering in ORDERINGS:
+        for size in range(len(FILTERS) + 1):
+            for names_ in combinations(FILTERS, size):
+                filters = MedicineFilters(ordering, {name: catalog[name] for name in names_})
+                queryset = filters.apply(MedicineDetail.objects.all()).values_list(*columns)
+                if sorts_whole_table(queryset[:10]):
+                    offenders.append((ordering, names_))
+    assert offenders == []
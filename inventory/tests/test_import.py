@@ -0,0 +1,124 @@
+# inventory/tests/test_import.py
+import csv
+import json
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from inventory.models import MedicineDetail, GenericName, Manufacturer, MedicineForm
+
+HEADER = [
+    "name",
+    "description",
+    "price",
+    "batch_number",
+    "stock_quantity",
+    "unit_of_measurement",
+    "prescription_required",
+    "generic_name",
+    "category",
+    "form",
+    "manufacturer",
+]
+
+
+def row(index, **overrides):
+    values = {
+        "name": f"Napa {index}",
+        "description": "Pain relief",
+        "price": "1.20",
+        "batch_number": f"NP{index}",
+        "stock_quantity": "10",
+        "unit_of_measurement": "Tablet",
+        "prescription_required": "no",
+        "generic_name": "Paracetamol",
+        "category": "Analgesic",
+        "form": "Tablet",
+        "manufacturer": "Beximco Pharmaceuticals Ltd.",
+    }
+    values.update(overrides)
+    return values
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=HEADER)
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.mark.django_db
+def test_import_creates_references_and_upserts(tmp_path):
+    path = write_csv(tmp_path / "catalog.csv", [row(index) for index in range(5)])
+    call_command("import_medicines", path, "--workers", "0", "--chunk-size", "2")
+
+    assert MedicineDetail.objects.count() == 5
+    assert GenericName.objects.filter(name="Paracetamol").count() == 1
+    assert Manufacturer.objects.count() == 1
+    medicine = MedicineDetail.objects.get(batch_number="NP3")
+    assert medicine.form.form_type == "TBL"
+    assert medicine.unit_of_measurement == "TBL"
+    assert medicine.search_content == "Napa 3 Paracetamol"
+
+    original_id = medicine.id
+    path = write_csv(tmp_path / "update.csv", [row(3, price="2.50", name="Napa Extra")])
+    call_command("import_medicines", path, "--workers", "0")
+
+    medicine = MedicineDetail.objects.get(batch_number="NP3")
+    assert medicine.id == original_id
+    assert str(medicine.price) == "2.50"
+    assert medicine.search_content == "Napa Extra Paracetamol"
+    assert MedicineDetail.objects.count() == 5
+
+
+@pytest.mark.django_db
+def test_import_skips_invalid_rows(tmp_path, capsys):
+    rows = [row(0), row(1, price="free"), row(2, generic_name="")]
+    path = write_csv(tmp_path / "catalog.csv", rows)
+    call_command("import_medicines", path, "--workers", "0")
+
+    assert MedicineDetail.objects.count() == 1
+    errors = capsys.readouterr().err
+    assert "Row 2: price" in errors
+    assert "Row 3: generic_name" in errors
+
+
+@pytest.mark.django_db
+def test_import_resumes_from_checkpoint(tmp_path):
+    path = write_csv(tmp_path / "catalog.csv", [row(index) for index in range(4)])
+    checkpoint = tmp_path / "catalog.csv.checkpoint"
+    with open(checkpoint, "w") as handle:
+        json.dump({"path": path, "size": (tmp_path / "catalog.csv").stat().st_size, "rows_done": 3}, handle)
+
+    call_command("import_medicines", path, "--workers", "0", "--resume")
+    assert list(MedicineDetail.objects.values_list("batch_number", flat=True)) == ["NP3"]
+    assert not checkpoint.exists()
+
+
+@pytest.mark.django_db
+def test_import_parses_in_worker_processes(tmp_path):
+    path = write_csv(tmp_path / "catalog.csv", [row(index) for index in range(30)])
+    call_command("import_medicines", path, "--workers", "2", "--chunk-size", "7")
+    assert MedicineDetail.objects.count() == 30
+
+
+@pytest.mark.django_db
+def test_import_xlsx(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER)
+    sheet.append([row(0)[column] for column in HEADER])
+    path = str(tmp_path / "catalog.xlsx")
+    workbook.save(path)
+
+    call_command("import_medicines", path, "--workers", "0")
+    assert MedicineDetail.objects.get().form == MedicineForm.objects.get(form_type="TBL")
+
+
+@pytest.mark.django_db
+def test_import_rejects_missing_columns(tmp_path):
+    path = tmp_path / "catalog.csv"
+    path.write_text("name,price\nNapa,1.20\n")
+    with pytest.raises(CommandError, match="Missing required columns"):
+        call_command("import_medicines", str(path), "--workers", "0")
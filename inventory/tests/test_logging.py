@@ -0,0 +1,139 @@
+import logging
+import threading
+import pytest
+from django.test import override_settings
+from utils import log_pipeline
+from utils.log_pipeline import SampledLogger, SamplingFilter
+
+
+class RecordingHandler(logging.Handler):
+    """Keeps the formatted lines and the thread that wrote each one."""
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.lines = []
+        self.threads = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+        self.threads.append(threading.current_thread())
+
+
+@pytest.fixture(autouse=True)
+def stop_pipelines():
+    yield
+    log_pipeline.stop()
+
+
+def make_logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.filters = []
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def test_records_are_written_by_the_listener_thread():
+    handler = RecordingHandler()
+    logger = make_logger("test_pipeline.queued", handler)
+    log_pipeline.queue_loggers([logger.name])
+    assert handler not in logger.handlers
+
+    logger.info("Cache hit for key: %s", "medicine_list")
+    logger.debug("Below the logger level")
+    log_pipeline.flush()
+
+    assert handler.lines == ["Cache hit for key: medicine_list"]
+    assert handler.threads[0] is not threading.current_thread()
+
+    # Stopping hands the logger its handlers back
+    log_pipeline.stop()
+    assert logger.handlers == [handler]
+    logger.info("Written directly")
+    assert handler.threads[-1] is threading.current_thread()
+
+
+def test_handler_levels_apply_in_the_listener():
+    errors = RecordingHandler(logging.ERROR)
+    logger = make_logger("test_pipeline.levels", errors)
+    log_pipeline.queue_loggers([logger.name])
+
+    logger.info("Not an error")
+    logger.error("Redis get error for key '%s': %s", "k", "timeout")
+    log_pipeline.flush()
+    assert errors.lines == ["Redis get error for key 'k': timeout"]
+
+
+def test_a_full_queue_drops_records_instead_of_blocking():
+    release = threading.Event()
+
+    class StalledHandler(RecordingHandler):
+        def emit(self, record):
+            release.wait(5)
+            super().emit(record)
+
+    handler = StalledHandler()
+    logger = make_logger("test_pipeline.full", handler)
+    log_pipeline.queue_loggers([logger.name], maxsize=1)
+    queued = next(h for h in logger.handlers if isinstance(h, log_pipeline.DeferredQueueHandler))
+
+    for index in range(5):
+        logger.info("line %s", index)
+    assert queued.dropped >= 3
+    release.set()
+    log_pipeline.flush()
+    assert handler.lines[0] == "line 0"
+
+
+def test_sampled_logger_drops_info_before_building_records():
+    handler = RecordingHandler()
+    logger = make_logger("test_pipeline.sampled", handler)
+    logger.addFilter(SamplingFilter(rate=0))
+    log_pipeline.sample_loggers()
+    assert isinstance(logger, SampledLogger)
+    assert logger.filters == []
+
+    for _ in range(100):
+        logger.info("Cache hit for key: %s", "k")
+    logger.warning("Non-JSON data retrieved from cache for key: %s", "k")
+    assert handler.lines == ["Non-JSON data retrieved from cache for key: k"]
+
+    # A config without the filter stops sampling
+    log_pipeline.sample_loggers()
+    logger.info("Cache miss for key: %s", "k")
+    assert handler.lines[-1] == "Cache miss for key: k"
+
+
+def test_sampling_filter_keeps_a_fraction():
+    sampler = SamplingFilter(rate=0.5)
+    record = logging.LogRecord("app_logger.cache", logging.INFO, __file__, 1, "hit", (), None)
+    kept = sum(sampler.filter(record) for _ in range(2000))
+    assert 800 < kept < 1200
+    record.levelno = logging.ERROR
+    assert all(sampler.filter(record) for _ in range(100))
+
+
+@pytest.mark.parametrize("queued", [True, False])
+def test_configure_logging_follows_the_setting(queued):
+    config = {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "filters": {"sample": {"()": "utils.log_pipeline.SamplingFilter", "rate": 0}},
+        "handlers": {"memory": {"()": RecordingHandler}},
+        "loggers": {
+            "test_config": {"handlers": ["memory"], "level": "INFO", "propagate": False},
+            "test_config.cache": {"filters": ["sample"]},
+        },
+    }
+    with override_settings(LOG_QUEUE=queued):
+        log_pipeline.configure_logging(config)
+    logger = logging.getLogger("test_config")
+    queue_handlers = [h for h in logger.handlers if isinstance(h, log_pipeline.DeferredQueueHandler)]
+    assert bool(queue_handlers) is queued
+    assert logging.getLogger("test_config.cache").sample_rate == 0
+
+    logger.info("Reference data changed: %s %s", "MedicineForm", 3)
+    log_pipeline.flush()
+    handler = log_pipeline._pipelines[0][2].handlers[0] if queued else logger.handlers[0]
+    assert handler.lines == ["Reference data changed: MedicineForm 3"]
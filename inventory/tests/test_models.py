@@ -3,7 +3,17 @@ import pytest
 from rest_framework import status
 from rest_framework.test import APIClient
 from django.contrib.auth.models import User
-from inventory.models import GenericName, MedicineCategory, MedicineForm, Manufacturer
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from inventory.exceptions import FeaturedMedicineInvalidError
+from inventory.models import (
+    GenericName,
+    MedicineCategory,
+    MedicineForm,
+    Manufacturer,
+    MedicineDetail,
+)
 from decimal import Decimal
 
 client = APIClient()
@@ -197,3 +207,69 @@ def test_manufacturer_crud(admin_user):
     ), f"Failed to delete: {response.data}"
 
     client.logout()
+
+
+@pytest.mark.django_db
+def test_featured_rule_enforced_by_database():
+    """A second featured medicine per generic name is rejected without pre-checks"""
+    generic_name = GenericName.objects.create(name="Cetirizine")
+    category = MedicineCategory.objects.create(name="Antihistamine")
+    form = MedicineForm.objects.create(form_type="TBL")
+    fields = {
+        "generic_name": generic_name,
+        "category": category,
+        "form": form,
+        "manufacturer": Manufacturer.objects.create(name="Square Pharmaceuticals Ltd."),
+        "description": "Allergy relief",
+        "price": Decimal("3.00"),
+        "is_featured": True,
+    }
+    MedicineDetail.objects.create(name="Alatrol", batch_number="AL1", **fields)
+
+    second = MedicineDetail(name="Atrizin", batch_number="AT1", **fields)
+    with transaction.atomic():
+        with CaptureQueriesContext(connection) as queries:
+            with pytest.raises(FeaturedMedicineInvalidError):
+                second.save()
+        # Rejected by the constraint, not by a query looking for the other one
+        assert not any(
+            query["sql"].startswith("SELECT") and "featured" in query["sql"]
+            for query in queries
+        )
+
+        # The savepoint keeps the surrounding transaction usable
+        second.is_featured = False
+        second.save()
+
+    assert MedicineDetail.objects.filter(generic_name=generic_name, is_featured=True).count() == 1
+
+
+@pytest.mark.django_db
+def test_duplicate_batch_number_is_a_validation_error():
+    fields = {
+        "generic_name": GenericName.objects.create(name="Cetirizine"),
+        "category": MedicineCategory.objects.create(name="Antihistamine"),
+        "form": MedicineForm.objects.create(form_type="TBL"),
+        "description": "Allergy relief",
+        "price": Decimal("3.00"),
+    }
+    MedicineDetail.objects.create(name="Alatrol", batch_number="AL1", **fields)
+    with pytest.raises(ValidationError) as error:
+        MedicineDetail.objects.create(name="Atrizin", batch_number="AL1", **fields)
+    assert "batch_number" in error.value.message_dict
+
+
+@pytest.mark.django_db(transaction=True)
+def test_save_outside_a_transaction_opens_no_savepoint():
+    medicine = MedicineDetail(
+        name="Alatrol",
+        generic_name=GenericName.objects.create(name="Cetirizine"),
+        category=MedicineCategory.objects.create(name="Antihistamine"),
+        form=MedicineForm.objects.create(form_type="TBL"),
+        description="Allergy relief",
+        price=Decimal("3.00"),
+        batch_number="AL1",
+    )
+    with CaptureQueriesContext(connection) as queries:
+        medicine.save()
+    assert not any("SAVEPOINT" in query["sql"] for query in queries)
@@ -0,0 +1,62 @@
+import json
+from unittest import mock
+import pytest
+from django.test import override_settings
+from drf_yasg.generators import OpenAPISchemaGenerator
+from rest_framework.test import APIClient
+from benchmarks.import_time import FORBIDDEN_MODULES, profile_imports
+from core import openapi
+
+client = APIClient()
+
+
+@pytest.fixture(autouse=True)
+def reset_documents():
+    openapi._documents.clear()
+    openapi._prebuilt.clear()
+    yield
+    openapi._documents.clear()
+    openapi._prebuilt.clear()
+
+
+@pytest.fixture
+def generations():
+    get_schema = OpenAPISchemaGenerator.get_schema
+    with mock.patch.object(
+        OpenAPISchemaGenerator, "get_schema", autospec=True, side_effect=get_schema
+    ) as get_schema:
+        yield get_schema
+
+
+@override_settings(OPENAPI_SCHEMA_FILE=None)
+def test_document_is_generated_once(generations):
+    first = client.get("/swagger.json")
+    assert first.status_code == 200
+    assert "/medicines/" in json.loads(first.content)["paths"]
+    assert client.get("/swagger.json").content == first.content
+    assert client.get("/swagger.yaml").status_code == 200
+    assert generations.call_count == 1
+
+
+def test_prebuilt_document_is_served_as_is(tmp_path, generations):
+    schema_file = tmp_path / "openapi.json"
+    schema_file.write_bytes(b'{"swagger": "2.0", "paths": {}}')
+    with override_settings(OPENAPI_SCHEMA_FILE=str(schema_file)):
+        response = client.get("/swagger.json")
+    assert response.content == b'{"swagger": "2.0", "paths": {}}'
+    assert response["Content-Type"] == "application/json"
+    assert generations.call_count == 0
+
+
+@pytest.mark.parametrize("page", ["/swagger/", "/redoc/"])
+def test_docs_pages_load_the_document_from_swagger_json(page):
+    response = client.get(page)
+    assert response.status_code == 200
+    assert b"/swagger.json" in response.content
+    # The pages never build the full document themselves
+    assert not openapi._documents
+
+
+def test_startup_does_not_import_cloud_sdks():
+    imported = {name for name, _, _, _ in profile_imports()}
+    assert not imported & set(FORBIDDEN_MODULES)
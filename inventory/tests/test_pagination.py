@@ -0,0 +1,144 @@
+# inventory/tests/test_pagination.py
+from datetime import timedelta
+from decimal import Decimal
+import pytest
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from inventory.models import MedicineDetail
+
+client = APIClient()
+
+
+@pytest.fixture
+def medicines(make_medicines):
+    created = make_medicines(7, name="Amlo")
+    # Two rows share a timestamp to exercise the id tie-break
+    now = timezone.now()
+    for index, medicine in enumerate(created):
+        MedicineDetail.objects.filter(pk=medicine.pk).update(
+            created_at=now - timedelta(minutes=min(index, 5))
+        )
+    return created
+
+
+def names(response):
+    return [item["name"] for item in response.json()["results"]]
+
+
+@pytest.mark.django_db
+def test_cursor_pages_walk_whole_list(medicines):
+    expected = list(
+        MedicineDetail.objects.order_by("-created_at", "-id").values_list("name", flat=True)
+    )
+
+    seen = []
+    response = client.get("/api/medicines/", {"pagination": "cursor", "page_size": 3})
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.json()
+        seen += names(response)
+        next_link = response.json()["next"]
+        if next_link is None:
+            break
+        response = client.get(next_link)
+
+    assert seen == expected
+
+
+@pytest.mark.django_db
+def test_cursor_previous_link_returns_prior_page(medicines):
+    first = client.get("/api/medicines/", {"pagination": "cursor", "page_size": 3})
+    second = client.get(first.json()["next"])
+    back = client.get(second.json()["previous"])
+    assert names(back) == names(first)
+
+
+@pytest.mark.django_db
+def test_previous_link_off_the_start_stays_in_cursor_mode(medicines):
+    first = client.get("/api/medicines/", {"cursor": "", "page_size": 3})
+    # Every row after the first page goes away before the next one is read
+    MedicineDetail.objects.exclude(name__in=names(first)).delete()
+    empty = client.get(first.json()["next"])
+    assert names(empty) == []
+
+    restart = empty.json()["previous"]
+    assert "cursor=" not in restart.replace("pagination=cursor", "")
+    response = client.get(restart)
+    assert "count" not in response.json()
+    assert sorted(names(response)) == sorted(names(first))
+
+
+@pytest.mark.django_db
+def test_cursor_pages_stable_under_inserts(medicines):
+    first = client.get("/api/medicines/", {"pagination": "cursor", "page_size": 3})
+    MedicineDetail.objects.create(
+        name="Amlo new",
+        generic_name=medicines[0].generic_name,
+        category=medicines[0].category,
+        form=medicines[0].form,
+        manufacturer=medicines[0].manufacturer,
+        description="Inserted between requests",
+        price=Decimal("3.00"),
+        batch_number="AM-new",
+    )
+    second = client.get(first.json()["next"])
+    assert not set(names(first)) & set(names(second))
+    assert "Amlo new" not in names(second)
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_is_rejected(medicines):
+    response = client.get("/api/medicines/", {"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_count_is_cached_across_pages(medicines):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    first = client.get("/api/medicines/search/", {"q": "Amlo", "page_size": 3})
+    assert first.json()["count"] == 7
+    # Exact counts keep the plain DRF shape
+    assert "count_approximate" not in first.json()
+
+    with CaptureQueriesContext(connection) as queries:
+        second = client.get(
+            "/api/medicines/search/", {"q": "Amlo", "page_size": 3, "page": 2}
+        )
+    assert second.json()["count"] == 7
+    assert not any("COUNT(" in q["sql"].upper() for q in queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_count_opt_out_still_paginates(medicines):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/medicines/", {"count": "false", "page_size": 5})
+    assert response.json()["count"] is None
+    assert response.json()["count_approximate"] is False
+    assert len(response.json()["results"]) == 5
+    assert response.json()["next"] is not None
+    assert not any("COUNT(" in q["sql"].upper() for q in queries.captured_queries)
+
+    last = client.get(response.json()["next"])
+    assert len(last.json()["results"]) == 2
+    assert last.json()["next"] is None
+
+
+@pytest.mark.django_db
+def test_estimated_count_is_flagged(medicines, monkeypatch):
+    monkeypatch.setattr(
+        "inventory.api.pagination.estimated_row_count", lambda model: 25000
+    )
+    response = client.get("/api/medicines/", {"page_size": 3})
+    assert response.json()["count"] == 25000
+    assert response.json()["count_approximate"] is True
+
+    # Filtered lists are always counted exactly
+    filtered = client.get("/api/medicines/", {"page_size": 3, "min_price": "0"})
+    assert filtered.json()["count"] == len(medicines)
+    assert "count_approximate" not in filtered.json()
@@ -0,0 +1,133 @@
+# inventory/tests/test_query_budgets.py
+from contextlib import contextmanager
+from unittest import mock
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from inventory.api.auxiliary_views import (
+    GenericNameListCreateView,
+    ManufacturerListCreateView,
+    MedicineCategoryListCreateView,
+    MedicineFormListCreateView,
+)
+from inventory.api.batch_views import MedicineBatchLookupView, MedicineBulkView
+from inventory.api.views import MedicineDetailView, MedicineListView, MedicineSearchView
+from utils.query_budget import get_query_budget
+
+client = APIClient()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Assert that the block stays within the view's declared `query_budget`
+    for `method`, so an N+1 regression fails the test suite.
+    """
+
+    @contextmanager
+    def check(view_class, method):
+        budget = get_query_budget(view_class, method)
+        assert budget is not None, f"{view_class.__name__} declares no {method} budget"
+        with CaptureQueriesContext(connection) as queries:
+            yield queries
+        executed = [query["sql"] for query in queries]
+        assert len(executed) <= budget, (
+            f"{method} {view_class.__name__} ran {len(executed)} queries "
+            f"(budget {budget}):\n" + "\n".join(executed)
+        )
+
+    return check
+
+
+@pytest.fixture
+def medicines(make_medicines):
+    return make_medicines(20, name="Monas")
+
+
+def item(medicine, batch_number):
+    return {
+        "name": "Monas 10",
+        "generic_name": medicine.generic_name_id,
+        "category": medicine.category_id,
+        "form": medicine.form_id,
+        "manufacturer": medicine.manufacturer_id,
+        "description": "Prevents asthma attacks",
+        "price": "16.00",
+        "batch_number": batch_number,
+    }
+
+
+@pytest.mark.django_db
+def test_read_endpoints_stay_within_budget(medicines, query_budget):
+    with query_budget(MedicineListView, "GET"):
+        assert client.get("/api/medicines/").status_code == 200
+    with query_budget(MedicineDetailView, "GET"):
+        response = client.get(f"/api/medicines/{medicines[0].pk}/")
+    assert response.data["data"]["manufacturer_details"]["name"] == "Incepta Pharmaceuticals Ltd."
+    with query_budget(MedicineSearchView, "GET"):
+        assert client.get("/api/medicines/search/", {"q": "Monas"}).status_code == 200
+    with query_budget(MedicineBatchLookupView, "POST"):
+        ids = [str(medicine.pk) for medicine in medicines]
+        client.post("/api/medicines/batch-lookup/", {"ids": ids}, format="json")
+
+    for view_class, url in (
+        (GenericNameListCreateView, "/api/generic-names/"),
+        (MedicineCategoryListCreateView, "/api/categories/"),
+        (MedicineFormListCreateView, "/api/forms/"),
+        (ManufacturerListCreateView, "/api/manufacturers/"),
+    ):
+        with query_budget(view_class, "GET"):
+            assert client.get(url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_write_endpoints_stay_within_budget(medicines, admin_client, query_budget):
+    with query_budget(MedicineListView, "POST"):
+        response = admin_client.post("/api/medicines/", item(medicines[0], "MO-NEW"), format="json")
+    assert response.status_code == 201
+    with query_budget(MedicineDetailView, "PUT"):
+        admin_client.put(f"/api/medicines/{medicines[0].pk}/", {"price": "17.00"}, format="json")
+    with query_budget(MedicineDetailView, "DELETE"):
+        admin_client.delete(f"/api/medicines/{medicines[1].pk}/")
+
+
+@pytest.mark.django_db
+def test_bulk_queries_do_not_grow_with_batch_size(medicines, admin_client, query_budget):
+    with query_budget(MedicineBulkView, "POST") as small:
+        admin_client.post(
+            "/api/medicines/bulk/", [item(medicines[0], "BK0")], format="json"
+        )
+    with query_budget(MedicineBulkView, "POST") as large:
+        admin_client.post(
+            "/api/medicines/bulk/",
+            [item(medicines[0], f"BK{index}") for index in range(1, 40)],
+            format="json",
+        )
+    assert len(large) == len(small)
+
+    ids = [str(medicine.pk) for medicine in medicines[2:]]
+    with query_budget(MedicineBulkView, "PUT"):
+        admin_client.put(
+            "/api/medicines/bulk/", [{"id": pk, "stock_quantity": 3} for pk in ids], format="json"
+        )
+    with query_budget(MedicineBulkView, "DELETE"):
+        admin_client.delete("/api/medicines/bulk/", {"ids": ids}, format="json")
+
+
+@pytest.mark.django_db
+def test_middleware_reports_queries(medicines, settings):
+    settings.DEBUG = True
+    response = client.get(f"/api/medicines/{medicines[0].pk}/")
+    assert response["X-Query-Count"] == "2"
+    assert response["X-Query-Duplicates"] == "0"
+    assert float(response["X-Query-Time-Ms"]) >= 0
+
+    settings.DEBUG = False
+    with mock.patch("utils.query_budget.app_logger") as logger, mock.patch.object(
+        MedicineSearchView, "query_budget", {"GET": 0}
+    ):
+        response = client.get("/api/medicines/search/", {"q": "Monas"})
+    assert "X-Query-Count" not in response
+    assert logger.info.call_args.args[0].startswith("query_metrics")
+    assert logger.warning.call_args.args[0].startswith("Query budget exceeded")
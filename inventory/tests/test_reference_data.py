@@ -0,0 +1,104 @@
+# inventory/tests/test_reference_data.py
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+from inventory.api.reference_data import cache_manager
+from inventory.models import GenericName, MedicineCategory, MedicineForm, Manufacturer
+
+client = APIClient()
+
+
+@pytest.fixture
+def reference_data():
+    GenericName.objects.bulk_create(
+        [GenericName(name=name) for name in ("Paracetamol", "Omeprazole", "Cetirizine")]
+    )
+    MedicineCategory.objects.create(name="Analgesic")
+    MedicineForm.objects.create(form_type="TBL")
+    Manufacturer.objects.create(name="Square Pharmaceuticals Ltd.")
+
+
+@pytest.mark.django_db
+def test_reference_list_is_unpaginated_by_default(reference_data):
+    response = client.get("/api/generic-names/")
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["name"] for item in response.data["data"]] == [
+        "Paracetamol",
+        "Omeprazole",
+        "Cetirizine",
+    ]
+    assert response["ETag"].startswith('W/"')
+
+
+@pytest.mark.django_db
+def test_reference_list_paginates_on_request(reference_data):
+    response = client.get("/api/generic-names/?page=2&page_size=2")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.data["data"]
+    assert data["count"] == 3
+    assert [item["name"] for item in data["results"]] == ["Cetirizine"]
+    assert data["next"] is None
+    assert data["previous"] is not None
+
+
+@pytest.mark.django_db
+def test_reference_list_answers_not_modified(reference_data):
+    etag = client.get("/api/categories/")["ETag"]
+    response = client.get("/api/categories/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+
+    # Also when the response has to be built again
+    cache_manager.redis.flushdb()
+    response = client.get("/api/categories/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+
+
+@pytest.mark.django_db
+def test_etag_survives_a_restarted_version_counter(
+    reference_data, django_capture_on_commit_callbacks
+):
+    first = client.get("/api/categories/")
+    with django_capture_on_commit_callbacks(execute=True):
+        MedicineCategory.objects.create(name="Antacid")
+    # Flushed, evicted or failed over: the version is back where it started
+    cache_manager.redis.flushdb()
+
+    response = client.get("/api/categories/", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["name"] for item in response.data["data"]] == ["Analgesic", "Antacid"]
+
+    # Replayed from the cache with the ETag stored next to the body
+    replayed = client.get("/api/categories/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert replayed.status_code == status.HTTP_304_NOT_MODIFIED
+    assert replayed["ETag"] == response["ETag"]
+
+
+@pytest.mark.django_db
+def test_reference_write_changes_etag_and_data(
+    reference_data, django_capture_on_commit_callbacks
+):
+    first = client.get("/api/reference-data/")
+    with django_capture_on_commit_callbacks(execute=True):
+        MedicineCategory.objects.create(name="Antacid")
+
+    response = client.get("/api/reference-data/", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != first["ETag"]
+    assert response.data["data"]["version"] == first.data["data"]["version"] + 1
+    assert [item["name"] for item in response.data["data"]["categories"]] == [
+        "Analgesic",
+        "Antacid",
+    ]
+
+
+@pytest.mark.django_db
+def test_reference_snapshot_contains_every_table(reference_data):
+    response = client.get("/api/reference-data/")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.data["data"]
+    assert len(data["generic_names"]) == 3
+    assert [item["name"] for item in data["categories"]] == ["Analgesic"]
+    assert [item["form_type"] for item in data["forms"]] == ["TBL"]
+    assert [item["name"] for item in data["manufacturers"]] == ["Square Pharmaceuticals Ltd."]
@@ -0,0 +1,170 @@
+# inventory/tests/test_replica_routing.py
+import time
+from decimal import Decimal
+from unittest import mock
+import pytest
+from django.db import router
+from django.test import override_settings
+from rest_framework.test import APIClient
+from inventory.models import (
+    MedicineDetail,
+    GenericName,
+    MedicineCategory,
+    MedicineForm,
+    Manufacturer,
+)
+from utils.db_router import (
+    PRIMARY_COOKIE,
+    PRIMARY_HEADER,
+    replica_health,
+    replica_lag,
+    replica_reads,
+)
+
+client = APIClient()
+
+REPLICAS = ["replica_1", "replica_2"]
+
+
+@pytest.fixture(autouse=True)
+def reset_replicas():
+    replica_health.reset()
+    client.cookies.clear()
+    yield
+    replica_health.reset()
+
+
+@pytest.fixture
+def lags():
+    """Patch the replica health probe with a {alias: lag} mapping."""
+    values = {}
+    with mock.patch("utils.db_router.replica_lag", side_effect=values.get) as probe:
+        probe.values = values
+        yield probe
+
+
+@pytest.fixture
+def medicine():
+    return MedicineDetail.objects.create(
+        name="Fexo",
+        generic_name=GenericName.objects.create(name="Fexofenadine"),
+        category=MedicineCategory.objects.create(name="Antihistamine"),
+        form=MedicineForm.objects.create(form_type="TBL"),
+        manufacturer=Manufacturer.objects.create(name="Square Pharmaceuticals Ltd."),
+        description="Relieves allergy symptoms",
+        price=Decimal("8.00"),
+        batch_number="FX1",
+    )
+
+
+def read(api_client, path, **extra):
+    """
+    GET `path` as the browsable API, whose responses are never cached, so the
+    view always queries the database and may use a replica.
+    """
+    return api_client.get(path, HTTP_ACCEPT="text/html", **extra)
+
+
+@override_settings(REPLICA_DATABASES=REPLICAS, REPLICA_MAX_LAG=5)
+def test_replica_reads_skip_lagging_replicas(lags):
+    lags.values.update({"replica_1": 30.0, "replica_2": 1.0})
+
+    with replica_reads():
+        assert router.db_for_read(MedicineDetail) == "replica_2"
+        assert router.db_for_write(MedicineDetail) == "default"
+    assert router.db_for_read(MedicineDetail) == "default"
+
+
+@override_settings(REPLICA_DATABASES=REPLICAS, REPLICA_HEALTH_CHECK_INTERVAL=60)
+def test_unhealthy_replicas_fall_back_to_primary(lags):
+    # None: unreachable, or replication stopped
+    lags.values.update({"replica_1": None, "replica_2": None})
+
+    with replica_reads():
+        assert router.db_for_read(MedicineDetail) == "default"
+        assert router.db_for_read(MedicineDetail) == "default"
+    # Checked once per interval, not per query
+    assert lags.call_count == len(REPLICAS)
+
+
+def test_replica_without_replication_is_unhealthy():
+    cursor = mock.MagicMock()
+    cursor.fetchone.return_value = None  # SHOW REPLICA STATUS on a primary
+    connection = mock.MagicMock(vendor="mysql")
+    connection.cursor.return_value.__enter__.return_value = cursor
+    with mock.patch("utils.db_router.connections", {"replica_1": connection}):
+        assert replica_lag("replica_1") is None
+
+
+@pytest.mark.django_db
+@override_settings(REPLICA_DATABASES=["default"])
+def test_writes_pin_the_client_to_the_primary(medicine, admin_client):
+    # The replica is the primary here; the spy shows when replicas are chosen
+    with mock.patch.object(replica_health, "available", return_value=["default"]) as chosen:
+        assert read(admin_client, "/api/medicines/").status_code == 200
+        assert chosen.called
+
+        # A POST that only reads leaves the client on the replicas
+        response = admin_client.post(
+            "/api/medicines/batch-lookup/", {"ids": [str(medicine.pk)]}, format="json"
+        )
+        assert response.status_code == 200
+        assert PRIMARY_COOKIE not in response.cookies
+        assert PRIMARY_HEADER not in response
+
+        response = admin_client.post(
+            f"/api/medicines/{medicine.pk}/stock/", {"delta": 1}, format="json"
+        )
+        assert response.status_code == 200
+        assert PRIMARY_COOKIE in response.cookies
+        token = response[PRIMARY_HEADER]
+
+        chosen.reset_mock()
+        read(admin_client, f"/api/medicines/{medicine.pk}/")
+        assert not chosen.called
+
+        # API clients without cookies send the header back instead
+        admin_client.cookies.clear()
+        read(admin_client, "/api/medicines/", HTTP_X_READ_PRIMARY_UNTIL=token)
+        assert not chosen.called
+
+        expired = str(int(time.time()) - 1)
+        read(admin_client, "/api/medicines/", HTTP_X_READ_PRIMARY_UNTIL=expired)
+        assert chosen.called
+
+
+@pytest.mark.django_db
+@override_settings(REPLICA_DATABASES=["default"])
+def test_cache_fills_read_from_replicas_that_applied_the_last_write(
+    medicine, django_capture_on_commit_callbacks
+):
+    chosen = mock.patch.object(replica_health, "available", wraps=replica_health.available)
+    with chosen as chosen:
+        for path in ("/api/medicines/", f"/api/medicines/{medicine.pk}/", "/api/forms/"):
+            assert client.get(path).status_code == 200
+            assert chosen.called
+            chosen.reset_mock()
+            assert client.get(path).status_code == 200  # Replayed from Redis
+            assert not chosen.called
+
+        with django_capture_on_commit_callbacks(execute=True):
+            medicine.price = Decimal("9.00")
+            medicine.save()
+
+        # The replica may not have the write yet: it would store the old price
+        response = client.get(f"/api/medicines/{medicine.pk}/")
+        assert response.json()["data"]["price"] == "9.00"
+        assert not chosen.called
+
+        # Health checked since the write, without lag
+        with mock.patch.object(replica_health, "applied_until", return_value=time.time()):
+            assert client.get("/api/medicines/").status_code == 200
+        assert chosen.called
+
+
+@pytest.mark.django_db
+@override_settings(REPLICA_DATABASES=["default"])
+def test_only_marked_views_read_from_replicas(medicine):
+    with mock.patch.object(replica_health, "available", return_value=["default"]) as chosen:
+        read(client, "/api/medicines/export/")
+    assert not chosen.called
@@ -0,0 +1,151 @@
+from unittest import mock
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, RequestFactory, override_settings
+from prometheus_client import REGISTRY
+from django.urls import path
+from rest_framework.test import APIClient
+from inventory.api.async_views import async_read_view
+from inventory.api.views import MedicineDetailView
+from utils.db_router import track_primary_writes
+from utils.metrics import metrics_view
+from utils.query_budget import count_queries
+from utils.request_timing import (
+    PHASES,
+    RequestTimingMiddleware,
+    RequestTimings,
+    install_query_timing,
+    time_queries,
+    timed,
+)
+
+# For test_async_views_are_timed: the detail view behind its async entry point
+urlpatterns = [path("api/medicines/<uuid:pk>/", async_read_view(MedicineDetailView))]
+
+
+@pytest.fixture
+def metrics_enabled():
+    """REQUEST_METRICS on, for clients created inside the test."""
+    with override_settings(REQUEST_METRICS=True):
+        yield
+    connection_created.disconnect(dispatch_uid="request_timing")
+    if time_queries in connection.execute_wrappers:
+        connection.execute_wrappers.remove(time_queries)
+
+
+def server_timing(response):
+    """{metric: milliseconds} from the Server-Timing header."""
+    timings = {}
+    for metric in response["Server-Timing"].split(", "):
+        name, duration = metric.split(";dur=")
+        timings[name] = float(duration)
+    return timings
+
+
+def request_count(view, status="200"):
+    labels = {"view": view, "method": "GET", "status": status}
+    return REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) or 0
+
+
+@pytest.mark.django_db
+def test_server_timing_splits_a_request_into_phases(medicines, metrics_enabled):
+    client = APIClient()
+    before = request_count("MedicineListView")
+
+    response = client.get("/api/medicines/")
+    assert response.status_code == 200
+    timings = server_timing(response)
+    assert list(timings) == [*PHASES, "app", "total"]
+    assert timings["db"] > 0
+    assert timings["cache"] > 0
+    assert timings["serialize"] > 0
+    assert timings["render"] > 0
+    assert sum(timings[phase] for phase in (*PHASES, "app")) == pytest.approx(
+        timings["total"], abs=0.5
+    )
+
+    # Replayed from Redis: no queries, nothing serialized or rendered
+    cached = server_timing(client.get("/api/medicines/"))
+    assert cached["db"] == cached["serialize"] == cached["render"] == 0
+    assert cached["cache"] > 0
+
+    assert request_count("MedicineListView") == before + 2
+    phase_count = REGISTRY.get_sample_value(
+        "http_request_phase_duration_seconds_count", {"view": "MedicineListView", "phase": "db"}
+    )
+    assert phase_count >= 2
+
+
+@pytest.mark.django_db
+def test_query_timing_survives_other_execute_wrappers(medicines, metrics_enabled):
+    # The query budget and replica routing middleware install their own
+    # wrappers per connection as well
+    client = APIClient()
+    client.get(f"/api/medicines/{medicines[0].pk}/")
+    client.get("/api/medicines/search/?q=napa")
+    install_query_timing()  # Idempotent
+    assert len(connection.execute_wrappers) == 3
+    assert set(connection.execute_wrappers) == {time_queries, count_queries, track_primary_writes}
+
+
+@pytest.mark.django_db
+@pytest.mark.urls(__name__)
+def test_async_views_are_timed(medicines, metrics_enabled):
+    # The middleware is loaded on the event loop's thread; the test database
+    # connection lives on this one and was opened before the middleware
+    install_query_timing()
+    response = async_to_sync(AsyncClient().get)(f"/api/medicines/{medicines[0].pk}/")
+    assert response.status_code == 200
+    timings = server_timing(response)
+    assert timings["db"] > 0
+    assert timings["serialize"] > 0
+
+
+@pytest.mark.django_db
+def test_disabled_metrics_remove_the_middleware(medicines):
+    with override_settings(REQUEST_METRICS=False):
+        with pytest.raises(MiddlewareNotUsed):
+            RequestTimingMiddleware(lambda request: None)
+        response = APIClient().get("/api/medicines/")
+    assert response.status_code == 200
+    assert not response.has_header("Server-Timing")
+    assert time_queries not in connection.execute_wrappers
+
+
+def test_phases_are_exclusive():
+    clock = iter([0.0, 1.0, 1.5, 3.0, 4.0])
+    with mock.patch("utils.request_timing.time.perf_counter", lambda: next(clock)):
+        timings = RequestTimings()  # 0.0
+        timings.enter("serialize")  # 1.0
+        timings.enter("db")  # 1.5
+        timings.exit()  # 3.0
+        timings.exit()  # 4.0
+    assert timings.durations["db"] == 1.5
+    assert timings.durations["serialize"] == 1.5
+    assert timings.server_timing(5.0) == (
+        "db;dur=1500.000, cache;dur=0.000, serialize;dur=1500.000, render;dur=0.000, "
+        "app;dur=2000.000, total;dur=5000.000"
+    )
+
+
+def test_timed_calls_through_outside_a_request():
+    @timed("cache")
+    def lookup(key):
+        return key.upper()
+
+    assert lookup("hit") == "HIT"
+    assert lookup.__name__ == "lookup"
+
+
+@pytest.mark.django_db
+def test_metrics_view_exports_the_histograms(medicines, metrics_enabled):
+    APIClient().get("/api/medicines/")
+    response = metrics_view(RequestFactory().get("/metrics"))
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    body = response.content.decode()
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_request_phase_duration_seconds_bucket{le="0.001",phase="render",view="MedicineListView"}' in body
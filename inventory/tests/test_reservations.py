@@ -0,0 +1,253 @@
+# inventory/tests/test_reservations.py
+import pytest
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+from inventory.api import live_stock
+from inventory.api.reservations import flush_stock_deltas, reconcile_stock
+from inventory.api.stock import apply_stock_deltas
+from inventory.cache_keys import STOCK_AVAILABLE_KEY_TEMPLATE
+from inventory.exceptions import InsufficientStockError
+from inventory.models import MedicineDetail
+from inventory.signals import cache_manager
+
+client = APIClient()
+
+
+@pytest.fixture
+def medicines(make_medicines):
+    return make_medicines(2, stock_quantity=5)
+
+
+def live(medicine):
+    value = cache_manager.redis.get(STOCK_AVAILABLE_KEY_TEMPLATE.format(medicine.pk))
+    return int(value) if value is not None else None
+
+
+def reserve(medicine, quantity, **extra):
+    return client.post(
+        "/api/reservations/",
+        {"items": [{"id": str(medicine.pk), "quantity": quantity}], **extra},
+        format="json",
+    )
+
+
+@pytest.mark.django_db
+def test_reserve_takes_live_stock_only(medicines, admin_client):
+    response = reserve(medicines[0], 3)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["data"]["items"] == [{"id": str(medicines[0].pk), "quantity": 3}]
+    assert live(medicines[0]) == 2
+    medicines[0].refresh_from_db()
+    assert medicines[0].stock_quantity == 5
+
+
+@pytest.mark.django_db
+def test_reserve_is_all_or_nothing(medicines, admin_client):
+    response = admin_client.post(
+        "/api/reservations/",
+        {
+            "items": [
+                {"id": str(medicines[0].pk), "quantity": 2},
+                {"id": str(medicines[1].pk), "quantity": 6},
+            ]
+        },
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert str(medicines[1].pk) in response.data["message"]
+    assert live(medicines[0]) == 5
+    assert live(medicines[1]) == 5
+
+
+@pytest.mark.django_db
+def test_reserve_rejects_invalid_payload(medicines, admin_client):
+    assert reserve(medicines[0], 0).status_code == status.HTTP_400_BAD_REQUEST
+    assert reserve(medicines[0], 1, ttl=0).status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_release_returns_units(medicines, admin_client):
+    reservation_id = reserve(medicines[0], 4).data["data"]["id"]
+
+    response = admin_client.delete(f"/api/reservations/{reservation_id}/")
+    again = admin_client.delete(f"/api/reservations/{reservation_id}/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert again.status_code == status.HTTP_404_NOT_FOUND
+    assert live(medicines[0]) == 5
+
+
+@pytest.mark.django_db
+def test_commit_is_written_by_flush(medicines, admin_client):
+    reservation_id = reserve(medicines[0], 4).data["data"]["id"]
+
+    response = admin_client.post(f"/api/reservations/{reservation_id}/commit/")
+    medicines[0].refresh_from_db()
+    assert response.status_code == status.HTTP_200_OK
+    assert medicines[0].stock_quantity == 5
+
+    assert flush_stock_deltas() == (1, [])
+    medicines[0].refresh_from_db()
+    assert medicines[0].stock_quantity == 1
+    assert medicines[0].is_available is True
+    assert live(medicines[0]) == 1
+    assert reconcile_stock() == ([], [])
+
+
+@pytest.mark.django_db
+def test_flush_retried_after_dying_writes_once(medicines, admin_client, monkeypatch):
+    for medicine in medicines:
+        reservation_id = reserve(medicine, 2).data["data"]["id"]
+        admin_client.post(f"/api/reservations/{reservation_id}/commit/")
+
+    # The first chunk commits, then Redis fails before its deltas are cleared
+    def fail(ids, dead=None):
+        raise ConnectionError("Redis went away")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(live_stock, "flushed", fail)
+        with pytest.raises(ConnectionError):
+            flush_stock_deltas(chunk_size=1)
+
+    assert flush_stock_deltas(chunk_size=1) == (len(medicines) - 1, [])
+    assert flush_stock_deltas() == (0, [])
+    for medicine in medicines:
+        medicine.refresh_from_db()
+        assert medicine.stock_quantity == live(medicine) == 3
+    assert reconcile_stock() == ([], [])
+
+
+@pytest.mark.django_db
+def test_direct_decrement_cannot_take_units_sold_through_reservations(medicines, admin_client):
+    reservation_id = reserve(medicines[0], 5).data["data"]["id"]
+    admin_client.post(f"/api/reservations/{reservation_id}/commit/")
+
+    response = admin_client.post(
+        f"/api/medicines/{medicines[0].pk}/stock/", {"delta": -5}, format="json"
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+    with pytest.raises(InsufficientStockError):
+        apply_stock_deltas({str(medicines[0].pk): -5})
+    assert live(medicines[0]) == 0
+
+    # Units taken from live stock are given back when the table rejects the batch
+    reserve(medicines[1], 1)
+    response = admin_client.post(
+        "/api/medicines/stock/",
+        {
+            "adjustments": [
+                {"id": str(medicines[1].pk), "delta": -2},
+                {"id": "00000000-0000-0000-0000-000000000000", "delta": -1},
+            ]
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert live(medicines[1]) == 4
+
+    assert flush_stock_deltas() == (1, [])
+    medicines[0].refresh_from_db()
+    assert medicines[0].stock_quantity == 0
+    assert reconcile_stock() == ([], [])
+
+
+@pytest.mark.django_db
+def test_deltas_the_table_cannot_take_are_dead_lettered(medicines, admin_client):
+    reservation_id = reserve(medicines[0], 4).data["data"]["id"]
+    admin_client.post(f"/api/reservations/{reservation_id}/commit/")
+    # Stock counted lower behind the reservations' back
+    MedicineDetail.objects.filter(pk=medicines[0].pk).update(stock_quantity=2)
+
+    assert flush_stock_deltas() == (0, [str(medicines[0].pk)])
+    assert live_stock.dead_deltas() == {str(medicines[0].pk): -4}
+    # The sale still counts against live stock
+    assert reconcile_stock() == ([(str(medicines[0].pk), 1, -2)], [])
+
+    MedicineDetail.objects.filter(pk=medicines[0].pk).update(stock_quantity=6)
+    call_command("reconcile_stock", "--requeue-dead")
+    assert live_stock.dead_deltas() == {}
+    assert flush_stock_deltas() == (1, [])
+    medicines[0].refresh_from_db()
+    assert medicines[0].stock_quantity == live(medicines[0]) == 2
+    assert reconcile_stock() == ([], [])
+
+
+@pytest.mark.django_db
+def test_expired_reservations_are_released(medicines, admin_client):
+    reservation_id = reserve(medicines[0], 5).data["data"]["id"]
+    cache_manager.redis.zadd(live_stock.STOCK_RESERVATION_EXPIRY_KEY, {reservation_id: 0})
+
+    # The sweep runs before a short reservation is rejected
+    assert reserve(medicines[0], 2).status_code == status.HTTP_201_CREATED
+    assert live(medicines[0]) == 3
+    commit = admin_client.post(f"/api/reservations/{reservation_id}/commit/")
+    assert commit.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_direct_adjustment_moves_live_stock(
+    medicines, admin_client, django_capture_on_commit_callbacks
+):
+    reserve(medicines[0], 1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.post(
+            f"/api/medicines/{medicines[0].pk}/stock/", {"delta": 3}, format="json"
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert live(medicines[0]) == 7
+    assert reconcile_stock() == ([], [])
+
+
+@pytest.mark.django_db
+def test_stock_set_outright_moves_live_stock(
+    medicines, admin_client, django_capture_on_commit_callbacks, tmp_path
+):
+    reserve(medicines[0], 1)
+    reserve(medicines[1], 1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.put(
+            f"/api/medicines/{medicines[0].pk}/", {"stock_quantity": 8}, format="json"
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert live(medicines[0]) == 7
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.put(
+            "/api/medicines/bulk/",
+            [{"id": str(medicines[0].pk), "stock_quantity": 2}, {"id": str(medicines[1].pk)}],
+            format="json",
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert live(medicines[0]) == 1
+    assert live(medicines[1]) == 4
+
+    catalog = tmp_path / "catalog.csv"
+    catalog.write_text(
+        "name,description,price,batch_number,stock_quantity,generic_name,category,form\n"
+        "Seclo 1,Reduces stomach acid,6.00,SC1,12,Omeprazole,Antacid,CAP\n"
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("import_medicines", str(catalog), "--workers", "0")
+    assert live(medicines[1]) == 11
+    assert reconcile_stock() == ([], [])
+
+
+@pytest.mark.django_db
+def test_reconcile_repairs_drift(medicines, admin_client):
+    reserve(medicines[0], 2)
+    # A stock change that bypassed the API
+    MedicineDetail.objects.filter(pk=medicines[0].pk).update(stock_quantity=9)
+
+    call_command("reconcile_stock", "--dry-run")
+    assert live(medicines[0]) == 3
+
+    drift, unchecked = reconcile_stock()
+    assert drift == [(str(medicines[0].pk), 3, 7)]
+    assert unchecked == []
+    assert live(medicines[0]) == 7
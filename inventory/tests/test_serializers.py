@@ -77,9 +77,47 @@ def test_featured_constraint_in_serializer():
         "is_featured": True,
     }
 
+    # The rule is enforced by the database constraint when saving
     serializer = MedicineDetailSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
     with pytest.raises(
         FeaturedMedicineInvalidError,
         match="Only one featured medicine is allowed per generic name",
     ):
-        serializer.is_valid(raise_exception=True)
+        serializer.save()
+    assert MedicineDetail.objects.filter(generic_name=generic_name).count() == 1
+
+
+@pytest.mark.django_db
+def test_row_mapper_matches_serializer_output():
+    from rest_framework.renderers import JSONRenderer
+    from inventory.api.fieldsets import Fieldset
+    from inventory.api.row_mappers import get_row_mapper
+
+    generic_name = GenericName.objects.create(name="Losartan")
+    category = MedicineCategory.objects.create(name="Antihypertensive")
+    form = MedicineForm.objects.create(form_type="TBL", description="Tablet form")
+    manufacturer = Manufacturer.objects.create(name="Renata Limited")
+    for index, price in enumerate([Decimal("7.5"), Decimal("12.00"), Decimal("0.99")]):
+        MedicineDetail.objects.create(
+            name=f"Losartan {index}",
+            generic_name=generic_name,
+            category=category,
+            form=form,
+            manufacturer=manufacturer,
+            description="Blood pressure control",
+            price=price,
+            batch_number=f"LS{index}",
+            prescription_required=True,
+        )
+    # A medicine whose manufacturer was removed renders null details
+    MedicineDetail.objects.filter(batch_number="LS2").update(manufacturer=None)
+
+    for fieldset in (Fieldset(), Fieldset(["name", "price"], ["manufacturer"])):
+        mapper = get_row_mapper(fieldset)
+        mapped = mapper.map_rows(MedicineDetail.objects.values_list(*mapper.columns))
+        serialized = MedicineDetailSerializer(
+            fieldset.apply(MedicineDetail.objects.all()), many=True, fieldset=fieldset
+        ).data
+        # Byte-identical once rendered, including key order and formatting
+        assert JSONRenderer().render(mapped) == JSONRenderer().render(serialized)
@@ -0,0 +1,83 @@
+# inventory/tests/test_signals.py
+from decimal import Decimal
+from unittest import mock
+import pytest
+from django.db import transaction
+from inventory.cache_keys import (
+    MEDICINE_DETAIL_CACHE_KEY_TEMPLATE,
+    MEDICINE_ITEM_CACHE_KEY_TEMPLATE,
+)
+from inventory.models import MedicineDetail
+from inventory.signals import cache_manager
+
+
+@pytest.fixture
+def medicines(make_medicines, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        return make_medicines()
+
+
+@pytest.mark.django_db
+def test_invalidation_waits_for_commit_and_is_coalesced(medicines, django_capture_on_commit_callbacks):
+    detail_key = MEDICINE_DETAIL_CACHE_KEY_TEMPLATE.format(medicines[0].id)
+    cache_manager.set(detail_key, {"cached": True})
+
+    with mock.patch.object(cache_manager, "invalidate", wraps=cache_manager.invalidate) as invalidate:
+        with django_capture_on_commit_callbacks(execute=True):
+            for medicine in medicines:
+                medicine.price = Decimal("7.00")
+                medicine.save()
+            # Still inside the transaction: nothing was invalidated yet
+            assert cache_manager.get(detail_key) == {"cached": True}
+
+    assert invalidate.call_count == 1
+    keys = invalidate.call_args.args[0]
+    assert len([key for key in keys if key.startswith("medicine_detail_")]) == 3
+    assert cache_manager.get(detail_key) is None
+
+
+@pytest.mark.django_db
+def test_rolled_back_writes_are_not_invalidated_later(
+    medicines, django_capture_on_commit_callbacks
+):
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            medicines[0].price = Decimal("7.00")
+            medicines[0].save()
+            raise RuntimeError("Roll back")
+
+    with mock.patch.object(cache_manager, "invalidate", wraps=cache_manager.invalidate) as invalidate:
+        with django_capture_on_commit_callbacks(execute=True):
+            medicines[1].price = Decimal("7.00")
+            medicines[1].save()
+
+    (call,) = invalidate.call_args_list
+    assert call.args[0] == [
+        MEDICINE_DETAIL_CACHE_KEY_TEMPLATE.format(medicines[1].id),
+        MEDICINE_ITEM_CACHE_KEY_TEMPLATE.format(medicines[1].id),
+    ]
+
+
+@pytest.mark.django_db
+def test_unchanged_save_skips_invalidation(medicines, django_capture_on_commit_callbacks):
+    medicine = MedicineDetail.objects.get(pk=medicines[0].pk)
+    with django_capture_on_commit_callbacks() as callbacks:
+        medicine.save()
+        medicine.save(update_fields=["updated_at"])
+    assert callbacks == []
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        medicine.stock_quantity = 5
+        medicine.save()
+    assert len(callbacks) == 1
+
+
+@pytest.mark.django_db
+def test_rolled_back_write_does_not_invalidate(medicines, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                medicines[0].name = "Seclo 40"
+                medicines[0].save()
+                raise RuntimeError
+    assert callbacks == []
@@ -0,0 +1,140 @@
+# inventory/tests/test_stock.py
+import uuid
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from inventory.api.stock_views import MedicineStockBatchView
+from inventory.cache_keys import (
+    MEDICINE_DETAIL_CACHE_KEY_TEMPLATE,
+    MEDICINE_LIST_GENERATION_KEY,
+)
+from inventory.models import MedicineDetail
+from inventory.signals import cache_manager, pending_invalidation
+
+client = APIClient()
+
+
+@pytest.fixture
+def medicines(make_medicines):
+    return make_medicines(stock_quantity=5)
+
+
+def stock_url(medicine):
+    return f"/api/medicines/{medicine.pk}/stock/"
+
+
+@pytest.mark.django_db
+def test_decrement_applies_delta(medicines, admin_client):
+    response = admin_client.post(stock_url(medicines[0]), {"delta": -2}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["data"] == {
+        "id": str(medicines[0].pk),
+        "stock_quantity": 3,
+        "is_available": True,
+    }
+    medicines[0].refresh_from_db()
+    assert medicines[0].stock_quantity == 3
+
+
+@pytest.mark.django_db
+def test_availability_follows_zero_stock(medicines, admin_client):
+    response = admin_client.post(stock_url(medicines[0]), {"delta": -5}, format="json")
+    assert response.data["data"]["is_available"] is False
+
+    response = admin_client.post(stock_url(medicines[0]), {"delta": 10}, format="json")
+    assert response.data["data"] == {
+        "id": str(medicines[0].pk),
+        "stock_quantity": 10,
+        "is_available": True,
+    }
+
+
+@pytest.mark.django_db
+def test_restock_keeps_manually_unavailable_medicine_unavailable(medicines, admin_client):
+    MedicineDetail.objects.filter(pk=medicines[0].pk).update(is_available=False)
+    response = admin_client.post(stock_url(medicines[0]), {"delta": 1}, format="json")
+    assert response.data["data"]["is_available"] is False
+
+
+@pytest.mark.django_db
+def test_overdraw_is_rejected(medicines, admin_client):
+    response = admin_client.post(stock_url(medicines[0]), {"delta": -6}, format="json")
+    assert response.status_code == status.HTTP_409_CONFLICT
+    medicines[0].refresh_from_db()
+    assert medicines[0].stock_quantity == 5
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("delta", [0, "3", True, None, 1.5])
+def test_invalid_delta_is_rejected(medicines, admin_client, delta):
+    response = admin_client.post(stock_url(medicines[0]), {"delta": delta}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_unknown_medicine_returns_not_found(admin_client):
+    response = admin_client.post(
+        f"/api/medicines/{uuid.uuid4()}/stock/", {"delta": 1}, format="json"
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_adjustment_requires_admin(medicines):
+    response = client.post(stock_url(medicines[0]), {"delta": -1}, format="json")
+    assert response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+
+
+@pytest.mark.django_db
+def test_batch_is_all_or_nothing(medicines, admin_client):
+    adjustments = [
+        {"id": str(medicines[0].pk), "delta": -1},
+        {"id": str(medicines[1].pk), "delta": -9},
+    ]
+    response = admin_client.post(
+        "/api/medicines/stock/", {"adjustments": adjustments}, format="json"
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert str(medicines[1].pk) in response.data["message"]
+    assert set(MedicineDetail.objects.values_list("stock_quantity", flat=True)) == {5}
+
+
+@pytest.mark.django_db
+def test_batch_sums_repeated_ids_in_one_update(medicines, admin_client):
+    adjustments = [
+        {"id": str(medicines[0].pk), "delta": -1},
+        {"id": str(medicines[1].pk), "delta": 4},
+        {"id": str(medicines[0].pk), "delta": -2},
+    ]
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.post(
+            "/api/medicines/stock/", {"adjustments": adjustments}, format="json"
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert [row["stock_quantity"] for row in response.data["data"]] == [2, 9]
+    updates = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+    assert len(updates) == 1
+    assert len(queries) <= MedicineStockBatchView.query_budget["POST"]
+
+
+@pytest.mark.django_db
+def test_stock_change_invalidates_only_the_detail(
+    medicines, admin_client, django_capture_on_commit_callbacks
+):
+    pending_invalidation().drain()  # Writes made by the fixture
+    client.get(f"/api/medicines/{medicines[0].pk}/")
+    detail_key = MEDICINE_DETAIL_CACHE_KEY_TEMPLATE.format(medicines[0].pk)
+    assert cache_manager.redis.exists(detail_key)
+    generation = cache_manager.get(MEDICINE_LIST_GENERATION_KEY)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        admin_client.post(stock_url(medicines[0]), {"delta": -1}, format="json")
+    assert not cache_manager.redis.exists(detail_key)
+    assert cache_manager.get(MEDICINE_LIST_GENERATION_KEY) == generation
+
+    # Running out changes availability, which lists show
+    with django_capture_on_commit_callbacks(execute=True):
+        admin_client.post(stock_url(medicines[0]), {"delta": -4}, format="json")
+    assert cache_manager.get(MEDICINE_LIST_GENERATION_KEY) == (generation or 0) + 1
@@ -0,0 +1,226 @@
+# inventory/tests/test_stock_summary.py
+from decimal import Decimal
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from inventory.models import (
+    MedicineDetail,
+    GenericName,
+    MedicineCategory,
+    MedicineForm,
+    Manufacturer,
+    StockSummary,
+)
+from inventory.stock_summary import refresh_stock_summaries
+
+client = APIClient()
+
+
+@pytest.fixture
+def catalog(django_capture_on_commit_callbacks):
+    paracetamol = GenericName.objects.create(name="Paracetamol")
+    ibuprofen = GenericName.objects.create(name="Ibuprofen")
+    category = MedicineCategory.objects.create(name="Analgesic")
+    form = MedicineForm.objects.create(form_type="TBL")
+    manufacturer = Manufacturer.objects.create(name="Square Pharmaceuticals Ltd.")
+
+    def medicine(name, generic_name, price, stock, available=True):
+        return MedicineDetail.objects.create(
+            name=name,
+            generic_name=generic_name,
+            category=category,
+            form=form,
+            manufacturer=manufacturer,
+            description="Relieves pain",
+            price=Decimal(price),
+            batch_number=f"B-{name}",
+            stock_quantity=stock,
+            is_available=available,
+        )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        medicines = {
+            "napa": medicine("Napa", paracetamol, "1.20", 30),
+            "ace": medicine("Ace", paracetamol, "1.00", 5),
+            "profen": medicine("Profen", ibuprofen, "2.50", 0, available=False),
+        }
+    return {"paracetamol": paracetamol, "ibuprofen": ibuprofen, "category": category, **medicines}
+
+
+def summary(generic_name):
+    row = StockSummary.objects.get(generic_name=generic_name)
+    return row.brand_count, row.available_count, row.total_stock, row.min_price
+
+
+@pytest.mark.django_db
+def test_writes_maintain_summaries(catalog, django_capture_on_commit_callbacks):
+    assert summary(catalog["paracetamol"]) == (2, 2, 35, Decimal("1.00"))
+    assert summary(catalog["ibuprofen"]) == (1, 0, 0, Decimal("2.50"))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        catalog["ace"].price = Decimal("0.80")
+        catalog["ace"].save()
+    assert summary(catalog["paracetamol"]) == (2, 2, 35, Decimal("0.80"))
+
+    # Moving the only ibuprofen brand away removes that summary
+    with django_capture_on_commit_callbacks(execute=True):
+        catalog["profen"].generic_name = catalog["paracetamol"]
+        catalog["profen"].save()
+    assert summary(catalog["paracetamol"]) == (3, 2, 35, Decimal("0.80"))
+    assert not StockSummary.objects.filter(generic_name=catalog["ibuprofen"]).exists()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        catalog["napa"].delete()
+    assert summary(catalog["paracetamol"]) == (2, 1, 5, Decimal("0.80"))
+
+
+@pytest.mark.django_db
+def test_stock_adjustments_refresh_summaries(
+    catalog, admin_client, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.post(
+            "/api/medicines/stock/",
+            {
+                "adjustments": [
+                    {"id": str(catalog["ace"].pk), "delta": -5},
+                    {"id": str(catalog["profen"].pk), "delta": 12},
+                ]
+            },
+            format="json",
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert summary(catalog["paracetamol"]) == (2, 1, 30, Decimal("1.00"))
+    assert summary(catalog["ibuprofen"]) == (1, 1, 12, Decimal("2.50"))
+
+
+@pytest.mark.django_db
+def test_bulk_delete_refreshes_summaries(
+    catalog, admin_client, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.delete(
+            "/api/medicines/bulk/", {"ids": [str(catalog["profen"].pk)]}, format="json"
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not StockSummary.objects.filter(generic_name=catalog["ibuprofen"]).exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("with_target", [True, False])
+def test_refresh_upsert_suits_the_backend(catalog, monkeypatch, with_target):
+    # Django checks the upsert options against the backend's features before
+    # any SQL runs, so the insert itself is skipped: with_target=False is
+    # MySQL, which rejects a conflict target
+    monkeypatch.setattr(connection.features, "supports_update_conflicts_with_target", with_target)
+    inserted = []
+    monkeypatch.setattr(
+        QuerySet, "_batched_insert", lambda self, objs, *args, **kwargs: inserted.extend(objs) or []
+    )
+
+    refresh_stock_summaries(generic_ids=[catalog["paracetamol"].pk])
+
+    assert [(row.generic_name_id, row.brand_count) for row in inserted] == [
+        (catalog["paracetamol"].pk, 2)
+    ]
+
+
+@pytest.mark.django_db
+def test_rebuild_repairs_drift(catalog):
+    StockSummary.objects.filter(generic_name=catalog["paracetamol"]).update(total_stock=999)
+    StockSummary.objects.filter(generic_name=catalog["ibuprofen"]).delete()
+
+    call_command("rebuild_stock_summary")
+
+    assert summary(catalog["paracetamol"]) == (2, 2, 35, Decimal("1.00"))
+    assert summary(catalog["ibuprofen"]) == (1, 0, 0, Decimal("2.50"))
+
+
+@pytest.mark.django_db
+def test_category_report_uses_threshold(catalog):
+    response = client.get("/api/stock-summary/categories/", {"threshold": 10})
+
+    assert response.status_code == status.HTTP_200_OK
+    (row,) = response.data["data"]["results"]
+    assert row["category_name"] == "Analgesic"
+    assert row["generic_count"] == 2
+    assert row["brand_count"] == 3
+    assert row["total_stock"] == 35
+    assert row["low_stock_generics"] == 1
+    assert row["unavailable_generics"] == 1
+
+    bad = client.get("/api/stock-summary/categories/", {"threshold": "-1"})
+    assert bad.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_generic_report_filters(catalog):
+    unavailable = client.get("/api/stock-summary/generics/", {"unavailable": "true"})
+    low_stock = client.get(
+        "/api/stock-summary/generics/", {"low_stock": "true", "threshold": 40}
+    )
+
+    assert [row["generic_name_name"] for row in unavailable.data["data"]["results"]] == [
+        "Ibuprofen"
+    ]
+    # Lowest stock first
+    assert [row["total_stock"] for row in low_stock.data["data"]["results"]] == [0, 35]
+    assert low_stock.data["data"]["results"][1]["min_price"] == "1.00"
+
+
+@pytest.mark.django_db
+def test_generic_report_adds_up_categories(catalog, django_capture_on_commit_callbacks):
+    gel = MedicineCategory.objects.create(name="Topical")
+    with django_capture_on_commit_callbacks(execute=True):
+        MedicineDetail.objects.create(
+            name="Profen Gel",
+            generic_name=catalog["ibuprofen"],
+            category=gel,
+            form=catalog["profen"].form,
+            description="Relieves pain",
+            price=Decimal("4.00"),
+            batch_number="B-Profen Gel",
+            stock_quantity=8,
+        )
+
+    # Available as a gel, so no longer listed as unavailable
+    unavailable = client.get("/api/stock-summary/generics/", {"unavailable": "true"})
+    assert unavailable.data["data"]["results"] == []
+
+    response = client.get("/api/stock-summary/generics/", {"category": gel.pk})
+    (row,) = response.data["data"]["results"]
+    assert row["generic_name_name"] == "Ibuprofen"
+    assert (row["category_count"], row["brand_count"], row["available_count"]) == (2, 2, 1)
+    assert (row["total_stock"], row["min_price"]) == (8, "2.50")
+
+    # The category report keeps counting within each category
+    categories = client.get("/api/stock-summary/categories/").data["data"]["results"]
+    assert {row["category_name"]: row["unavailable_generics"] for row in categories} == {
+        "Analgesic": 1,
+        "Topical": 0,
+    }
+
+
+@pytest.mark.django_db
+def test_reports_are_cached_until_a_refresh(
+    catalog, admin_client, django_capture_on_commit_callbacks
+):
+    url = "/api/stock-summary/generics/"
+    client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        cached = client.get(url)
+    assert len(queries) == 0
+    assert cached.status_code == status.HTTP_200_OK
+
+    with django_capture_on_commit_callbacks(execute=True):
+        admin_client.post(f"/api/medicines/{catalog['napa'].pk}/stock/", {"delta": 5}, format="json")
+
+    response = client.get(url)
+    totals = {row["generic_name_name"]: row["total_stock"] for row in response.data["data"]["results"]}
+    assert totals["Paracetamol"] == 40
@@ -1,7 +1,9 @@
 from decimal import Decimal
+import gzip
 import json
 import pytest
 import logging
+from unittest import mock
 from rest_framework.test import APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -12,8 +14,10 @@ from inventory.models import (
     MedicineForm,
     Manufacturer,
 )
+from utils import response_cache
 from utils.redis_cache import RedisCache
 from django.contrib.auth.models import User
+from django.test import override_settings
 
 # Set up logging
 app_logger = logging.getLogger("app_logger")
@@ -38,12 +42,6 @@ def authenticated_client(admin_user):
 
 
 # Fixture to clear Redis cache before each test
-@pytest.fixture(autouse=True)
-def clear_cache():
-    cache_manager = RedisCache()
-    cache_manager.redis.flushdb()  # Clears all keys in Redis before each test
-
-
 @pytest.mark.django_db
 def test_get_medicine_detail_list(authenticated_client):
     app_logger.info("Testing GET /api/medicines/")
@@ -253,3 +251,142 @@ def test_medicine_search(authenticated_client):
     assert response.status_code == status.HTTP_200_OK
     assert len(response.data["data"]) == 1
     assert response.data["data"][0]["price"] == "11.99", "Updated price should reflect in search results"
+
+
+@pytest.mark.django_db
+def test_medicine_detail_served_from_rendered_cache(authenticated_client):
+    app_logger.info("Testing GET /api/medicines/<pk> rendered response cache")
+
+    generic_name = GenericName.objects.create(name="Cetirizine")
+    category = MedicineCategory.objects.create(name="Antihistamine")
+    form = MedicineForm.objects.create(form_type="TBL", description="Tablet form")
+    manufacturer = Manufacturer.objects.create(name="Allergen Labs")
+    medicine = MedicineDetail.objects.create(
+        name="Cetirizine Tablet",
+        generic_name=generic_name,
+        category=category,
+        form=form,
+        manufacturer=manufacturer,
+        description="Allergy relief",
+        price=Decimal("3.50"),
+        batch_number="B200",
+    )
+
+    # First request renders the response and stores the bytes
+    first = authenticated_client.get(f"/api/medicines/{medicine.pk}/")
+    assert first.status_code == status.HTTP_200_OK
+
+    detail_cache_key = f"medicine_detail_{medicine.pk}"
+    cached_body = RedisCache().redis.hget(detail_cache_key, "body")
+    assert cached_body == first.content, "Rendered bytes should be cached."
+
+    # Second request is replayed from the cached bytes
+    second = authenticated_client.get(f"/api/medicines/{medicine.pk}/")
+    assert second.status_code == status.HTTP_200_OK
+    assert second.content == first.content
+    assert second["Content-Type"] == first["Content-Type"]
+    assert json.loads(second.content)["data"]["name"] == "Cetirizine Tablet"
+
+
+@pytest.mark.django_db
+def test_medicine_search_served_pre_compressed(authenticated_client):
+    app_logger.info("Testing gzip-compressed cached search responses")
+
+    generic_name = GenericName.objects.create(name="Metformin")
+    category = MedicineCategory.objects.create(name="Antidiabetic")
+    form = MedicineForm.objects.create(form_type="TBL", description="Tablet form")
+    manufacturer = Manufacturer.objects.create(name="Glucose Labs")
+    for index in range(10):
+        MedicineDetail.objects.create(
+            name=f"Metformin {index}",
+            generic_name=generic_name,
+            category=category,
+            form=form,
+            manufacturer=manufacturer,
+            description="Controls blood sugar levels in type 2 diabetes.",
+            price=Decimal("4.25"),
+            batch_number=f"MF{index}",
+        )
+
+    # First request compresses on the fly and fills the cache with variants
+    first = authenticated_client.get(
+        "/api/medicines/search/", {"q": "Metformin"}, HTTP_ACCEPT_ENCODING="gzip"
+    )
+    assert first.status_code == status.HTTP_200_OK
+    assert first["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in first["Vary"]
+
+    # Second request is replayed from the stored gzip variant
+    second = authenticated_client.get(
+        "/api/medicines/search/", {"q": "Metformin"}, HTTP_ACCEPT_ENCODING="gzip"
+    )
+    assert second["Content-Encoding"] == "gzip"
+    body = json.loads(gzip.decompress(second.content))
+    assert len(body["results"]) == 10
+
+    # Clients without Accept-Encoding get the raw body
+    plain = authenticated_client.get("/api/medicines/search/", {"q": "Metformin"})
+    assert not plain.has_header("Content-Encoding")
+    assert json.loads(plain.content) == body
+
+
+@pytest.mark.django_db
+@override_settings(COMPRESSION_MIN_SIZE=100_000)
+def test_small_cached_response_falls_back_to_raw_body(authenticated_client):
+    app_logger.info("Testing the raw-body fallback for responses without variants")
+
+    generic_name = GenericName.objects.create(name="Amlodipine")
+    category = MedicineCategory.objects.create(name="Antihypertensive")
+    form = MedicineForm.objects.create(form_type="TBL", description="Tablet form")
+    medicine = MedicineDetail.objects.create(
+        name="Amdocal",
+        generic_name=generic_name,
+        category=category,
+        form=form,
+        description="Lowers blood pressure.",
+        price=Decimal("5.00"),
+        batch_number="AM1",
+    )
+    url = f"/api/medicines/{medicine.pk}/"
+    first = authenticated_client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+    # Too small to compress: the raw body comes back with the same HMGET
+    with mock.patch.object(
+        response_cache.cache_manager, "get_fields", wraps=response_cache.cache_manager.get_fields
+    ) as get_fields:
+        second = authenticated_client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+    assert get_fields.call_count == 1
+    assert not second.has_header("Content-Encoding")
+    assert second.content == first.content
+
+
+@pytest.mark.django_db
+def test_update_rejects_second_featured_medicine(authenticated_client):
+    app_logger.info("Testing PUT /api/medicines/<pk> featured constraint")
+
+    generic_name = GenericName.objects.create(name="Losartan")
+    category = MedicineCategory.objects.create(name="Antihypertensive")
+    form = MedicineForm.objects.create(form_type="TBL", description="Tablet form")
+    manufacturer = Manufacturer.objects.create(name="Cardio Labs")
+    medicines = [
+        MedicineDetail.objects.create(
+            name=f"Angilock {index}",
+            generic_name=generic_name,
+            category=category,
+            form=form,
+            manufacturer=manufacturer,
+            description="Controls blood pressure.",
+            price=Decimal("8.00"),
+            batch_number=f"AL{index}",
+            is_featured=index == 0,
+        )
+        for index in range(2)
+    ]
+
+    response = authenticated_client.put(
+        f"/api/medicines/{medicines[1].pk}/", data={"is_featured": True}, format="json"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["message"] == "Only one featured medicine is allowed per generic name."
+    medicines[1].refresh_from_db()
+    assert medicines[1].is_featured is False
@@ -0,0 +1,56 @@
+from unittest import mock
+import pytest
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+from rest_framework.test import APIClient
+from utils.warmup import WARMUP_PATHS, WARMUP_STEPS, resolve_urls, serve_warmup_requests, warm_up
+
+client = APIClient()
+
+
+@pytest.fixture(autouse=True)
+def keep_test_connection():
+    # Finished requests close the database connection, which must stay open
+    # inside the test transaction (the test client does the same)
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    yield
+    request_started.connect(close_old_connections)
+    request_finished.connect(close_old_connections)
+
+
+@pytest.mark.django_db
+def test_warm_up_runs_every_step():
+    with mock.patch("utils.warmup.error_logger") as error_logger:
+        timings = warm_up()
+    assert not error_logger.error.called
+    assert list(timings) == [name for name, _ in WARMUP_STEPS]
+
+
+@pytest.mark.django_db
+def test_warmup_requests_fill_the_response_cache(django_assert_num_queries):
+    assert serve_warmup_requests() == {path: 200 for path in WARMUP_PATHS}
+
+    # Served from the shared cache by the first request after the fork
+    with django_assert_num_queries(0):
+        assert client.get("/api/reference-data/").status_code == 200
+    with django_assert_num_queries(0):
+        assert client.get("/api/medicines/").status_code == 200
+
+
+def test_resolve_urls_imports_every_view():
+    assert resolve_urls() > len(WARMUP_PATHS)
+
+
+@pytest.mark.django_db
+def test_failing_step_does_not_stop_the_warm_up(django_assert_num_queries):
+    steps = tuple(
+        (name, mock.Mock(side_effect=RuntimeError("boom")) if name == "models" else step)
+        for name, step in WARMUP_STEPS
+    )
+    with mock.patch("utils.warmup.WARMUP_STEPS", steps):
+        timings = warm_up()
+    assert list(timings) == [name for name, _ in WARMUP_STEPS]
+    # The steps after the failing one still ran
+    with django_assert_num_queries(0):
+        assert client.get("/api/forms/").status_code == 200
@@ -0,0 +1,142 @@
+import gzip
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# Only text-like payloads are worth compressing
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+def supported_encodings():
+    """Encodings we can produce, in order of server preference."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(request, supported=None):
+    """
+    Pick the best encoding accepted by the client from `Accept-Encoding`,
+    among `supported` (all encodings we can produce by default).
+    Returns "br", "gzip" or None when the client accepts none of them.
+    """
+    header = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    if not header:
+        return None
+
+    accepted = {}
+    for item in header.split(","):
+        token, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in supported or supported_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type):
+    content_type = (content_type or "").lower()
+    return content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+
+
+def compress(body: bytes, encoding: str, level: int = None) -> bytes:
+    """Compress `body` with the given encoding at `level` (or the configured default)."""
+    if encoding == "br":
+        quality = settings.COMPRESSION_BROTLI_QUALITY if level is None else level
+        return brotli.compress(body, quality=quality)
+    if encoding == "gzip":
+        compresslevel = settings.COMPRESSION_GZIP_LEVEL if level is None else level
+        # mtime=0 keeps the output deterministic, so equal bodies give equal bytes
+        return gzip.compress(body, compresslevel=compresslevel, mtime=0)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def compressed_variants(body: bytes) -> dict:
+    """
+    Build every supported compressed variant of `body` that is worth keeping.
+    Used when filling the response cache, so brotli runs at its cache quality.
+    """
+    if len(body) < settings.COMPRESSION_MIN_SIZE:
+        return {}
+
+    variants = {}
+    for encoding in supported_encodings():
+        level = settings.COMPRESSION_CACHE_BROTLI_QUALITY if encoding == "br" else None
+        compressed = compress(body, encoding, level=level)
+        if len(compressed) < len(body):
+            variants[encoding] = compressed
+    return variants
+
+
+class CompressionMiddleware:
+    """
+    Negotiated gzip/brotli compression for responses that are not already
+    encoded. Responses replayed from the response cache carry their
+    pre-compressed variant and a Content-Encoding header, so they are skipped.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or not is_compressible(response.get("Content-Type"))
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        encoding = negotiate_encoding(request)
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        response.headers["Content-Encoding"] = encoding
+
+        # The body changed, so a strong ETag no longer matches it
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+
+        return response
@@ -0,0 +1,289 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.backends.signals import connection_created
+
+# Setup app and error loggers
+app_logger = logging.getLogger("app_logger")
+error_logger = logging.getLogger("error_logger")
+
+# Set for the views that opted in with `replica_reads = True`
+_replica_reads = ContextVar("replica_reads", default=False)
+
+# The PrimaryWrites of the request being handled, None outside of one
+_primary_writes = ContextVar("primary_writes", default=None)
+
+# Statements that change rows on the primary
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+# Set on successful writes, sent back by clients to read their own writes
+PRIMARY_COOKIE = "read_primary_until"
+PRIMARY_HEADER = "X-Read-Primary-Until"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Statements reporting replication lag, newest MySQL syntax first
+LAG_QUERIES = (
+    ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+    ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),
+)
+
+
+@contextmanager
+def replica_reads():
+    """Send the reads made inside the block to a healthy replica."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def reading_from_replicas():
+    """Whether the current request's reads may go to a replica."""
+    return _replica_reads.get() and bool(settings.REPLICA_DATABASES)
+
+
+def settle_cache_fill(invalidated_at):
+    """
+    Called before a response that fills the shared cache is built, with the
+    time its entry was last invalidated (None if not recently). A replica
+    that has not applied the write behind that invalidation would store old
+    rows for every client until the entry expires, so the remaining reads of
+    the request move to the primary unless every replica in use had applied
+    it as of the last health check.
+    """
+    if invalidated_at is None:
+        return
+    applied_until = replica_health.applied_until()
+    if applied_until is None or applied_until <= invalidated_at:
+        _replica_reads.set(False)
+
+
+def replica_lag(alias):
+    """
+    Seconds the replica `alias` is behind its source; 0 for a stand-in that
+    is not MySQL (e.g. SQLite in development), None when it is unreachable,
+    is not a replica at all, or replication is stopped.
+    """
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor != "mysql":
+                cursor.execute("SELECT 1")
+                return 0.0
+            for statement, column in LAG_QUERIES:
+                try:
+                    cursor.execute(statement)
+                except DatabaseError:
+                    continue  # Older servers only know the previous syntax
+                row = cursor.fetchone()
+                if row is None:
+                    # No replication configured: likely a second primary
+                    return None
+                names = [description[0] for description in cursor.description]
+                lag = dict(zip(names, row)).get(column)
+                return None if lag is None else float(lag)
+            return None
+    except DatabaseError as e:
+        error_logger.error("Replica health check failed for %s: %s", alias, e)
+        return None
+
+
+class ReplicaHealth:
+    """
+    Per-process cache of replica lag. Each replica is checked at most once
+    every REPLICA_HEALTH_CHECK_INTERVAL seconds, by whichever request finds
+    the last check stale; the others keep using the previous result.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def available(self):
+        """Replicas that answered and lag at most REPLICA_MAX_LAG seconds."""
+        return list(self.healthy_lags())
+
+    def applied_until(self):
+        """
+        The wall clock time up to which every available replica had applied
+        the primary's writes when last checked, or None when none is
+        available. MySQL reports lag in whole seconds, hence the extra one.
+        """
+        lags = self.healthy_lags()
+        if not lags:
+            return None
+        return self.checked_at_time - max(lags.values()) - 1
+
+    def healthy_lags(self):
+        if time.monotonic() - self.checked_at >= settings.REPLICA_HEALTH_CHECK_INTERVAL:
+            if self.lock.acquire(blocking=False):
+                try:
+                    self.check()
+                finally:
+                    self.lock.release()
+        return {
+            alias: lag
+            for alias, lag in self.lags.items()
+            if lag is not None and lag <= settings.REPLICA_MAX_LAG
+        }
+
+    def check(self):
+        checked_at_time = time.time()
+        lags = {alias: replica_lag(alias) for alias in settings.REPLICA_DATABASES}
+        unavailable = [alias for alias, lag in lags.items() if lag is None]
+        if unavailable:
+            app_logger.warning("Replicas unavailable, reading from primary: %s", unavailable)
+        self.lags = lags
+        self.checked_at = time.monotonic()
+        self.checked_at_time = checked_at_time
+
+    def reset(self):
+        self.lags = {}
+        self.checked_at = float("-inf")
+        self.checked_at_time = float("-inf")
+
+
+replica_health = ReplicaHealth()
+
+
+class ReplicaRouter:
+    """
+    Routes the reads of views marked `replica_reads = True` to a random
+    healthy replica from REPLICA_DATABASES, falling back to the primary when
+    none is healthy or none is configured. Everything else, including every
+    write, uses the primary. Replicas are assumed to hold the same data, so
+    they are never migrated and relations across aliases are allowed.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or not settings.REPLICA_DATABASES:
+            return None
+        replicas = replica_health.available()
+        return random.choice(replicas) if replicas else "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.REPLICA_DATABASES
+
+
+class PrimaryWrites:
+    """Whether a request ran a write on the primary, on any of its threads."""
+
+    def __init__(self):
+        self.wrote = False
+
+
+def track_primary_writes(execute, sql, params, many, context):
+    """Database execute wrapper flagging the current request's writes."""
+    writes = _primary_writes.get()
+    if writes is not None and not writes.wrote:
+        writes.wrote = sql.lstrip()[:7].upper().startswith(WRITE_STATEMENTS)
+    return execute(sql, params, many, context)
+
+
+def install_write_tracking(sender=None, connection=None, **kwargs):
+    """
+    Put track_primary_writes on `connection` if it is the primary, or on the
+    primary connections already open. Like time_queries in
+    utils/request_timing.py it goes first in execute_wrappers.
+    """
+    targets = [connection] if connection is not None else connections.all(initialized_only=True)
+    for target in targets:
+        if target.alias == "default" and track_primary_writes not in target.execute_wrappers:
+            target.execute_wrappers.insert(0, track_primary_writes)
+
+
+def primary_pinned_until(request):
+    """The time until which `request` must read from the primary, or 0."""
+    value = request.headers.get(PRIMARY_HEADER) or request.COOKIES.get(PRIMARY_COOKIE)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Turns on replica reads for safe requests to views with
+    `replica_reads = True`. A successful request that wrote to the primary
+    pins the client to it for READ_YOUR_WRITES_WINDOW seconds, through a
+    cookie and a response header that API clients send back, so admins
+    always read their own edits even while the replicas catch up. Requests
+    that only read, such as batch lookups or logins, leave clients on the
+    replicas.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # A coroutine sets the flag in the request's own context; Django
+            # would run a sync process_view in a thread
+            self.process_view = self.aprocess_view
+        # Connections are per thread: track the ones opened later as well
+        connection_created.connect(install_write_tracking, dispatch_uid="primary_writes")
+        install_write_tracking()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        writes = PrimaryWrites()
+        token = _replica_reads.set(False)
+        writes_token = _primary_writes.set(writes)
+        try:
+            response = self.get_response(request)
+        finally:
+            _primary_writes.reset(writes_token)
+            _replica_reads.reset(token)
+        return self.pin_after_write(response, writes)
+
+    async def __acall__(self, request):
+        writes = PrimaryWrites()
+        token = _replica_reads.set(False)
+        writes_token = _primary_writes.set(writes)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _primary_writes.reset(writes_token)
+            _replica_reads.reset(token)
+        return self.pin_after_write(response, writes)
+
+    def pin_after_write(self, response, writes):
+        if writes.wrote and response.status_code < 400:
+            window = settings.READ_YOUR_WRITES_WINDOW
+            until = str(int(time.time() + window))
+            response.set_cookie(PRIMARY_COOKIE, until, max_age=window, httponly=True, samesite="Lax")
+            response[PRIMARY_HEADER] = until
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.reads_from_replica(request, view_func):
+            _replica_reads.set(True)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if self.reads_from_replica(request, view_func):
+            _replica_reads.set(True)
+
+    def reads_from_replica(self, request, view_func):
+        view_class = getattr(view_func, "view_class", None)
+        return (
+            request.method in SAFE_METHODS
+            and getattr(view_class, "replica_reads", False)
+            and primary_pinned_until(request) < time.time()
+        )
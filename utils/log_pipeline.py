@@ -0,0 +1,158 @@
+import atexit
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+import random
+from django.conf import settings
+
+# Records held for the writer thread before new ones are dropped, so a
+# stalled disk never blocks a request or grows the queue without bound
+DEFAULT_QUEUE_SIZE = 10000
+
+# One (logger, handler, listener) per queued logger
+_pipelines = []
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a `rate` fraction of the INFO and DEBUG records; warnings and errors
+    always pass. Set on a logger in LOGGING, e.g. "app_logger.cache", whose
+    records then reach the parent's handlers thinned out. configure_logging
+    moves the rate onto the logger itself (see SampledLogger).
+    """
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = float(rate)
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or self.rate >= 1 or random.random() < self.rate
+
+
+class SampledLogger(logging.Logger):
+    """
+    A logger that samples in isEnabledFor. A filter only runs once the record
+    exists, and building a record (caller lookup, timestamps, thread and
+    process names) costs about as much as writing it; here a dropped call
+    returns before any of that.
+    """
+
+    sample_rate = 1.0
+
+    def isEnabledFor(self, level):
+        if level < logging.WARNING and self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return False
+        return super().isEnabledFor(level)
+
+
+def sample_loggers():
+    """
+    Turn each logger with a SamplingFilter into a SampledLogger at its rate,
+    and stop sampling loggers whose filter a new config dropped.
+    """
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        if not isinstance(logger, logging.Logger):
+            continue
+        samplers = [f for f in logger.filters if isinstance(f, SamplingFilter)]
+        if samplers:
+            for sampler in samplers:
+                logger.removeFilter(sampler)
+            logger.__class__ = SampledLogger
+            logger.sample_rate = samplers[-1].rate
+        elif isinstance(logger, SampledLogger):
+            logger.sample_rate = 1.0
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    A QueueHandler for an in-process queue. The stock handler formats each
+    record in the logging thread to make it picklable; here the record is
+    queued as is, so `%` arguments are merged and the line is formatted by
+    the writer thread. Arguments must therefore not be mutated after the
+    call, which holds for the strings and numbers logged in this project.
+    """
+
+    dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def queue_loggers(names, maxsize=DEFAULT_QUEUE_SIZE):
+    """
+    Move the handlers of each named logger behind a DeferredQueueHandler, and
+    write their records from a QueueListener thread. Handler levels and
+    filters still apply, in the writer thread.
+    """
+    for name in names:
+        logger = logging.getLogger(name)
+        handlers = [
+            handler for handler in logger.handlers if not isinstance(handler, DeferredQueueHandler)
+        ]
+        if not handlers:
+            continue
+        records = queue.Queue(maxsize)
+        handler = DeferredQueueHandler(records)
+        listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+        for target in handlers:
+            logger.removeHandler(target)
+        logger.addHandler(handler)
+        listener.start()
+        _pipelines.append((logger, handler, listener))
+
+
+def flush():
+    """Block until every queued record has been written."""
+    for _, _, listener in _pipelines:
+        listener.queue.join()
+
+
+def stop():
+    """Write the queued records, stop the writer threads and hand the loggers their handlers back."""
+    while _pipelines:
+        logger, handler, listener = _pipelines.pop()
+        listener.stop()
+        logger.removeHandler(handler)
+        for target in listener.handlers:
+            logger.addHandler(target)
+
+
+def _restart_after_fork():
+    """
+    A forked child inherits the queues but not the writer threads. Give each
+    pipeline an empty queue (records queued by the parent are its to write)
+    and a new thread.
+    """
+    for _, handler, listener in _pipelines:
+        records = queue.Queue(handler.queue.maxsize)
+        handler.queue = listener.queue = records
+        listener._thread = None
+        listener.start()
+
+
+def configure_logging(config):
+    """
+    LOGGING_CONFIG: apply LOGGING with dictConfig and sample the loggers it
+    gives a SamplingFilter. With LOG_QUEUE on, queue the handlers of every
+    logger it configures.
+    """
+    stop()
+    logging.config.dictConfig(config)
+    sample_loggers()
+    if getattr(settings, "LOG_QUEUE", False):
+        queue_loggers(
+            config.get("loggers", {}), maxsize=getattr(settings, "LOG_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)
+        )
+
+
+atexit.register(stop)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
@@ -0,0 +1,51 @@
+"""
+Prometheus metrics of the request timings (utils/request_timing.py), served
+at /metrics when REQUEST_METRICS is on. nginx only proxies /api/, so the
+endpoint is reachable on the internal network only.
+
+Gunicorn workers each keep their own samples. With PROMETHEUS_MULTIPROC_DIR
+set (docker-compose.yml), prometheus_client writes them to files in that
+directory and /metrics adds up every worker's; gunicorn.conf.py empties it
+at startup and drops the files of exited workers.
+"""
+import os
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Seconds; from a cache hit served in about a millisecond to a slow export
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from the request reaching the timing middleware to its response.",
+    ["view", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+PHASE_LATENCY = Histogram(
+    "http_request_phase_duration_seconds",
+    "Time per request spent in each phase: db, cache, serialize and render.",
+    ["view", "phase"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def observe_request(view, method, status, total, durations):
+    REQUEST_LATENCY.labels(view, method, str(status)).observe(total)
+    for phase, seconds in durations.items():
+        PHASE_LATENCY.labels(view, phase).observe(seconds)
+
+
+def metrics_view(request):
+    """Every metric in the Prometheus text format."""
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,158 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+# Setup app logger
+app_logger = logging.getLogger("app_logger")
+
+# The stats of the request being handled. A context variable rather than a
+# wrapper per connection, because async views run their queries in
+# sync_to_async threads, on connections of their own.
+_current = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    """
+    Database execute wrapper that counts queries, their total time and the
+    SQL statements run more than once. Statements are compared before
+    parameters are bound, so an N+1 loop shows up as one duplicated statement.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        """Executions beyond the first of every repeated statement."""
+        return sum(total - 1 for total in self.statements.values() if total > 1)
+
+    @contextmanager
+    def track(self):
+        """
+        Count the queries run in this block, including those of the threads
+        it hands work to with sync_to_async, which copy the context.
+        """
+        install_query_counting()
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+
+def count_queries(execute, sql, params, many, context):
+    """Database execute wrapper adding each query to the current QueryStats."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def install_query_counting(sender=None, connection=None, **kwargs):
+    """
+    Put count_queries on `connection`, or on every open connection. Like
+    time_queries in utils/request_timing.py it goes first in
+    execute_wrappers, out of the way of `connection.execute_wrapper()` blocks.
+    """
+    targets = [connection] if connection is not None else connections.all(initialized_only=True)
+    for target in targets:
+        if count_queries not in target.execute_wrappers:
+            target.execute_wrappers.insert(0, count_queries)
+
+
+# Connections are per thread: count on the ones opened later as well
+connection_created.connect(install_query_counting, dispatch_uid="query_budget")
+
+
+def get_query_budget(view_class, method):
+    """
+    A view's query budget for `method`: its `query_budget` attribute, either
+    an int for every method or a {"GET": 2, ...} mapping. None when unset.
+    """
+    budget = getattr(view_class, "query_budget", None)
+    if isinstance(budget, dict):
+        return budget.get(method)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Per-request query instrumentation. In DEBUG the numbers go out as
+    X-Query-Count, X-Query-Time-Ms and X-Query-Duplicates headers; otherwise
+    they are logged as one metrics line. Requests that exceed the view's
+    `query_budget` log a warning. Queries run while a streaming response is
+    consumed happen after this middleware returns and are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = QueryStats()
+        with stats.track():
+            response = self.get_response(request)
+        return self.report(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        with stats.track():
+            response = await self.get_response(request)
+        return self.report(request, response, stats)
+
+    def report(self, request, response, stats):
+        match = getattr(request, "resolver_match", None)
+        view_class = getattr(match.func, "view_class", None) if match else None
+        view_name = view_class.__name__ if view_class else (match.view_name if match else "-")
+        duration_ms = stats.duration * 1000
+
+        if settings.DEBUG:
+            response["X-Query-Count"] = str(stats.count)
+            response["X-Query-Time-Ms"] = f"{duration_ms:.1f}"
+            response["X-Query-Duplicates"] = str(stats.duplicates)
+        else:
+            app_logger.info(
+                "query_metrics view=%s method=%s status=%s queries=%d time_ms=%.1f duplicates=%d",
+                view_name,
+                request.method,
+                response.status_code,
+                stats.count,
+                duration_ms,
+                stats.duplicates,
+            )
+
+        budget = get_query_budget(view_class, request.method)
+        if budget is not None and stats.count > budget:
+            repeated = [sql for sql, total in stats.statements.most_common(3) if total > 1]
+            app_logger.warning(
+                "Query budget exceeded: %s %s ran %d queries (budget %d); most repeated: %s",
+                request.method,
+                view_name,
+                stats.count,
+                budget,
+                repeated,
+            )
+        return response
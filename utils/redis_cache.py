@@ -1,41 +1,62 @@
 import redis
+import redis.asyncio
+import asyncio
 import json
 import logging
+import weakref
 from typing import Any
 import os
+import time
+from utils.request_timing import timed
 
 # Setup app and error loggers
 app_logger = logging.getLogger("app_logger")
 error_logger = logging.getLogger("error_logger")
+# Cache hits, misses and fills, sampled (LOG_CACHE_SAMPLE_RATE)
+cache_logger = logging.getLogger("app_logger.cache")
 
 
+# When each cache key or counter was last invalidated (sorted set of name ->
+# unix time), kept for INVALIDATION_HISTORY seconds. Responses built from a
+# read replica are only cached once it has applied the write behind the
+# latest invalidation (see utils/db_router.py); the history has to outlast
+# REPLICA_MAX_LAG plus REPLICA_HEALTH_CHECK_INTERVAL.
+INVALIDATIONS_KEY = "cache_invalidations"
+INVALIDATION_HISTORY = 600
+
+
+def redis_url():
+    # Construct Redis URL using environment variables with redis:// prefix
+    redis_host = os.getenv("REDIS_HOST", "localhost")
+    redis_port = os.getenv("REDIS_PORT", "6379")
+    return f"redis://{redis_host}:{redis_port}/0"
+
+
+# Redis calls count towards the request's "cache" phase (utils/request_timing.py)
 class RedisCache:
     def __init__(self):
-        # Construct Redis URL using environment variables with redis:// prefix
-        redis_host = os.getenv("REDIS_HOST", "localhost")
-        redis_port = os.getenv("REDIS_PORT", "6379")
-        redis_url = f"redis://{redis_host}:{redis_port}/0"
-
-        self.redis = redis.from_url(redis_url)
+        self.redis = redis.from_url(redis_url())
 
+    @timed("cache")
     def get(self, key: str) -> Any:
         try:
             raw_data = self.redis.get(key)
             if raw_data:
-                app_logger.info(f"Cache hit for key: {key}")
+                cache_logger.info("Cache hit for key: %s", key)
                 try:
                     return json.loads(raw_data)
                 except (json.JSONDecodeError, TypeError):
                     app_logger.warning(
-                        f"Non-JSON data retrieved from cache for key: {key}"
+                        "Non-JSON data retrieved from cache for key: %s", key
                     )
                     return raw_data
-            app_logger.info(f"Cache miss for key: {key}")
+            cache_logger.info("Cache miss for key: %s", key)
             return None
         except redis.RedisError as e:
-            error_logger.error(f"Redis get error for key '{key}': {e}")
+            error_logger.error("Redis get error for key '%s': %s", key, e)
             return None
 
+    @timed("cache")
     def set(self, key: str, value: Any, expiration: int = 3600):
         try:
             if isinstance(value, (dict, list)):
@@ -43,28 +64,206 @@ class RedisCache:
                 self.redis.set(key, json_value, ex=expiration)
             else:
                 self.redis.set(key, str(value), ex=expiration)
-            app_logger.info(f"Set cache for key: {key} with expiration: {expiration}s")
+            cache_logger.info("Set cache for key: %s with expiration: %ss", key, expiration)
+        except redis.RedisError as e:
+            error_logger.error("Redis set error for key '%s': %s", key, e)
+
+    @timed("cache")
+    def get_many(self, keys: list) -> list:
+        """
+        Fetch several keys with one MGET. Returns decoded values (or None for
+        misses) in the order of `keys`.
+        """
+        if not keys:
+            return []
+        try:
+            raw_values = self.redis.mget(keys)
         except redis.RedisError as e:
-            error_logger.error(f"Redis set error for key '{key}': {e}")
+            error_logger.error("Redis mget error for %s keys: %s", len(keys), e)
+            return [None] * len(keys)
 
+        values = []
+        for raw_data in raw_values:
+            if raw_data is None:
+                values.append(None)
+                continue
+            try:
+                values.append(json.loads(raw_data))
+            except (json.JSONDecodeError, TypeError):
+                values.append(raw_data)
+        hits = sum(value is not None for value in values)
+        cache_logger.info("Cache mget: %s hits, %s misses", hits, len(keys) - hits)
+        return values
+
+    @timed("cache")
+    def set_many(self, mapping: dict, expiration: int = 3600):
+        """Set several keys with their expiry in a single pipelined round trip."""
+        if not mapping:
+            return
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            for key, value in mapping.items():
+                if isinstance(value, (dict, list)):
+                    value = json.dumps(value, default=str)
+                pipeline.set(key, value if isinstance(value, (bytes, str)) else str(value), ex=expiration)
+            pipeline.execute()
+            cache_logger.info("Set %s cache keys with expiration: %ss", len(mapping), expiration)
+        except redis.RedisError as e:
+            error_logger.error("Redis pipelined set error for %s keys: %s", len(mapping), e)
+
+    @timed("cache")
+    def get_fields(self, key: str, fields: list) -> list:
+        """
+        Fetch several fields of a hash in a single round trip.
+        Returns a list of raw bytes (or None) in the order of `fields`.
+        """
+        try:
+            values = self.redis.hmget(key, fields)
+            if any(value is not None for value in values):
+                cache_logger.info("Cache hit for key: %s", key)
+            else:
+                cache_logger.info("Cache miss for key: %s", key)
+            return values
+        except redis.RedisError as e:
+            error_logger.error("Redis hmget error for key '%s': %s", key, e)
+            return [None] * len(fields)
+
+    @timed("cache")
+    def set_fields(self, key: str, mapping: dict, expiration: int = 3600):
+        """
+        Replace a hash with `mapping` and set its expiry atomically, so stale
+        fields from a previous fill never survive next to the new ones.
+        """
+        try:
+            pipeline = self.redis.pipeline()
+            pipeline.delete(key)
+            pipeline.hset(key, mapping=mapping)
+            pipeline.expire(key, expiration)
+            pipeline.execute()
+            cache_logger.info("Set cache hash for key: %s with expiration: %ss", key, expiration)
+        except redis.RedisError as e:
+            error_logger.error("Redis hset error for key '%s': %s", key, e)
+
+    @timed("cache")
+    def set_sorted_if_current(
+        self, key: str, scores: dict, version_key: str, version: int, expiration: int = 3600
+    ) -> bool:
+        """
+        Replace a sorted set with `scores` (member -> score) and set its
+        expiry atomically, unless the counter `version_key` has moved on from
+        `version`, its value before `scores` were read. The counter is
+        watched, so a bump landing mid-write aborts it. Returns whether the
+        set was stored.
+        """
+        try:
+            with self.redis.pipeline() as pipeline:
+                pipeline.watch(version_key)
+                if int(pipeline.get(version_key) or 0) != version:
+                    cache_logger.info("Skipped stale sorted set for key: %s", key)
+                    return False
+                pipeline.multi()
+                pipeline.delete(key)
+                pipeline.zadd(key, scores)
+                pipeline.expire(key, expiration)
+                pipeline.execute()
+            cache_logger.info("Set sorted set for key: %s with %s members", key, len(scores))
+            return True
+        except redis.WatchError:
+            cache_logger.info("Skipped stale sorted set for key: %s", key)
+            return False
+        except redis.RedisError as e:
+            error_logger.error("Redis zadd error for key '%s': %s", key, e)
+            return False
+
+    @timed("cache")
+    def get_sorted_range(self, key: str, start: int, stop: int):
+        """
+        Members ranked `start`..`stop` (inclusive) from the highest score, and
+        the set's size, in one round trip. Returns (None, 0) on a miss.
+        """
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            pipeline.zrevrange(key, start, stop)
+            pipeline.zcard(key)
+            members, size = pipeline.execute()
+        except redis.RedisError as e:
+            error_logger.error("Redis zrevrange error for key '%s': %s", key, e)
+            return None, 0
+        if not size:
+            cache_logger.info("Cache miss for key: %s", key)
+            return None, 0
+        cache_logger.info("Cache hit for key: %s", key)
+        return [member.decode() for member in members], size
+
+    @timed("cache")
+    def incr(self, key: str) -> int:
+        try:
+            value = self.redis.incr(key)
+            app_logger.info("Incremented key: %s to %s", key, value)
+            return value
+        except redis.RedisError as e:
+            error_logger.error("Redis incr error for key '%s': %s", key, e)
+            return None
+
+    @timed("cache")
     def delete(self, key: str):
         try:
             self.redis.delete(key)
-            app_logger.info(f"Deleted cache for key: {key}")
+            app_logger.info("Deleted cache for key: %s", key)
+        except redis.RedisError as e:
+            error_logger.error("Redis delete error for key '%s': %s", key, e)
+
+    @timed("cache")
+    def invalidate(self, keys: list, counters: list = ()):
+        """
+        Delete `keys` and bump `counters` in a single pipelined round trip,
+        recording when each was invalidated (see `last_invalidated`).
+        """
+        now = time.time()
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            if keys:
+                pipeline.delete(*keys)
+            for counter in counters:
+                pipeline.incr(counter)
+            if keys or counters:
+                pipeline.zadd(INVALIDATIONS_KEY, dict.fromkeys([*keys, *counters], now))
+                pipeline.zremrangebyscore(INVALIDATIONS_KEY, "-inf", now - INVALIDATION_HISTORY)
+            pipeline.execute()
+            app_logger.info("Invalidated %s cache keys and %s counters", len(keys), len(counters))
         except redis.RedisError as e:
-            error_logger.error(f"Redis delete error for key '{key}': {e}")
+            error_logger.error("Redis invalidation error for %s keys: %s", len(keys), e)
 
+    @timed("cache")
+    def last_invalidated(self, names: list):
+        """
+        The latest time any of the keys or counters in `names` was
+        invalidated, or None when none was in the last INVALIDATION_HISTORY
+        seconds.
+        """
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            for name in names:
+                pipeline.zscore(INVALIDATIONS_KEY, name)
+            return latest(pipeline.execute())
+        except redis.RedisError as e:
+            error_logger.error("Redis zscore error for %s: %s", names, e)
+            # Unknown: assume it just happened
+            return time.time()
+
+    @timed("cache")
     def delete_pattern(self, pattern: str):
         try:
             for key in self.redis.scan_iter(match=pattern):
                 self.redis.delete(key)
-            app_logger.info(f"Deleted keys matching pattern: {pattern}")
+            app_logger.info("Deleted keys matching pattern: %s", pattern)
         except redis.RedisError as e:
             error_logger.error(
-                f"Redis delete pattern error for pattern '{pattern}': {e}"
+                "Redis delete pattern error for pattern '%s': %s", pattern, e
             )
 
     # Lock acquisition
+    @timed("cache")
     def acquire_lock(self, lock_key: str, timeout: int = 10):
         """
         Acquire a lock for atomic operations.
@@ -72,10 +271,10 @@ class RedisCache:
         """
         lock = self.redis.lock(lock_key, timeout=timeout)
         if lock.acquire(blocking=False):
-            app_logger.info(f"Acquired lock on key: {lock_key}")
+            app_logger.info("Acquired lock on key: %s", lock_key)
             return lock
         else:
-            app_logger.warning(f"Failed to acquire lock on key: {lock_key}")
+            app_logger.warning("Failed to acquire lock on key: %s", lock_key)
             return None
 
     # Lock release
@@ -87,7 +286,7 @@ class RedisCache:
             lock.release()
             app_logger.info("Released lock.")
         except redis.RedisError as e:
-            error_logger.error(f"Error releasing lock: {e}")
+            error_logger.error("Error releasing lock: %s", e)
 
     def release_lock(self, lock):
         """
@@ -101,5 +300,77 @@ class RedisCache:
             lock.release()
             app_logger.info("Released lock.")
         except redis.RedisError as e:
-            error_logger.error(f"Error releasing lock: {e}")
+            error_logger.error("Error releasing lock: %s", e)
+
+
+def latest(times):
+    times = [value for value in times if value is not None]
+    return max(times) if times else None
+
+
+class AsyncRedisCache:
+    """
+    The reads of `RedisCache` for async views, on the asyncio Redis client.
+    Connections belong to the event loop that opened them, so each running
+    loop gets its own client.
+    """
+
+    def __init__(self):
+        self.url = redis_url()
+        self._clients = weakref.WeakKeyDictionary()
+
+    @property
+    def redis(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = redis.asyncio.from_url(self.url)
+        return client
+
+    @timed("cache")
+    async def get(self, key: str) -> Any:
+        try:
+            raw_data = await self.redis.get(key)
+            if raw_data:
+                cache_logger.info("Cache hit for key: %s", key)
+                try:
+                    return json.loads(raw_data)
+                except (json.JSONDecodeError, TypeError):
+                    app_logger.warning(
+                        "Non-JSON data retrieved from cache for key: %s", key
+                    )
+                    return raw_data
+            cache_logger.info("Cache miss for key: %s", key)
+            return None
+        except redis.RedisError as e:
+            error_logger.error("Redis get error for key '%s': %s", key, e)
+            return None
 
+    @timed("cache")
+    async def get_fields(self, key: str, fields: list) -> list:
+        """
+        Fetch several fields of a hash in a single round trip.
+        Returns a list of raw bytes (or None) in the order of `fields`.
+        """
+        try:
+            values = await self.redis.hmget(key, fields)
+            if any(value is not None for value in values):
+                cache_logger.info("Cache hit for key: %s", key)
+            else:
+                cache_logger.info("Cache miss for key: %s", key)
+            return values
+        except redis.RedisError as e:
+            error_logger.error("Redis hmget error for key '%s': %s", key, e)
+            return [None] * len(fields)
+
+    @timed("cache")
+    async def last_invalidated(self, names: list):
+        """`RedisCache.last_invalidated` on the asyncio client."""
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            for name in names:
+                pipeline.zscore(INVALIDATIONS_KEY, name)
+            return latest(await pipeline.execute())
+        except redis.RedisError as e:
+            error_logger.error("Redis zscore error for %s: %s", names, e)
+            return time.time()
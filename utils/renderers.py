@@ -0,0 +1,10 @@
+from rest_framework.renderers import JSONRenderer
+from utils.request_timing import timed
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """The default JSON renderer, timed as the "render" phase."""
+
+    @timed("render")
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,128 @@
+import hashlib
+import logging
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from utils.compression import compressed_variants, negotiate_encoding
+from utils.db_router import reading_from_replicas, settle_cache_fill
+from utils.redis_cache import AsyncRedisCache, RedisCache
+
+# Cache replays are logged on the sampled cache logger (LOG_CACHE_SAMPLE_RATE)
+cache_logger = logging.getLogger("app_logger.cache")
+
+cache_manager = RedisCache()
+async_cache_manager = AsyncRedisCache()
+
+# Fields of the Redis hash holding one rendered response. Compressed variants
+# live next to the raw body as "body:<encoding>".
+CONTENT_TYPE_FIELD = "content_type"
+BODY_FIELD = "body"
+VARIANT_FIELD_TEMPLATE = "body:{}"
+# The body's ETag, for responses cached with `etag=True`
+ETAG_FIELD = "etag"
+
+
+def is_cacheable_request(request):
+    """Only responses negotiated to plain JSON are stored and replayed."""
+    renderer = getattr(request, "accepted_renderer", None)
+    return renderer is not None and renderer.format == "json"
+
+
+def get_cached_response(request, cache_key, invalidated_by=()):
+    """
+    Return the cached rendered response for `cache_key`, or None on a miss.
+    The stored bytes are sent as-is, without decoding or re-rendering. When the
+    client accepts an encoding we have a pre-compressed variant for, that
+    variant is sent instead of the raw body; both come back from one HMGET.
+
+    A miss is filled by the caller. If it reads from a replica, the fill
+    moves to the primary while the replica may still lack the write that
+    last invalidated `cache_key` or any counter in `invalidated_by` (such
+    as the generation the key embeds).
+    """
+    if not is_cacheable_request(request):
+        return None
+
+    encoding = negotiate_encoding(request)
+    values = cache_manager.get_fields(cache_key, requested_fields(encoding))
+    response = cached_or_miss(cache_key, encoding, values)
+    if response is None and reading_from_replicas():
+        settle_cache_fill(cache_manager.last_invalidated([cache_key, *invalidated_by]))
+    return response
+
+
+async def aget_cached_response(request, cache_key, invalidated_by=()):
+    """`get_cached_response` for async views, on the asyncio Redis client."""
+    if not is_cacheable_request(request):
+        return None
+
+    encoding = negotiate_encoding(request)
+    values = await async_cache_manager.get_fields(cache_key, requested_fields(encoding))
+    response = cached_or_miss(cache_key, encoding, values)
+    if response is None and reading_from_replicas():
+        settle_cache_fill(
+            await async_cache_manager.last_invalidated([cache_key, *invalidated_by])
+        )
+    return response
+
+
+def requested_fields(encoding):
+    """
+    The content type, the ETag, the variant for `encoding` if any, then the
+    raw body.
+    """
+    if encoding:
+        return [CONTENT_TYPE_FIELD, ETAG_FIELD, VARIANT_FIELD_TEMPLATE.format(encoding), BODY_FIELD]
+    return [CONTENT_TYPE_FIELD, ETAG_FIELD, BODY_FIELD]
+
+
+def cached_or_miss(cache_key, encoding, values):
+    content_type, etag, *bodies = values
+    if encoding and bodies[0] is None:
+        # No variant for this body (too small to be worth compressing)
+        encoding = None
+        bodies = bodies[1:]
+    if content_type is None or bodies[0] is None:
+        return None
+    return replayed_response(cache_key, content_type, bodies[0], encoding, etag)
+
+
+def replayed_response(cache_key, content_type, body, encoding, etag=None):
+    cache_logger.info("Serving rendered response from cache for key: %s", cache_key)
+    response = HttpResponse(body, content_type=content_type.decode())
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    if etag:
+        response.headers["ETag"] = etag.decode()
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+def body_etag(body):
+    """Weak ETag of a rendered body: compression changes the bytes, not the meaning."""
+    return f'W/"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+
+
+def cache_response(request, response, cache_key, expiration=900, etag=False):
+    """
+    Store the final rendered bytes of a DRF response, plus its compressed
+    variants, once it has been rendered. Compression is paid once per fill.
+    With `etag`, the response gets the ETag of its raw body, which is stored
+    and replayed with it. Returns the response unchanged so views can
+    `return cache_response(...)`.
+    """
+    if response.status_code != 200 or not is_cacheable_request(request):
+        return response
+
+    def store_rendered(rendered):
+        fields = {
+            CONTENT_TYPE_FIELD: rendered["Content-Type"],
+            BODY_FIELD: rendered.content,
+        }
+        for encoding, compressed in compressed_variants(rendered.content).items():
+            fields[VARIANT_FIELD_TEMPLATE.format(encoding)] = compressed
+        if etag:
+            rendered["ETag"] = fields[ETAG_FIELD] = body_etag(rendered.content)
+        cache_manager.set_fields(cache_key, fields, expiration=expiration)
+
+    response.add_post_render_callback(store_rendered)
+    return response
@@ -0,0 +1,109 @@
+import logging
+import time
+from django.apps import apps
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.test import RequestFactory
+from django.urls import URLResolver, get_resolver
+
+# Setup app and error loggers
+app_logger = logging.getLogger("app_logger")
+error_logger = logging.getLogger("error_logger")
+
+# Requests served once before forking: the reference tables, the first list
+# page and the OpenAPI schema. Besides warming every module and lazy cache
+# on their code paths, they fill the shared response cache.
+WARMUP_PATHS = (
+    "/api/reference-data/",
+    "/api/generic-names/",
+    "/api/categories/",
+    "/api/forms/",
+    "/api/manufacturers/",
+    "/api/medicines/",
+    "/swagger.json",
+)
+
+
+def resolve_urls(resolver=None):
+    """
+    Import every URLconf and view, and build the reverse lookup tables.
+    Returns the number of URL patterns.
+    """
+    resolver = resolver or get_resolver()
+    resolver.reverse_dict  # Populates the reverse and namespace dicts
+    count = 0
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            count += resolve_urls(pattern)
+        else:
+            pattern.callback  # Imports views given by dotted path
+            count += 1
+    return count
+
+
+def load_model_metadata():
+    """Build the field and relation caches of every model's _meta."""
+    for model in apps.get_models():
+        model._meta.get_fields()
+
+
+def compile_row_mappers():
+    """Compile the row mapper of the default list and search projection."""
+    from inventory.api.row_mappers import get_row_mapper
+
+    get_row_mapper()
+
+
+def serve_warmup_requests(paths=WARMUP_PATHS):
+    """GET `paths` through the full middleware stack; returns {path: status}."""
+    handler = BaseHandler()
+    handler.load_middleware()
+    factory = RequestFactory(HTTP_HOST=warmup_host())
+    statuses = {}
+    for path in paths:
+        response = handler.get_response(factory.get(path))
+        response.close()
+        if response.status_code != 200:
+            app_logger.warning("Warm-up request %s returned %s", path, response.status_code)
+        statuses[path] = response.status_code
+    return statuses
+
+
+def warmup_host():
+    """A host name that passes ALLOWED_HOSTS validation."""
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*" and not host.startswith("."):
+            return host
+    return "localhost"
+
+
+WARMUP_STEPS = (
+    ("urls", resolve_urls),
+    ("models", load_model_metadata),
+    ("row_mappers", compile_row_mappers),
+    ("requests", serve_warmup_requests),
+)
+
+
+def warm_up():
+    """
+    Build the state every worker would otherwise build on its first requests.
+    Run in the gunicorn master after the app is preloaded (gunicorn.conf.py),
+    so forked workers inherit it copy-on-write. A failing step is logged and
+    skipped: a cold worker is slower, never broken. Returns the seconds spent
+    per step.
+    """
+    timings = {}
+    for name, step in WARMUP_STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            error_logger.error("Warm-up step '%s' failed: %s", name, e)
+        timings[name] = time.perf_counter() - start
+    app_logger.info(
+        "Warm-up finished in %.2fs (%s)",
+        sum(timings.values()),
+        ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()),
+    )
+    return timings